@@ -3,19 +3,32 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from .config import Config
+from .activity import ActivityTracker
+from .user_cache import UserCache
+from .catalog_cache import CatalogCache
+from .query_profiler import QueryProfiler
+from .database import RoutingSession, init_database
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
+activity_tracker = ActivityTracker()
+user_cache = UserCache()
+catalog_cache = CatalogCache()
+query_profiler = QueryProfiler()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    db.init_app(app)
+    init_database(app, db)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    activity_tracker.init_app(app)
+    user_cache.init_app(app)
+    catalog_cache.init_app(app)
+    query_profiler.init_app(app)
 
     from app.api import bp as api_bp
     app.register_blueprint(api_bp, url_prefix="/api")
@@ -32,6 +45,14 @@ def create_app(config_class=Config):
     from app.professional import bp as professional_bp
     app.register_blueprint(professional_bp, url_prefix="/professional")
 
+    from app.payment import bp as payment_bp
+    app.register_blueprint(payment_bp)
+
+    from app.cli import services_cli, users_cli, data_cli
+    app.cli.add_command(services_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(data_cli)
+
     return app
 
 from app.models import user, service, request
@@ -0,0 +1,137 @@
+from flask import current_app
+from datetime import datetime
+import atexit
+import logging
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+class _ActivityBuffer:
+    def __init__(self, app):
+        self.app = app
+        self.interval = app.config["ACTIVITY_FLUSH_INTERVAL"]
+        self.lock = threading.Lock()
+        self.last_login = {}
+        self.last_active = {}
+        self.last_flush = time.monotonic()
+
+    def __len__(self):
+        return len(self.last_active)
+
+    def due_at(self):
+        return self.last_flush + self.interval
+
+    def take(self):
+        with self.lock:
+            pending = self.last_login, self.last_active
+            self.last_login, self.last_active = {}, {}
+            self.last_flush = time.monotonic()
+        return pending
+
+    def restore(self, last_login, last_active):
+        """Put back updates from a failed flush without overwriting newer ones"""
+        with self.lock:
+            for target, pending in ((self.last_login, last_login), (self.last_active, last_active)):
+                for user_id, seen in pending.items():
+                    if user_id not in target or target[user_id] < seen:
+                        target[user_id] = seen
+
+class ActivityTracker:
+    """
+    Write-behind buffer for User.last_login / User.last_active.
+
+    Page hits only record a timestamp in memory. The buffer is written with
+    one executemany UPDATE per column once ACTIVITY_FLUSH_SIZE users are
+    pending or ACTIVITY_FLUSH_INTERVAL seconds have passed, and once more
+    when the worker process exits. A background thread, started with the
+    first recorded hit in each process, flushes on the interval even when
+    no further requests arrive.
+    """
+
+    def __init__(self, app=None):
+        # one buffer per app; apps that are gone need no final flush
+        self._buffers = weakref.WeakSet()
+        self._timer = None
+        self._timer_lock = threading.Lock()
+        atexit.register(self._flush_all)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("ACTIVITY_FLUSH_INTERVAL", 30)
+        app.config.setdefault("ACTIVITY_FLUSH_SIZE", 500)
+        buffer = _ActivityBuffer(app)
+        app.extensions["activity_tracker"] = buffer
+        self._buffers.add(buffer)
+
+    def record(self, user_id, login=False, when=None):
+        buffer = current_app.extensions["activity_tracker"]
+        self._start_timer()
+        when = when or datetime.utcnow()
+        with buffer.lock:
+            buffer.last_active[user_id] = when
+            if login:
+                buffer.last_login[user_id] = when
+            due = (len(buffer) >= current_app.config["ACTIVITY_FLUSH_SIZE"] or
+                   time.monotonic() - buffer.last_flush >= current_app.config["ACTIVITY_FLUSH_INTERVAL"])
+        if due:
+            self._flush_buffer(buffer)
+
+    def flush(self):
+        return self._flush_buffer(current_app.extensions["activity_tracker"])
+
+    def _flush_all(self):
+        for buffer in list(self._buffers):
+            self._flush_buffer(buffer)
+
+    def _start_timer(self):
+        # started lazily so that each forked worker runs its own
+        if self._timer is not None and self._timer.is_alive():
+            return
+        with self._timer_lock:
+            if self._timer is None or not self._timer.is_alive():
+                self._timer = threading.Thread(target=self._flush_on_interval,
+                                               name="activity-flush", daemon=True)
+                self._timer.start()
+
+    def _flush_on_interval(self):
+        while True:
+            buffers = list(self._buffers)
+            now = time.monotonic()
+            for buffer in buffers:
+                if len(buffer) and buffer.due_at() <= now:
+                    self._flush_buffer(buffer)
+            # wake up when the next buffer falls due; hits on an empty
+            # buffer are flushed by record() if it is already overdue
+            now = time.monotonic()
+            due = [buffer.due_at() if len(buffer) else now + buffer.interval for buffer in buffers]
+            del buffers
+            time.sleep(max(min(due, default=now + 1.0) - now, 0.1))
+
+    def _flush_buffer(self, buffer):
+        from app import db
+        from app.models.user import User
+        from sqlalchemy import bindparam
+
+        last_login, last_active = buffer.take()
+        if not last_active and not last_login:
+            return 0
+
+        table = User.__table__
+        try:
+            with buffer.app.app_context(), db.engine.begin() as connection:
+                for column, pending in (("last_active", last_active), ("last_login", last_login)):
+                    if pending:
+                        connection.execute(
+                            table.update()
+                            .where(table.c.id == bindparam("user_id"))
+                            .values({column: bindparam("seen")}),
+                            [{"user_id": user_id, "seen": seen} for user_id, seen in pending.items()]
+                        )
+        except Exception:
+            logger.exception("Could not flush user activity, will retry")
+            buffer.restore(last_login, last_active)
+            return 0
+        return len(last_active)
@@ -1,23 +1,30 @@
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
+from markupsafe import Markup
 from app.admin import bp
 from app.models.user import User, Professional, Customer
 from app.models.service import Service
 from app.models.request import ServiceRequest
 from app.forms.service import ServiceForm
-from app import db
+from app.services.suggestion_index import refresh_suggestions
+from app import db, catalog_cache
+from app.database import read_only
 
 # ... [keep existing dashboard routes] ...
 
 @bp.route("/services")
+@read_only
 @login_required
 def services():
     if not current_user.role == "admin":
         flash("Access denied", "danger")
         return redirect(url_for("auth.login"))
     
-    services = Service.query.all()
-    return render_template("admin/services.html", services=services)
+    # the rows only depend on the catalog, not on the admin viewing them
+    service_rows = Markup(catalog_cache.get_or_set("admin_service_rows", {}, lambda:
+        render_template("admin/service_rows.html", services=Service.query.all())
+    ))
+    return render_template("admin/services.html", service_rows=service_rows)
 
 @bp.route("/service/create", methods=["GET", "POST"])
 @login_required
@@ -36,6 +43,8 @@ def create_service():
         )
         db.session.add(service)
         db.session.commit()
+        refresh_suggestions(service)
+        catalog_cache.invalidate()
         flash("Service created successfully!", "success")
         return redirect(url_for("admin.services"))
     
@@ -57,6 +66,8 @@ def edit_service(id):
         service.base_price = form.base_price.data
         service.time_required = form.time_required.data
         db.session.commit()
+        refresh_suggestions(service)
+        catalog_cache.invalidate()
         flash("Service updated successfully!", "success")
         return redirect(url_for("admin.services"))
     
@@ -72,5 +83,7 @@ def delete_service(id):
     service = Service.query.get_or_404(id)
     service.is_active = False
     db.session.commit()
+    refresh_suggestions(service)
+    catalog_cache.invalidate()
     flash("Service has been deleted!", "success")
     return redirect(url_for("admin.services"))
@@ -1,5 +1,20 @@
-from flask import Blueprint
+from flask import Blueprint, request
 
 bp = Blueprint("api", __name__)
 
-from app.api import users, services, requests
+from app.api import users, services, requests, profiler
+
+# JSON errors for API clients
+@bp.errorhandler(400)
+@bp.errorhandler(401)
+@bp.errorhandler(403)
+@bp.errorhandler(404)
+def api_error(error):
+    return {"error": error.description}, error.code
+
+@bp.after_request
+def revalidate(response):
+    """Answer a matching If-None-Match with an empty 304, cached or not"""
+    if response.status_code == 200 and response.get_etag()[0]:
+        return response.make_conditional(request)
+    return response
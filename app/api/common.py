@@ -0,0 +1,103 @@
+from flask import request, jsonify, abort
+from flask_login import current_user
+from functools import wraps
+from datetime import datetime
+from app import db
+from app.services.pagination import keyset_paginate
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+def api_login_required(f):
+    """login_required for JSON clients: 401 instead of a redirect to the login page"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            abort(401, description="Login required")
+        return f(*args, **kwargs)
+    return decorated_function
+
+def selected_fields(fields):
+    """Field names requested with ?fields=a,b, or every field; 400 on unknown names"""
+    raw = request.args.get("fields")
+    if not raw:
+        return list(fields)
+    names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name not in fields]
+    if unknown or not names:
+        abort(400, description=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields selected")
+    return names
+
+def _is_datetime(column):
+    try:
+        return column.type.python_type is datetime
+    except NotImplementedError:
+        return False
+
+def serialize_rows(rows, names, columns):
+    """
+    Turn column tuples into dicts. Datetimes are formatted like the models'
+    to_dict ("YYYY-MM-DD HH:MM:SS") with isoformat, which is much cheaper
+    than strftime, and only for the columns that hold datetimes.
+    """
+    datetimes = [i for i, column in enumerate(columns) if _is_datetime(column)]
+    items = []
+    for row in rows:
+        if datetimes:
+            row = list(row)
+            for i in datetimes:
+                if row[i] is not None:
+                    row[i] = row[i].isoformat(" ", "seconds")
+        items.append(dict(zip(names, row)))
+    return items
+
+def conditional_json(payload):
+    """
+    JSON response with a content ETag. A client sending the same ETag in
+    If-None-Match gets an empty 304 instead of the body (see revalidate).
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def list_response(fields, criteria, sort, descending=False):
+    """
+    One keyset-paginated page of the selected fields. Only the selected
+    columns are queried, so rows are never loaded as ORM objects and no
+    relationship is touched. `sort` names the fields forming a unique
+    sort key; they are fetched even when not selected.
+    """
+    names = selected_fields(fields)
+    fetched = names + [name for name in sort if name not in names]
+    columns = [fields[name] for name in fetched]
+    labelled = {name: column.label(name) for name, column in zip(fetched, columns)}
+
+    per_page = min(request.args.get("per_page", API_PAGE_SIZE, type=int), API_MAX_PAGE_SIZE)
+    page = keyset_paginate(
+        db.session.query(*labelled.values()).filter(*criteria),
+        [labelled[name] for name in sort],
+        cursor=request.args.get("cursor"),
+        per_page=max(per_page, 1),
+        descending=descending
+    )
+
+    items = serialize_rows(page.items, fetched, columns)
+    if len(fetched) > len(names):
+        for item in items:
+            for name in fetched[len(names):]:
+                del item[name]
+    return conditional_json({
+        "items": items,
+        "next_cursor": page.next_cursor,
+        "has_next": page.has_next
+    })
+
+def detail_response(fields, criteria):
+    """The selected fields of the single row matching `criteria`, or 404"""
+    names = selected_fields(fields)
+    columns = [fields[name] for name in names]
+    row = db.session.query(*columns).filter(*criteria).first()
+    if row is None:
+        abort(404)
+    return conditional_json(serialize_rows([row], names, columns)[0])
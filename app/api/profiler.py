@@ -0,0 +1,20 @@
+from app.api import bp
+from app.api.common import api_login_required
+from app import query_profiler
+from flask import abort
+from flask_login import current_user
+
+@bp.route("/query-profile")
+@api_login_required
+def get_query_profile():
+    if current_user.role != "admin":
+        abort(403, description="Access denied")
+    return {"enabled": query_profiler.enabled(), "endpoints": query_profiler.stats()}
+
+@bp.route("/query-profile", methods=["DELETE"])
+@api_login_required
+def reset_query_profile():
+    if current_user.role != "admin":
+        abort(403, description="Access denied")
+    query_profiler.reset()
+    return "", 204
@@ -1,6 +1,47 @@
 from app.api import bp
-from flask import jsonify
+from app.api.common import api_login_required, list_response, detail_response
+from app.models.request import ServiceRequest
+from app.database import read_only
+from flask import request
+from flask_login import current_user
+
+# same keys as ServiceRequest.to_dict
+REQUEST_FIELDS = {
+    "id": ServiceRequest.id,
+    "service_id": ServiceRequest.service_id,
+    "customer_id": ServiceRequest.customer_id,
+    "professional_id": ServiceRequest.professional_id,
+    "date_of_request": ServiceRequest.date_of_request,
+    "date_of_completion": ServiceRequest.date_of_completion,
+    "status": ServiceRequest.status,
+    "remarks": ServiceRequest.remarks,
+    "rating": ServiceRequest.rating,
+    "review": ServiceRequest.review,
+    "version": ServiceRequest.version
+}
+
+def _visible_requests():
+    """Criteria limiting requests to those the current user may see"""
+    if current_user.role == "customer":
+        return [ServiceRequest.customer_id == current_user.id]
+    if current_user.role == "professional":
+        return [ServiceRequest.professional_id == current_user.id]
+    if current_user.role == "admin":
+        return []
+    return [ServiceRequest.id.is_(None)]
 
 @bp.route("/requests")
+@read_only
+@api_login_required
 def get_requests():
-    return jsonify({"message": "Requests list"})
+    criteria = _visible_requests()
+    if request.args.get("status"):
+        criteria.append(ServiceRequest.status == request.args["status"])
+    # newest first; ids grow with date_of_request
+    return list_response(REQUEST_FIELDS, criteria, sort=["id"], descending=True)
+
+@bp.route("/requests/<int:request_id>")
+@read_only
+@api_login_required
+def get_request(request_id):
+    return detail_response(REQUEST_FIELDS, [ServiceRequest.id == request_id] + _visible_requests())
@@ -1,6 +1,39 @@
 from app.api import bp
-from flask import jsonify
+from app.api.common import list_response, detail_response
+from app.models.service import Service
+from app import catalog_cache
+from app.database import read_only
+from flask import request
+
+# same keys as Service.to_dict
+SERVICE_FIELDS = {
+    "id": Service.id,
+    "name": Service.name,
+    "description": Service.description,
+    "service_type": Service.service_type,
+    "base_price": Service.base_price,
+    "min_price": Service.min_price,
+    "max_price": Service.max_price,
+    "time_required": Service.time_required,
+    "rating": Service.rating,
+    "total_ratings": Service.total_ratings,
+    "is_active": Service.is_active,
+    "availability": Service.availability,
+    "location_coverage": Service.location_coverage,
+    "created_at": Service.created_at
+}
 
 @bp.route("/services")
+@read_only
+@catalog_cache.cached_response("api_services")
 def get_services():
-    return jsonify({"message": "Services list"})
+    criteria = [Service.is_active == True]
+    if request.args.get("service_type"):
+        criteria.append(Service.service_type == request.args["service_type"])
+    return list_response(SERVICE_FIELDS, criteria, sort=["id"])
+
+@bp.route("/services/<int:service_id>")
+@read_only
+@catalog_cache.cached_response("api_service")
+def get_service(service_id):
+    return detail_response(SERVICE_FIELDS, [Service.id == service_id, Service.is_active == True])
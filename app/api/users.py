@@ -1,6 +1,52 @@
 from app.api import bp
-from flask import jsonify
+from app.api.common import api_login_required, list_response, detail_response
+from app.models.user import User, Professional, Customer
+from app import db
+from app.database import read_only
+from flask import request, abort
+from flask_login import current_user
+
+# same keys as User.to_dict and the subclasses' to_dict, which are also
+# the attribute names
+USER_FIELDS = ["id", "username", "email", "role", "created_at", "is_active",
+               "last_login", "status", "last_active"]
+
+ROLE_MODELS = {
+    "professional": (Professional, USER_FIELDS + [
+        "service_type", "experience", "description", "is_verified", "is_available",
+        "qualification", "hourly_rate", "rating", "total_ratings", "location",
+        "completion_rate", "response_time", "languages", "specializations"
+    ]),
+    "customer": (Customer, USER_FIELDS + [
+        "address", "phone", "default_location", "preferred_payment_method",
+        "total_spent", "default_pincode"
+    ])
+}
+
+def _fields(role):
+    """Field columns for a role, taken from the subclass so its table is joined once"""
+    model, names = ROLE_MODELS.get(role, (User, USER_FIELDS))
+    return model, {name: getattr(model, name) for name in names}
 
 @bp.route("/users")
+@read_only
+@api_login_required
 def get_users():
-    return jsonify({"message": "Users list"})
+    if current_user.role != "admin":
+        abort(403, description="Access denied")
+    role = request.args.get("role")
+    model, fields = _fields(role)
+    criteria = [User.role == role] if role else []
+    return list_response(fields, criteria, sort=["id"])
+
+@bp.route("/users/<int:user_id>")
+@read_only
+@api_login_required
+def get_user(user_id):
+    if current_user.role != "admin" and current_user.id != user_id:
+        abort(403, description="Access denied")
+    role = db.session.query(User.role).filter(User.id == user_id).scalar()
+    if role is None:
+        abort(404)
+    model, fields = _fields(role)
+    return detail_response(fields, [model.id == user_id])
@@ -0,0 +1,220 @@
+from flask import current_app, request
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import json
+import threading
+import time
+
+def normalize_params(params):
+    """
+    Canonical form of request parameters for a cache key: surrounding and
+    repeated whitespace is dropped, empty values are left out and the
+    order of keys does not matter
+    """
+    normalized = {}
+    for key, value in params.items():
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        if value not in (None, "", [], ()):
+            normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+class MemoryBackend:
+    """Bounded LRU of entries in this process, with a process-local version"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.current_version = 0
+        self.evictions = 0
+
+    def version(self):
+        return self.current_version
+
+    def bump(self):
+        with self.lock:
+            self.current_version += 1
+            # entries of older versions can never be read again
+            self.entries.clear()
+            return self.current_version
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def size(self):
+        return len(self.entries)
+
+class RedisBackend:
+    """
+    Entries and version in a Redis-compatible server, shared by every
+    worker process. Entries of old versions are left to expire. Values
+    are stored as JSON, never pickled: anyone who can write to the server
+    could otherwise run code in every worker.
+    """
+    prefix = "catalog:"
+
+    def __init__(self, url, ttl):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CATALOG_CACHE_URL is set but the redis package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        # guards this process's counters; the entries live in Redis
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def version(self):
+        return int(self.client.get(self.prefix + "version") or 0)
+
+    def bump(self):
+        return self.client.incr(self.prefix + "version")
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def size(self):
+        return None
+
+class CatalogCache:
+    """
+    Cache of rendered fragments, query results and responses built from
+    the service catalog.
+
+    Keys hold the catalog version, so every write that bumps it with
+    invalidate() makes all earlier entries unreachable at once. The
+    in-process backend only sees bumps made by its own process; with
+    several workers set CATALOG_CACHE_URL so they share one version, or
+    rely on CATALOG_CACHE_TTL to bound how stale another worker can be.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("CATALOG_CACHE_SIZE", 512)
+        app.config.setdefault("CATALOG_CACHE_TTL", 300)
+        app.config.setdefault("CATALOG_CACHE_URL", None)
+        if app.config["CATALOG_CACHE_SIZE"] <= 0:
+            backend = None
+        elif app.config["CATALOG_CACHE_URL"]:
+            backend = RedisBackend(app.config["CATALOG_CACHE_URL"], app.config["CATALOG_CACHE_TTL"])
+        else:
+            backend = MemoryBackend(app.config["CATALOG_CACHE_SIZE"], app.config["CATALOG_CACHE_TTL"])
+        app.extensions["catalog_cache"] = {"backend": backend, "hits": 0, "misses": 0, "invalidations": 0}
+
+    def _state(self):
+        return current_app.extensions["catalog_cache"]
+
+    def key(self, name, params=None):
+        digest = hashlib.sha1(normalize_params(params or {}).encode()).hexdigest()
+        return f"{self._state()['backend'].version()}:{name}:{digest}"
+
+    def _lookup(self, key):
+        state = self._state()
+        value = state["backend"].get(key)
+        with state["backend"].lock:
+            if value is None:
+                state["misses"] += 1
+            else:
+                state["hits"] += 1
+        return value
+
+    def get_or_set(self, name, params, compute):
+        """
+        The cached value for `name` and `params` in the current catalog
+        version, computing and storing it on a miss. Values must be
+        JSON-serialisable (dicts, lists, strings, numbers); a Redis backend
+        hands them back as plain JSON types, so e.g. Markup comes back as
+        str and tuples as lists.
+        """
+        backend = self._state()["backend"]
+        if backend is None:
+            return compute()
+
+        key = self.key(name, params)
+        value = self._lookup(key)
+        if value is None:
+            value = compute()
+            backend.set(key, value)
+        return value
+
+    def cached_response(self, name):
+        """
+        Cache the body and ETag of a view's 200 responses per view
+        arguments and query string. Hits are answered without calling the
+        view; views must leave If-None-Match to an after_request hook so
+        that a revalidating client still fills the cache.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                backend = self._state()["backend"]
+                if backend is None:
+                    return f(*args, **kwargs)
+
+                key = self.key(name, {"view": kwargs, "args": sorted(request.args.items(multi=True))})
+                entry = self._lookup(key)
+                if entry is None:
+                    response = f(*args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    backend.set(key, [response.get_data(as_text=True), response.mimetype,
+                                      response.get_etag()[0], response.headers.get("Cache-Control")])
+                    return response
+
+                body, mimetype, etag, cache_control = entry
+                response = current_app.response_class(body, mimetype=mimetype)
+                if etag:
+                    response.set_etag(etag)
+                if cache_control:
+                    response.headers["Cache-Control"] = cache_control
+                return response
+            return decorated_function
+        return decorator
+
+    def invalidate(self):
+        """Bump the catalog version; call after committing a catalog change"""
+        state = self._state()
+        backend = state["backend"]
+        if backend is not None:
+            backend.bump()
+            with backend.lock:
+                state["invalidations"] += 1
+
+    def stats(self):
+        state = self._state()
+        lookups = state["hits"] + state["misses"]
+        backend = state["backend"]
+        return {
+            "version": backend.version() if backend else None,
+            "size": backend.size() if backend else 0,
+            "hits": state["hits"],
+            "misses": state["misses"],
+            "hit_rate": state["hits"] / lookups if lookups else 0.0,
+            "invalidations": state["invalidations"],
+            "evictions": backend.evictions if backend else 0
+        }
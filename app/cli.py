@@ -0,0 +1,191 @@
+from flask.cli import AppGroup
+from app.services.bulk_io import FORMATS, read_rows
+from app.services.catalog_io import CatalogIO
+from app.services.user_provisioning import UserProvisioning
+from app.services.synthetic_data import SyntheticData
+from app.services.dashboard_stats import DashboardStats
+from app import db
+import click
+import sqlite3
+import sys
+import time
+
+# seconds between progress lines
+PROGRESS_INTERVAL = 2.0
+
+services_cli = AppGroup("services", help="Bulk import and export of the service catalog.")
+users_cli = AppGroup("users", help="Bulk provisioning of customer and professional accounts.")
+data_cli = AppGroup("data", help="Synthetic data and database snapshots for development and benchmarks.")
+
+def _format_for(path, fmt):
+    if fmt:
+        return fmt
+    for name, suffixes in (("csv", (".csv",)), ("jsonl", (".jsonl", ".ndjson"))):
+        if path.lower().endswith(suffixes):
+            return name
+    raise click.UsageError("Cannot tell the format from the file name, pass --format")
+
+def _throttled(report):
+    """Call report at most once per PROGRESS_INTERVAL"""
+    last = [0.0]
+
+    def progress(*args):
+        now = time.monotonic()
+        if now - last[0] >= PROGRESS_INTERVAL:
+            last[0] = now
+            report(*args)
+    return progress
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="")
+
+@services_cli.command("import")
+@click.argument("path")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), help="Defaults to the file extension.")
+@click.option("--upsert", is_flag=True, help="Update services whose id is in the file instead of ignoring ids.")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+@click.option("--dry-run", is_flag=True, help="Validate every row without writing anything.")
+def import_services(path, fmt, upsert, batch_size, dry_run):
+    """Load services from a CSV or JSON lines file, or - for stdin."""
+    fmt = _format_for(path, fmt) if path != "-" else (fmt or "jsonl")
+
+    @_throttled
+    def progress(totals):
+        rate = totals["read"] / totals["seconds"] if totals["seconds"] else 0
+        click.echo(f"{totals['read']:,} rows read, {totals['rejected']:,} rejected, "
+                   f"{rate:,.0f} rows/s", err=True)
+
+    def on_error(line_no, message):
+        click.echo(f"line {line_no}: {message}", err=True)
+
+    stream = _open(path, "r")
+    try:
+        totals = CatalogIO.import_services(read_rows(stream, fmt), upsert=upsert, batch_size=batch_size,
+                                           dry_run=dry_run, progress=progress, on_error=on_error)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    rate = totals["read"] / totals["seconds"] if totals["seconds"] else 0
+    action = "validated" if dry_run else f"{totals['inserted']:,} inserted, {totals['updated']:,} updated"
+    click.echo(f"{totals['read']:,} rows {action}, {totals['rejected']:,} rejected "
+               f"in {totals['seconds']:.2f}s ({rate:,.0f} rows/s)")
+    if totals["rejected"]:
+        sys.exit(1)
+
+@services_cli.command("export")
+@click.argument("path")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), help="Defaults to the file extension.")
+@click.option("--include-inactive", is_flag=True, help="Also export deleted services.")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+def export_services(path, fmt, include_inactive, batch_size):
+    """Write the catalog to a CSV or JSON lines file, or - for stdout."""
+    fmt = _format_for(path, fmt) if path != "-" else (fmt or "jsonl")
+
+    @_throttled
+    def progress(count, seconds):
+        click.echo(f"{count:,} rows written, {count / seconds if seconds else 0:,.0f} rows/s", err=True)
+
+    start = time.perf_counter()
+    stream = _open(path, "w")
+    try:
+        count = CatalogIO.export_services(stream, fmt, include_inactive=include_inactive,
+                                          batch_size=batch_size, progress=progress)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    seconds = time.perf_counter() - start
+    click.echo(f"{count:,} rows exported in {seconds:.2f}s "
+               f"({count / seconds if seconds else 0:,.0f} rows/s)", err=True)
+
+@users_cli.command("provision")
+@click.argument("path")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), help="Defaults to the file extension.")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+@click.option("--workers", type=click.IntRange(min=0),
+              help="Password hashing processes, 0 to hash in this process. Defaults to the CPU count.")
+@click.option("--dry-run", is_flag=True, help="Validate every row without hashing or writing anything.")
+def provision_users(path, fmt, batch_size, workers, dry_run):
+    """Create accounts from a CSV or JSON lines file, or - for stdin.
+
+    Each row needs username, email and password, and may give a role
+    (customer, the default, or professional) and that role's profile
+    columns.
+    """
+    fmt = _format_for(path, fmt) if path != "-" else (fmt or "jsonl")
+
+    @_throttled
+    def progress(totals):
+        rate = totals["created"] / totals["seconds"] if totals["seconds"] else 0
+        click.echo(f"{totals['read']:,} rows read, {totals['created']:,} created, "
+                   f"{totals['rejected']:,} rejected, {rate:,.0f} users/s", err=True)
+
+    def on_error(line_no, message):
+        click.echo(f"line {line_no}: {message}", err=True)
+
+    stream = _open(path, "r")
+    try:
+        totals = UserProvisioning.provision(read_rows(stream, fmt), batch_size=batch_size, workers=workers,
+                                            dry_run=dry_run, progress=progress, on_error=on_error)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    rate = totals["created"] / totals["seconds"] if totals["seconds"] else 0
+    action = "validated" if dry_run else f"{totals['created']:,} created"
+    click.echo(f"{totals['read']:,} rows {action}, {totals['rejected']:,} rejected "
+               f"in {totals['seconds']:.2f}s ({rate:,.0f} users/s)")
+    if totals["rejected"]:
+        sys.exit(1)
+
+@data_cli.command("generate")
+@click.option("--customers", default=1000, show_default=True, type=click.IntRange(min=0))
+@click.option("--professionals", default=200, show_default=True, type=click.IntRange(min=0))
+@click.option("--services", default=100, show_default=True, type=click.IntRange(min=0))
+@click.option("--requests", default=5000, show_default=True, type=click.IntRange(min=0))
+@click.option("--seed", default=0, show_default=True, type=int)
+@click.option("--anchor", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Date the generated history ends on. Defaults to today; fix it for identical data.")
+@click.option("--password", default="password", show_default=True, help="Password of every generated user.")
+def generate_data(customers, professionals, services, requests, seed, anchor, password):
+    """Load realistic users, services, requests and payments into an empty database."""
+    start = time.perf_counter()
+    try:
+        counts = SyntheticData(seed=seed, anchor=anchor, password=password).generate(
+            customers=customers, professionals=professionals, services=services, requests=requests
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    seconds = time.perf_counter() - start
+    rows = sum(counts[name] for name in ("users", "services", "requests", "payments"))
+    click.echo(", ".join(f"{count:,} {name}" for name, count in counts.items())
+               + f" in {seconds:.2f}s ({rows / seconds:,.0f} rows/s)")
+
+@data_cli.command("rebuild-counters")
+def rebuild_counters():
+    """Recompute the admin dashboard counters used when DASHBOARD_COUNTERS is on."""
+    start = time.perf_counter()
+    stats = DashboardStats.rebuild_counters()
+    click.echo(f"Rebuilt {len(stats):,} dashboard counters in {time.perf_counter() - start:.2f}s")
+
+@data_cli.command("snapshot")
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+def snapshot(path):
+    """Copy the SQLite database to PATH, e.g. to serve as a local DATABASE_READ_URL replica."""
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException("snapshots are only supported for SQLite databases")
+    start = time.perf_counter()
+    source = db.engine.raw_connection()
+    target = sqlite3.connect(path)
+    try:
+        # the online backup API copies a consistent view while writers continue
+        source.driver_connection.backup(target)
+    finally:
+        target.close()
+        source.close()
+    click.echo(f"Copied the database to {path} in {time.perf_counter() - start:.2f}s")
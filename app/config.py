@@ -10,3 +10,49 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or "jwt-key-please-change"
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # Serve admin dashboard statistics from the incrementally maintained
+    # dashboard_counters table instead of aggregating on every load; seed
+    # the table with `flask data rebuild-counters` before turning this on
+    DASHBOARD_COUNTERS = os.environ.get("DASHBOARD_COUNTERS", "false").lower() == "true"
+    # Buffered last_login/last_active writes are flushed after this many
+    # seconds or once this many users are pending, whichever comes first
+    ACTIVITY_FLUSH_INTERVAL = int(os.environ.get("ACTIVITY_FLUSH_INTERVAL", 30))
+    ACTIVITY_FLUSH_SIZE = int(os.environ.get("ACTIVITY_FLUSH_SIZE", 500))
+    # Flask-Login user loader cache; set USER_CACHE_SIZE to 0 to disable
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 1024))
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 30))
+    # Catalog page, search result and API response cache; set
+    # CATALOG_CACHE_SIZE to 0 to disable. CATALOG_CACHE_URL (redis://...)
+    # shares entries and the catalog version between worker processes and
+    # needs the redis package.
+    CATALOG_CACHE_SIZE = int(os.environ.get("CATALOG_CACHE_SIZE", 512))
+    CATALOG_CACHE_TTL = int(os.environ.get("CATALOG_CACHE_TTL", 300))
+    CATALOG_CACHE_URL = os.environ.get("CATALOG_CACHE_URL")
+    # Per-request SQL profiling, off by default: per-endpoint query counts
+    # and time, statements slower than QUERY_PROFILER_SLOW_MS and shapes
+    # repeated more than QUERY_PROFILER_REPEATS times in one request (N+1)
+    QUERY_PROFILER = os.environ.get("QUERY_PROFILER", "false").lower() == "true"
+    QUERY_PROFILER_SLOW_MS = float(os.environ.get("QUERY_PROFILER_SLOW_MS", 100))
+    QUERY_PROFILER_REPEATS = int(os.environ.get("QUERY_PROFILER_REPEATS", 5))
+    # "production" tunes file-backed SQLite for concurrent requests: WAL,
+    # synchronous=NORMAL, a busy timeout (ms), mmap and page cache (negative
+    # means KiB) pragmas, IMMEDIATE write transactions and queries on a
+    # separate pool of read-only connections
+    DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "default")
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.environ.get("SQLITE_CACHE_SIZE", -64000))
+    SQLITE_WRITE_POOL_SIZE = int(os.environ.get("SQLITE_WRITE_POOL_SIZE", 4))
+    SQLITE_READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", 8))
+    # Read replica for views marked @read_only (search, dashboards, payment
+    # history, invoices, API reads); a request that writes stays on the
+    # primary afterwards. Any database URL, e.g. a second SQLite file made
+    # with `flask data snapshot`.
+    DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
+    # Seconds a user keeps reading from the primary after a request of
+    # theirs wrote, so the page a write redirects to is never stale; should
+    # exceed the replica's usual lag.
+    DATABASE_READ_STICKY_SECONDS = float(os.environ.get("DATABASE_READ_STICKY_SECONDS", 10))
+
+class ProductionConfig(Config):
+    DATABASE_PROFILE = "production"
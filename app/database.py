@@ -0,0 +1,176 @@
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm.context import FromStatement
+import time
+
+READ_BIND = "read"
+# session key holding when the user's last write was made
+WROTE_AT = "database_wrote_at"
+
+def _is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def sqlite_pragmas(config, read_only=False):
+    """PRAGMA statements run on every new connection of the production profile"""
+    pragmas = [
+        # WAL lets readers run alongside the single writer; it is stored
+        # in the file, so this only does work on the first connection
+        "PRAGMA journal_mode=WAL",
+        # durable at checkpoints instead of every commit; safe with WAL
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+def _tune_engine(engine, pragmas, immediate=False):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        if immediate:
+            # let SQLAlchemy emit BEGIN itself instead of the driver
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if immediate:
+        # take the write lock when the transaction starts: a deferred
+        # transaction that reads first and then writes cannot wait for
+        # the lock and fails with "database is locked" straight away
+        @event.listens_for(engine, "begin")
+        def begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def read_only(f):
+    """
+    Mark a view as read-only, so its queries may be answered by the read
+    replica (DATABASE_READ_URL). A view that writes anyway is moved back
+    to the primary from its first write on.
+    """
+    f.read_only = True
+    return f
+
+def _read_only_request():
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, "read_only", False)
+
+def _wrote_recently():
+    wrote_at = session.get(WROTE_AT)
+    return wrote_at is not None and time.time() - wrote_at < current_app.config["DATABASE_READ_STICKY_SECONDS"]
+
+def _remember_write(response):
+    """Keep the user on the primary for a while after a request that wrote"""
+    if g.get("database_wrote"):
+        session[WROTE_AT] = time.time()
+    return response
+
+def _plain_select(clause):
+    # the ORM wraps some loads, such as a subclass's own columns under
+    # joined inheritance, in a FromStatement around the SELECT
+    if isinstance(clause, FromStatement):
+        clause = clause.element
+    return clause is not None and clause.is_select and getattr(clause, "_for_update_arg", None) is None
+
+def init_database(app, db):
+    """
+    Set up Flask-SQLAlchemy for the configured DATABASE_PROFILE and read
+    replica.
+
+    The "production" profile applies to file-backed SQLite. The default
+    engine becomes the write engine, whose transactions begin IMMEDIATE.
+    A second, read-only engine (the "read" bind) on the same file has its
+    own larger pool, and RoutingSession sends queries there. Both engines
+    run the tuning pragmas on every new connection. Other databases and
+    the default profile are left untouched.
+
+    DATABASE_READ_URL points the "read" bind at a replica instead, in any
+    profile. A replica may lag behind the primary, so only views marked
+    @read_only read from it.
+    """
+    app.config.setdefault("DATABASE_PROFILE", "default")
+    app.config.setdefault("SQLITE_BUSY_TIMEOUT", 5000)
+    app.config.setdefault("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+    app.config.setdefault("SQLITE_CACHE_SIZE", -64000)
+    app.config.setdefault("SQLITE_WRITE_POOL_SIZE", 4)
+    app.config.setdefault("SQLITE_READ_POOL_SIZE", 8)
+    app.config.setdefault("DATABASE_READ_URL", None)
+    app.config.setdefault("DATABASE_READ_STICKY_SECONDS", 10)
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    replica_uri = app.config["DATABASE_READ_URL"]
+    tuned = app.config["DATABASE_PROFILE"] == "production" and _is_file_sqlite(uri)
+
+    if tuned:
+        write_pool = app.config["SQLITE_WRITE_POOL_SIZE"]
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": write_pool, "max_overflow": write_pool,
+            **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+        }
+    if tuned or replica_uri:
+        read_pool = app.config["SQLITE_READ_POOL_SIZE"]
+        app.config["SQLALCHEMY_BINDS"] = {
+            READ_BIND: {"url": replica_uri or uri, "pool_size": read_pool, "max_overflow": read_pool},
+            **(app.config.get("SQLALCHEMY_BINDS") or {})
+        }
+    app.extensions["database"] = {"replica": bool(replica_uri)}
+    if replica_uri:
+        app.after_request(_remember_write)
+
+    db.init_app(app)
+
+    with app.app_context():
+        if tuned:
+            _tune_engine(db.engine, sqlite_pragmas(app.config), immediate=True)
+        read_engine = db.engines.get(READ_BIND)
+        if read_engine is not None and read_engine.dialect.name == "sqlite":
+            # nothing is ever written through the read engine
+            pragmas = sqlite_pragmas(app.config, read_only=True) if tuned else ["PRAGMA query_only=ON"]
+            _tune_engine(read_engine, pragmas)
+
+class RoutingSession(Session):
+    """
+    Session that runs plain SELECTs on the "read" engine when one is
+    configured. Against a replica that only happens in @read_only views;
+    a read engine on the primary's own file serves every query.
+
+    Once a transaction writes, every statement uses the write engine, so
+    the transaction reads its own uncommitted changes. Against a replica
+    the rest of the request stays on the primary as well, because the
+    replica may not have caught up with the write yet, and so do the
+    same user's requests for DATABASE_READ_STICKY_SECONDS after it: a
+    redirect after a write must show what was just written.
+    """
+
+    def _may_read_elsewhere(self):
+        replica = current_app.extensions["database"]["replica"]
+        if not has_request_context():
+            return not replica
+        if not replica:
+            return True
+        if g.get("database_wrote") or _wrote_recently():
+            return False
+        return _read_only_request()
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self.info.get("wrote"):
+            read_engine = self._db.engines.get(READ_BIND)
+            if read_engine is None:
+                return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+            if not self._flushing and _plain_select(clause) and self._may_read_elsewhere():
+                return read_engine
+            # DML, flushes, raw connections and anything else may write
+            self.info["wrote"] = True
+            if has_request_context():
+                g.database_wrote = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _forget_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("wrote", None)
@@ -0,0 +1,76 @@
+import os
+import secrets
+import threading
+import time
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+TIMESTAMP_BITS = 48
+NODE_BITS = 22  # enough for any Linux pid (pid_max <= 2**22)
+RANDOM_BITS = 40  # drawn once per process
+SEQUENCE_BITS = 16
+ID_BITS = TIMESTAMP_BITS + NODE_BITS + RANDOM_BITS + SEQUENCE_BITS
+ID_LENGTH = -(-ID_BITS // 5)  # base32 characters
+
+class IdGenerator:
+    """
+    Generates unique, time-sortable identifiers without touching the
+    database.
+
+    An id is a millisecond timestamp, the process id, 40 random bits
+    drawn when the process starts (or forks) and a per-millisecond
+    sequence, written in Crockford base32. Process ids are unique among
+    the live processes on one host, so its workers never hand out the
+    same id. The random bits cover what the pid cannot: processes on
+    other hosts, and a pid reused by a new process within the same
+    millisecond. Two such processes collide only if their random bits
+    also match, a 1 in 2**40 chance. Within a process ids are strictly
+    increasing, even if the wall clock steps backwards or more than 65536
+    ids are requested in one millisecond.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._random = 0
+        self._last_ms = 0
+        self._sequence = 0
+
+    def _next_components(self):
+        with self._lock:
+            pid = os.getpid()
+            if pid != self._pid:
+                # fresh state after a fork so children never replay the parent
+                self._pid, self._last_ms, self._sequence = pid, 0, 0
+                self._random = secrets.randbits(RANDOM_BITS)
+
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms, self._sequence = now_ms, 0
+            else:
+                self._sequence += 1
+                if self._sequence >> SEQUENCE_BITS:
+                    # sequence exhausted: borrow the next millisecond
+                    self._last_ms, self._sequence = self._last_ms + 1, 0
+            return self._last_ms, pid, self._random, self._sequence
+
+    def next_int(self):
+        timestamp, node, random, sequence = self._next_components()
+        value = timestamp & ((1 << TIMESTAMP_BITS) - 1)
+        value = (value << NODE_BITS) | (node & ((1 << NODE_BITS) - 1))
+        value = (value << RANDOM_BITS) | random
+        return (value << SEQUENCE_BITS) | sequence
+
+    def next_id(self, prefix=None):
+        value = self.next_int()
+        chars = []
+        for _ in range(ID_LENGTH):
+            value, remainder = divmod(value, 32)
+            chars.append(CROCKFORD[remainder])
+        encoded = "".join(reversed(chars))
+        return f"{prefix}-{encoded}" if prefix else encoded
+
+ids = IdGenerator()
+
+def new_id(prefix=None):
+    return ids.next_id(prefix)
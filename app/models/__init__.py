@@ -1,3 +1,9 @@
 from .user import User, Admin, Professional, Customer
+from .service_area import ProfessionalServiceArea
+from .associations import (
+    ProfessionalLanguage, ProfessionalSpecialization, ProfessionalCertification, CustomerFavorite
+)
 from .service import Service
 from .request import ServiceRequest
+from .payment import Payment, Invoice
+from .dashboard import DashboardCounter
@@ -0,0 +1,92 @@
+from app import db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from datetime import datetime
+import json
+
+def normalize_tag(value):
+    """Case and whitespace insensitive form of a language, specialization or certification"""
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower() or None
+
+def parse_tags(value):
+    """Distinct normalized entries of a JSON list or comma-separated string"""
+    if not value:
+        return []
+    try:
+        entries = json.loads(value)
+    except ValueError:
+        entries = value.split(",")
+    if not isinstance(entries, list):
+        entries = [entries]
+
+    tags = []
+    for entry in entries:
+        tag = normalize_tag(entry) if isinstance(entry, (str, int, float)) else None
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+class ProfessionalLanguage(db.Model):
+    __tablename__ = "professional_language"
+    professional_id = db.Column(db.Integer, db.ForeignKey("professional.id", ondelete="CASCADE"), primary_key=True)
+    language = db.Column(db.String(50), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_professional_language_language", "language", "professional_id"),
+    )
+
+class ProfessionalSpecialization(db.Model):
+    __tablename__ = "professional_specialization"
+    professional_id = db.Column(db.Integer, db.ForeignKey("professional.id", ondelete="CASCADE"), primary_key=True)
+    name = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_professional_specialization_name", "name", "professional_id"),
+    )
+
+class ProfessionalCertification(db.Model):
+    __tablename__ = "professional_certification"
+    professional_id = db.Column(db.Integer, db.ForeignKey("professional.id", ondelete="CASCADE"), primary_key=True)
+    name = db.Column(db.String(200), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_professional_certification_name", "name", "professional_id"),
+    )
+
+class CustomerFavorite(db.Model):
+    __tablename__ = "customer_favorite"
+    customer_id = db.Column(db.Integer, db.ForeignKey("customer.id", ondelete="CASCADE"), primary_key=True)
+    professional_id = db.Column(db.Integer, db.ForeignKey("professional.id", ondelete="CASCADE"), primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_customer_favorite_professional", "professional_id"),
+    )
+
+# Professional text column -> (relationship holding its rows, row model, value attribute).
+# The text columns stay the editable form; the rows are what lookups use.
+PROFESSIONAL_TAGS = {
+    "languages": ("language_entries", ProfessionalLanguage, "language"),
+    "specializations": ("specialization_entries", ProfessionalSpecialization, "name"),
+    "certifications": ("certification_entries", ProfessionalCertification, "name"),
+}
+
+@event.listens_for(Session, "before_flush")
+def _sync_professional_tags(session, flush_context, instances):
+    from app.models.user import Professional
+
+    for target in list(session.new) + list(session.dirty):
+        if not isinstance(target, Professional):
+            continue
+        state = inspect(target)
+        for column, (relationship, model, field) in PROFESSIONAL_TAGS.items():
+            if not (state.pending or state.attrs[column].history.has_changes()):
+                continue
+            # keep rows whose value survives so unchanged tags are not rewritten
+            existing = {getattr(row, field): row for row in getattr(target, relationship)}
+            setattr(target, relationship, [
+                existing.get(tag) or model(**{field: tag})
+                for tag in parse_tags(getattr(target, column))
+            ])
@@ -0,0 +1,153 @@
+from app import db
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from .user import User, Professional
+from .service import Service
+from .request import ServiceRequest, DONE_STATUSES
+
+class DashboardCounter(db.Model):
+    """
+    Materialized admin dashboard statistics. Rows are kept current by the
+    mapper events below when DASHBOARD_COUNTERS is enabled, so reading the
+    dashboard costs one primary key lookup per statistic.
+    """
+    __tablename__ = "dashboard_counters"
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Float, nullable=False, default=0.0)
+
+    @staticmethod
+    def signups_key(day):
+        return f"signups:{day.isoformat()}"
+
+def _is_professional(s):
+    return s.get("role") == "professional"
+
+# counter name -> contribution of a single row, computed from a snapshot
+# of the tracked attributes
+USER_COUNTERS = {
+    "total_users": lambda s: 1,
+    "total_professionals": lambda s: int(_is_professional(s)),
+    "total_customers": lambda s: int(s.get("role") == "customer"),
+    "pending_verifications": lambda s: int(_is_professional(s) and s.get("is_verified") == False),
+    "online_professionals": lambda s: int(_is_professional(s) and s.get("status") == "online"),
+    "total_earnings": lambda s: (s.get("total_earnings") or 0.0) if _is_professional(s) else 0.0,
+}
+
+SERVICE_COUNTERS = {
+    "total_services": lambda s: 1,
+}
+
+REQUEST_COUNTERS = {
+    "active_requests": lambda s: int(s.get("status") == "assigned"),
+    "pending_reviews": lambda s: int(s.get("status") in DONE_STATUSES and s.get("rating") is None),
+}
+
+TRACKED_ATTRIBUTES = {
+    User: ["role", "created_at", "is_verified", "status", "total_earnings"],
+    Service: [],
+    ServiceRequest: ["status", "rating"],
+}
+
+COUNTERS = {
+    User: USER_COUNTERS,
+    Service: SERVICE_COUNTERS,
+    ServiceRequest: REQUEST_COUNTERS,
+}
+
+def counters_enabled():
+    return has_app_context() and current_app.config.get("DASHBOARD_COUNTERS", False)
+
+def bump_counters(connection, deltas):
+    """
+    Apply counter deltas with atomic increments on the caller's connection,
+    so they commit or roll back together with the write that caused them.
+    Only per-day signup rows are created on demand; the fixed counters are
+    created by `flask data rebuild-counters`.
+    """
+    table = DashboardCounter.__table__
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            table.update()
+            .where(table.c.name == name)
+            .values(value=table.c.value + delta)
+        )
+        if result.rowcount == 0 and name.startswith("signups:"):
+            connection.execute(table.insert().values(name=name, value=delta))
+
+def _snapshot(target, names, previous=False):
+    state = inspect(target)
+    snapshot = {}
+    for name in names:
+        if name not in state.mapper.attrs:
+            continue
+        history = state.attrs[name].history
+        if previous and history.has_changes():
+            snapshot[name] = history.deleted[0] if history.deleted else None
+        else:
+            snapshot[name] = getattr(target, name)
+    return snapshot
+
+def _contributions(model, snapshot):
+    contributions = {name: fn(snapshot) for name, fn in COUNTERS[model].items()}
+    if model is User and snapshot.get("created_at"):
+        contributions[DashboardCounter.signups_key(snapshot["created_at"].date())] = 1
+    return contributions
+
+def _deltas(model, before, after):
+    deltas = {}
+    for contributions, sign in ((before, -1), (after, 1)):
+        for name, value in (contributions or {}).items():
+            deltas[name] = deltas.get(name, 0) + sign * value
+    return deltas
+
+def transition_deltas(model, before, after):
+    """
+    Counter deltas for a row whose tracked attributes change from `before`
+    to `after`, for writes that bypass the ORM and so the mapper events
+    """
+    return _deltas(model, _contributions(model, before), _contributions(model, after))
+
+def insert_deltas(model, snapshots):
+    """Counter deltas for rows inserted in bulk, given a snapshot per row"""
+    deltas = {}
+    for snapshot in snapshots:
+        for name, value in _contributions(model, snapshot).items():
+            deltas[name] = deltas.get(name, 0) + value
+    return deltas
+
+def _register(model):
+    names = TRACKED_ATTRIBUTES[model]
+
+    @event.listens_for(model, "after_insert", propagate=True)
+    def after_insert(mapper, connection, target):
+        if counters_enabled():
+            after = _contributions(model, _snapshot(target, names))
+            bump_counters(connection, _deltas(model, None, after))
+
+    @event.listens_for(model, "after_update", propagate=True)
+    def after_update(mapper, connection, target):
+        if counters_enabled():
+            before = _contributions(model, _snapshot(target, names, previous=True))
+            after = _contributions(model, _snapshot(target, names))
+            bump_counters(connection, _deltas(model, before, after))
+
+    @event.listens_for(model, "after_delete", propagate=True)
+    def after_delete(mapper, connection, target):
+        if counters_enabled():
+            before = _contributions(model, _snapshot(target, names))
+            bump_counters(connection, _deltas(model, before, None))
+
+for _model in COUNTERS:
+    _register(_model)
+
+# a "set" listener with active_history loads the old value before it is
+# overwritten, so updates can subtract what the row used to count for
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+for _attribute in (User.role, User.created_at, User.status,
+                   Professional.is_verified, Professional.total_earnings,
+                   ServiceRequest.status, ServiceRequest.rating):
+    event.listen(_attribute, "set", _load_previous_value, active_history=True, propagate=True)
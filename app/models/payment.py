@@ -1,6 +1,7 @@
 from app import db
+from app.ids import new_id
 from datetime import datetime
-import json
+from sqlalchemy.orm import joinedload, selectinload
 
 class Payment(db.Model):
     __tablename__ = "payment"
@@ -16,6 +17,20 @@ class Payment(db.Model):
     completed_at = db.Column(db.DateTime)
     invoice_number = db.Column(db.String(50), unique=True)
     payment_details = db.Column(db.Text)  # JSON string for additional details
+
+    __table_args__ = (
+        # payment history per customer/professional and for admins, newest first
+        db.Index("ix_payment_customer_created", "customer_id", "created_at", "id"),
+        db.Index("ix_payment_professional_created", "professional_id", "created_at", "id"),
+        db.Index("ix_payment_created", "created_at", "id"),
+        # batch settlement picks up pending payments in id order
+        db.Index("ix_payment_status", "status", "id"),
+    )
+
+    # Relationships
+    service_request = db.relationship("ServiceRequest")
+    customer = db.relationship("Customer")
+    professional = db.relationship("Professional")
     
     def __init__(self, **kwargs):
         super(Payment, self).__init__(**kwargs)
@@ -23,44 +38,46 @@ class Payment(db.Model):
 
     def generate_invoice_number(self):
         """Generate unique invoice number"""
-        timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
-        self.invoice_number = f"INV-{timestamp}-{self.customer_id}"
+        self.invoice_number = new_id("INV")
 
     def process_payment(self, payment_details):
-        try:
-            # Simulate payment processing
-            self.payment_details = json.dumps(payment_details)
-            self.status = "completed"
-            self.completed_at = datetime.utcnow()
-            self.transaction_id = f"TXN-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-            
-            # Update professional earnings
-            from app.models.user import Professional
-            professional = Professional.query.get(self.professional_id)
-            if professional:
-                professional.update_earnings(self.amount)
-            
-            # Update customer spent amount
-            from app.models.user import Customer
-            customer = Customer.query.get(self.customer_id)
-            if customer:
-                customer.update_total_spent(self.amount)
-            
-            db.session.commit()
-            return True, "Payment processed successfully"
-        except Exception as e:
-            db.session.rollback()
-            return False, str(e)
+        from app.services.payment_service import PaymentService
+        return PaymentService.process(self, payment_details)
+
+    @staticmethod
+    def invoice_load_options():
+        """
+        Loader options that fetch everything an invoice needs with a fixed
+        number of queries. The customer and professional are loaded by
+        primary key in their own queries: joining the joined-inheritance
+        user tables makes SQLite materialize and scan all of them.
+        """
+        from app.models.request import ServiceRequest
+        return [
+            selectinload(Payment.customer),
+            selectinload(Payment.professional),
+            joinedload(Payment.service_request).joinedload(ServiceRequest.service)
+        ]
+
+    @classmethod
+    def generate_invoices(cls, query=None, batch_size=500):
+        """
+        Yield invoice data for every payment in the query using a single
+        streamed SELECT, however many payments there are
+        """
+        query = query if query is not None else cls.query
+        query = query.options(*cls.invoice_load_options()) \
+            .order_by(cls.created_at, cls.id) \
+            .yield_per(batch_size)
+        for payment in query:
+            yield payment.generate_invoice()
 
     def generate_invoice(self):
         """Generate invoice data"""
-        from app.models.user import Customer, Professional
-        from app.models.request import ServiceRequest
-        
-        customer = Customer.query.get(self.customer_id)
-        professional = Professional.query.get(self.professional_id)
-        service_request = ServiceRequest.query.get(self.request_id)
-        
+        customer = self.customer
+        professional = self.professional
+        service = self.service_request.service
+
         return {
             "invoice_number": self.invoice_number,
             "date": self.created_at.strftime("%Y-%m-%d"),
@@ -74,8 +91,8 @@ class Payment(db.Model):
                 "service_type": professional.service_type
             },
             "service": {
-                "name": service_request.service.name,
-                "description": service_request.service.description
+                "name": service.name,
+                "description": service.description
             },
             "amount": self.amount,
             "status": self.status,
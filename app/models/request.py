@@ -1,6 +1,14 @@
 from app import db
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime
 
+# requested -> assigned -> completed -> paid -> closed; a request is closed
+# once it is both paid for and reviewed, in either order
+REQUEST_STATUSES = ("requested", "assigned", "completed", "paid", "closed")
+
+# statuses whose work has been done by the professional
+DONE_STATUSES = ("completed", "paid", "closed")
+
 class ServiceRequest(db.Model):
     __tablename__ = "service_request"
     id = db.Column(db.Integer, primary_key=True)
@@ -13,8 +21,97 @@ class ServiceRequest(db.Model):
     remarks = db.Column(db.Text)
     rating = db.Column(db.Integer)
     review = db.Column(db.Text)
+    # bumped by every status transition, for optimistic concurrency
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # a professional's requests by status, newest first: status counts
+        # and the active list
+        db.Index("ix_service_request_professional_status", "professional_id", "status", "date_of_request"),
+        # a professional's completed history in date_of_completion, id order;
+        # only done requests have a completion date
+        db.Index("ix_service_request_professional_completion", "professional_id", "date_of_completion"),
+        # open requests, newest first, whatever their service
+        db.Index("ix_service_request_status_requested", "status", "date_of_request"),
+        # open requests for a service, and a customer's requests by status
+        db.Index("ix_service_request_service_status", "service_id", "status"),
+        db.Index("ix_service_request_customer_status", "customer_id", "status"),
+    )
 
     # Relationships
     service = db.relationship("Service", back_populates="service_requests")
     professional = db.relationship("Professional", back_populates="service_requests")
     customer = db.relationship("Customer", back_populates="service_requests")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "service_id": self.service_id,
+            "customer_id": self.customer_id,
+            "professional_id": self.professional_id,
+            "date_of_request": self.date_of_request.strftime("%Y-%m-%d %H:%M:%S") if self.date_of_request else None,
+            "date_of_completion": self.date_of_completion.strftime("%Y-%m-%d %H:%M:%S") if self.date_of_completion else None,
+            "status": self.status,
+            "remarks": self.remarks,
+            "rating": self.rating,
+            "review": self.review,
+            "version": self.version
+        }
+
+    @classmethod
+    def status_counts(cls, *criteria):
+        """
+        Number of requests per status matching `criteria`, in one grouped
+        query. Every known status is present in the result, zero if unused.
+        """
+        counts = dict.fromkeys(REQUEST_STATUSES, 0)
+        counts.update(db.session.execute(
+            db.select(cls.status, db.func.count(cls.id))
+            .where(*criteria)
+            .group_by(cls.status)
+        ).all())
+        return counts
+
+    @staticmethod
+    def detail_options():
+        """
+        Loader options for request lists that show the customer and the
+        service, so rendering them does not lazy-load per row. Customers
+        come from one extra query by primary key: a join against the
+        joined-inheritance user/customer pair makes SQLite materialize the
+        whole of it for every list.
+        """
+        return [
+            selectinload(ServiceRequest.customer),
+            joinedload(ServiceRequest.service)
+        ]
+
+    @classmethod
+    def open_for_service_type(cls, service_type):
+        """Requests still waiting to be accepted, for services of the given type, newest first"""
+        from app.models.service import Service
+        return cls.query.join(cls.service).filter(
+            cls.status == "requested",
+            Service.service_type == service_type
+        ).order_by(cls.date_of_request.desc())
+
+    @classmethod
+    def active_for_professional(cls, professional_id):
+        """Requests the professional has accepted and not completed yet, newest first"""
+        return cls.query.filter(
+            cls.professional_id == professional_id,
+            cls.status == "assigned"
+        ).order_by(cls.date_of_request.desc())
+
+    @classmethod
+    def done_for_professional(cls, professional_id):
+        """The professional's completed requests, to be paged by done_sort_key()"""
+        return cls.query.filter(
+            cls.professional_id == professional_id,
+            cls.status.in_(DONE_STATUSES)
+        )
+
+    @classmethod
+    def done_sort_key(cls):
+        """Unique sort key of a professional's completed requests, newest first when descending"""
+        return [cls.date_of_completion, cls.id]
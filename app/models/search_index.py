@@ -0,0 +1,129 @@
+from app import db
+from sqlalchemy import event, text, column, table, literal_column, or_
+import re
+
+FTS_TABLE = "service_fts"
+
+# Column weights for bm25 ranking: name, description, tags
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Only active services are indexed, so a soft delete removes the row
+# from the index and a reactivation puts it back. The update trigger only
+# fires for the indexed columns and is_active: rating and total updates
+# happen on every review and must not rewrite the index row.
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(name, description, tags, tokenize='unicode61')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON service
+        WHEN new.is_active BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description, tags)
+            VALUES (new.id, new.name, new.description, new.tags);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON service BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description, tags, is_active
+        ON service BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+            INSERT INTO {FTS_TABLE}(rowid, name, description, tags)
+            SELECT new.id, new.name, new.description, new.tags WHERE new.is_active;
+        END""",
+]
+
+FTS_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+FTS_REBUILD = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"""INSERT INTO {FTS_TABLE}(rowid, name, description, tags)
+        SELECT id, name, description, tags FROM service WHERE is_active""",
+]
+
+service_fts = table(FTS_TABLE, column("rowid"), column(FTS_TABLE))
+
+_fts_enabled = {}
+
+def fts5_supported(connection):
+    """Check whether the connected database can host an FTS5 table"""
+    if connection.dialect.name != "sqlite":
+        return False
+    result = connection.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')"))
+    return bool(result.scalar())
+
+def create_fts_index(connection):
+    """Create the index and its sync triggers, then fill it from service"""
+    if not fts5_supported(connection):
+        return False
+    for statement in FTS_DDL + FTS_REBUILD:
+        connection.execute(text(statement))
+    _fts_enabled[connection.engine.url] = True
+    return True
+
+def drop_fts_index(connection):
+    for statement in FTS_DROP:
+        connection.execute(text(statement))
+    _fts_enabled[connection.engine.url] = False
+
+def rebuild_fts_index():
+    """Re-index every active service, e.g. after a bulk load with triggers off"""
+    if not fts_enabled():
+        return False
+    for statement in FTS_REBUILD:
+        db.session.execute(text(statement))
+    db.session.commit()
+    return True
+
+def fts_enabled():
+    """Whether the full-text index exists on the current engine (cached)"""
+    engine = db.engine
+    if engine.url not in _fts_enabled:
+        if engine.dialect.name != "sqlite":
+            _fts_enabled[engine.url] = False
+        else:
+            with engine.connect() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                    {"name": FTS_TABLE}
+                ).first()
+            _fts_enabled[engine.url] = exists is not None
+    return _fts_enabled[engine.url]
+
+def build_match_expression(query):
+    """
+    Turn free text into an FTS5 query where every word must match as a
+    prefix, e.g. "pipe rep" -> '"pipe"* "rep"*'. Returns None when the
+    text has no searchable words.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+def apply_text_search(search_query, model, query, columns=None):
+    """
+    Filter a Service query by free text. Uses the ranked full-text index
+    when it is available and falls back to substring matching otherwise.
+    """
+    expression = build_match_expression(query) if fts_enabled() else None
+    if expression is None:
+        columns = columns or [model.name, model.description, model.tags]
+        return search_query.filter(or_(*[c.ilike(f"%{query}%") for c in columns]))
+
+    rank = db.func.bm25(literal_column(FTS_TABLE), *FTS_WEIGHTS)
+    return search_query.join(service_fts, service_fts.c.rowid == model.id) \
+        .filter(service_fts.c[FTS_TABLE].op("MATCH")(expression)) \
+        .order_by(rank)
+
+@event.listens_for(db.metadata, "after_create")
+def _create_fts_after_create_all(target, connection, **kwargs):
+    if "service" in target.tables:
+        create_fts_index(connection)
+
+@event.listens_for(db.metadata, "before_drop")
+def _drop_fts_before_drop_all(target, connection, **kwargs):
+    if connection.dialect.name == "sqlite":
+        drop_fts_index(connection)
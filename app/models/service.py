@@ -1,6 +1,6 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import or_
+from app.models.search_index import apply_text_search
 
 class Service(db.Model):
     __tablename__ = "service"
@@ -20,6 +20,7 @@ class Service(db.Model):
     max_price = db.Column(db.Float)  # Maximum service price
     rating = db.Column(db.Float, default=0.0)
     total_ratings = db.Column(db.Integer, default=0)
+    rating_sum = db.Column(db.Float, default=0.0)  # rating is rating_sum / total_ratings
     location_coverage = db.Column(db.String(500))  # JSON string of covered areas
     
     # Relationships
@@ -37,13 +38,7 @@ class Service(db.Model):
         search_query = cls.query.filter_by(is_active=True)
 
         if query:
-            search_query = search_query.filter(
-                or_(
-                    cls.name.ilike(f"%{query}%"),
-                    cls.description.ilike(f"%{query}%"),
-                    cls.tags.ilike(f"%{query}%")
-                )
-            )
+            search_query = apply_text_search(search_query, cls, query)
 
         if service_type:
             search_query = search_query.filter_by(service_type=service_type)
@@ -68,12 +63,8 @@ class Service(db.Model):
         """
         Update service rating with a new rating value
         """
-        if self.total_ratings == 0:
-            self.rating = new_rating
-        else:
-            self.rating = ((self.rating * self.total_ratings) + new_rating) / (self.total_ratings + 1)
-        self.total_ratings += 1
-        db.session.commit()
+        from app.services.request_service import RequestService
+        RequestService.record_service_rating(self.id, new_rating)
 
     def to_dict(self):
         """
@@ -101,13 +92,4 @@ class Service(db.Model):
         Get list of available professionals for this service
         """
         from app.models.user import Professional
-        query = Professional.query.filter_by(
-            service_type=self.service_type,
-            is_verified=True,
-            is_available=True
-        )
-        
-        if location:
-            query = query.filter(Professional.location.ilike(f"%{location}%"))
-        
-        return query.all()
+        return Professional.available_in(self.service_type, locality=location).all()
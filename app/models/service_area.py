@@ -0,0 +1,105 @@
+from app import db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import json
+
+def normalize_locality(value):
+    """Case and whitespace insensitive key for a locality name"""
+    if not value:
+        return None
+    return " ".join(value.split()).lower() or None
+
+def locality_keys(value):
+    """
+    normalize_locality() of a location and of each of its comma-separated
+    parts, whole location first, so "Anna Nagar, Chennai" is found by
+    "Anna Nagar", by "Chennai" and by the whole name
+    """
+    keys = []
+    for part in [value or ""] + (value or "").split(","):
+        key = normalize_locality(part)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+def _with_localities(pincode, location):
+    """(pincode, locality) pairs for one place: the pincode goes with the whole name"""
+    keys = locality_keys(location)
+    return [(pincode, keys[0] if keys else None)] + [(None, key) for key in keys[1:]]
+
+def parse_service_area(value):
+    """
+    (pincode, locality) pairs from a Professional.service_area string,
+    which holds a JSON list of pincodes, locality names or
+    {"pincode": ..., "locality": ...} objects, or a comma-separated list
+    """
+    if not value:
+        return []
+    try:
+        entries = json.loads(value)
+    except ValueError:
+        entries = value.split(",")
+    if not isinstance(entries, list):
+        entries = [entries]
+
+    areas = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            pincode = str(entry.get("pincode") or "").strip() or None
+            areas.extend(_with_localities(pincode, entry.get("locality")))
+        elif isinstance(entry, (int, str)):
+            entry = str(entry).strip()
+            if entry.isdigit():
+                areas.append((entry, None))
+            elif entry:
+                areas.extend(_with_localities(None, entry))
+    return [area for area in areas if area != (None, None)]
+
+class ProfessionalServiceArea(db.Model):
+    """
+    One pincode and/or locality a professional serves. Rows are derived
+    from Professional.pincode, location and service_area whenever those
+    change, so area matching is an index lookup instead of a substring
+    scan over the professional table.
+    """
+    __tablename__ = "professional_service_area"
+    id = db.Column(db.Integer, primary_key=True)
+    professional_id = db.Column(db.Integer, db.ForeignKey("professional.id", ondelete="CASCADE"), nullable=False)
+    pincode = db.Column(db.String(10))
+    locality = db.Column(db.String(200))  # normalize_locality() of the name
+
+    __table_args__ = (
+        db.Index("ix_service_area_pincode", "pincode", "professional_id"),
+        db.Index("ix_service_area_locality", "locality", "professional_id"),
+        db.Index("ix_service_area_professional", "professional_id"),
+    )
+
+    professional = db.relationship("Professional", back_populates="service_areas")
+
+    @staticmethod
+    def areas_for(professional):
+        """
+        Every (pincode, locality) a professional serves, own address first.
+        Each comma-separated part of a locality is a locality of its own.
+        """
+        areas = _with_localities(professional.pincode or None, professional.location)
+        areas += parse_service_area(professional.service_area)
+        seen = set()
+        return [area for area in areas
+                if area != (None, None) and not (area in seen or seen.add(area))]
+
+AREA_ATTRIBUTES = ("pincode", "location", "service_area")
+
+@event.listens_for(Session, "before_flush")
+def _sync_service_areas(session, flush_context, instances):
+    from app.models.user import Professional
+
+    for target in list(session.new) + list(session.dirty):
+        if not isinstance(target, Professional):
+            continue
+        state = inspect(target)
+        if state.pending or any(state.attrs[name].history.has_changes() for name in AREA_ATTRIBUTES):
+            target.service_areas = [
+                ProfessionalServiceArea(pincode=pincode, locality=locality)
+                for pincode, locality in ProfessionalServiceArea.areas_for(target)
+            ]
@@ -1,8 +1,15 @@
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
-from app import db, login_manager
+from app import db, login_manager, user_cache, catalog_cache
 from datetime import datetime
-from sqlalchemy import or_
+from flask import has_app_context
+from sqlalchemy import or_, and_, case, true, false, event, inspect
+from sqlalchemy.orm import Session, object_session
+from app.models.service_area import ProfessionalServiceArea, normalize_locality
+from app.models.associations import (
+    ProfessionalLanguage, ProfessionalSpecialization, CustomerFavorite, normalize_tag
+)
+from sqlalchemy.exc import IntegrityError
 
 class User(UserMixin, db.Model):
     __tablename__ = "user"
@@ -65,25 +72,8 @@ class Admin(User):
     }
 
     def get_dashboard_stats(self):
-        from app.models.service import Service
-        from app.models.request import ServiceRequest
-        
-        # Get current datetime
-        now = datetime.utcnow()
-        
-        return {
-            "total_users": User.query.count(),
-            "total_professionals": Professional.query.count(),
-            "total_customers": Customer.query.count(),
-            "total_services": Service.query.count(),
-            "pending_verifications": Professional.query.filter_by(is_verified=False).count(),
-            "active_requests": ServiceRequest.query.filter_by(status="assigned").count(),
-            "online_professionals": Professional.query.filter_by(status="online").count(),
-            "total_earnings": db.session.query(db.func.sum(Professional.total_earnings)).scalar() or 0,
-            "recent_signups": User.query.filter(User.created_at >= now.date()).count(),
-            "pending_reviews": ServiceRequest.query.filter_by(status="completed")
-                             .filter_by(rating=None).count()
-        }
+        from app.services.dashboard_stats import DashboardStats
+        return DashboardStats.get()
 
     def verify_professional(self, professional_id):
         professional = Professional.query.get(professional_id)
@@ -118,74 +108,140 @@ class Professional(User):
     pincode = db.Column(db.String(10))
     available_hours = db.Column(db.String(200))
     service_area = db.Column(db.String(500))  # JSON string of service areas
+    # the next three are mirrored into indexed child tables on flush, see associations.py
     languages = db.Column(db.String(200))  # Comma-separated languages
     specializations = db.Column(db.String(500))  # JSON string of specializations
     certifications = db.Column(db.String(500))  # JSON string of certifications
     completion_rate = db.Column(db.Float, default=0.0)
     response_time = db.Column(db.Integer)  # Average response time in minutes
+    # running totals maintained by RequestService; rating and completion_rate derive from them
+    total_requests = db.Column(db.Integer, default=0)
+    completed_requests = db.Column(db.Integer, default=0)
+    rating_sum = db.Column(db.Float, default=0.0)
     
+    __table_args__ = (
+        # Professional.search: verified, available professionals of a type by rating
+        db.Index("ix_professional_search", "is_verified", "is_available", "service_type", "rating"),
+    )
+
     service_requests = db.relationship("ServiceRequest", 
                                      back_populates="professional",
                                      lazy="dynamic",
                                      cascade="all, delete-orphan")
+    service_areas = db.relationship("ProfessionalServiceArea",
+                                    back_populates="professional",
+                                    cascade="all, delete-orphan")
+    language_entries = db.relationship("ProfessionalLanguage", cascade="all, delete-orphan")
+    specialization_entries = db.relationship("ProfessionalSpecialization", cascade="all, delete-orphan")
+    certification_entries = db.relationship("ProfessionalCertification", cascade="all, delete-orphan")
+    favorited_by = db.relationship("CustomerFavorite", cascade="all, delete-orphan")
 
     __mapper_args__ = {
         "polymorphic_identity": "professional"
     }
 
+    @classmethod
+    def serves_area(cls, pincode=None, locality=None):
+        """
+        Criterion for professionals serving the pincode and/or locality,
+        answered from the professional_service_area indexes. Localities
+        match whole names, so "York" does not match "New York".
+        """
+        area = ProfessionalServiceArea
+        criteria = []
+        if pincode:
+            criteria.append(cls.id.in_(
+                db.select(area.professional_id).where(area.pincode == pincode.strip())
+            ))
+        if locality:
+            criteria.append(cls.id.in_(
+                db.select(area.professional_id).where(area.locality == normalize_locality(locality))
+            ))
+        return and_(*criteria) if criteria else true()
+
+    @classmethod
+    def available_in(cls, service_type, pincode=None, locality=None):
+        """Verified, available professionals of a type serving an area, best rated first"""
+        return cls.query.filter(
+            cls.is_verified == True,
+            cls.is_available == True,
+            cls.service_type == service_type,
+            cls.serves_area(pincode, locality)
+        ).order_by(cls.rating.desc())
+
     @classmethod
     def search(cls, service_type=None, location=None, pincode=None, 
-              min_rating=None, languages=None, max_price=None):
+              min_rating=None, languages=None, max_price=None, specialization=None):
         query = cls.query.filter_by(is_verified=True, is_available=True)
         
         if service_type:
             query = query.filter_by(service_type=service_type)
         
-        if location:
-            query = query.filter(
-                or_(
-                    cls.location.ilike(f"%{location}%"),
-                    cls.service_area.ilike(f"%{location}%")
-                )
-            )
-            
-        if pincode:
-            query = query.filter_by(pincode=pincode)
+        if location or pincode:
+            query = query.filter(cls.serves_area(pincode, location))
             
         if min_rating is not None:
             query = query.filter(cls.rating >= min_rating)
             
         if languages:
-            query = query.filter(cls.languages.ilike(f"%{languages}%"))
+            query = query.filter(cls.id.in_(
+                db.select(ProfessionalLanguage.professional_id)
+                .where(ProfessionalLanguage.language == normalize_tag(languages))
+            ))
+
+        if specialization:
+            query = query.filter(cls.id.in_(
+                db.select(ProfessionalSpecialization.professional_id)
+                .where(ProfessionalSpecialization.name == normalize_tag(specialization))
+            ))
             
         if max_price is not None:
             query = query.filter(cls.hourly_rate <= max_price)
             
         return query.order_by(cls.rating.desc())
 
-    def update_rating(self, new_rating):
-        if self.total_ratings == 0:
-            self.rating = new_rating
+    @classmethod
+    def count_available_by_service_type(cls, location=None, pincode=None):
+        """
+        Count verified, available professionals per service type in one
+        grouped query. When a location or pincode is given, only service
+        types with a professional serving either area are returned and the
+        count covers professionals serving all of them.
+        """
+        query = db.session.query(cls.service_type)
+        query = query.filter(
+            cls.is_verified == True,
+            cls.is_available == True,
+            cls.service_type.isnot(None)
+        )
+
+        if location or pincode:
+            location_match = cls.serves_area(locality=location) if location else false()
+            pincode_match = cls.serves_area(pincode=pincode) if pincode else false()
+            query = query.filter(or_(location_match, pincode_match))
+            matches_all = and_(
+                location_match if location else true(),
+                pincode_match if pincode else true()
+            )
+            count = db.func.sum(case((matches_all, 1), else_=0))
         else:
-            self.rating = ((self.rating * self.total_ratings) + new_rating) / (self.total_ratings + 1)
-        self.total_ratings += 1
-        self.update_completion_rate()
-        db.session.commit()
+            count = db.func.count(cls.id)
+
+        rows = query.add_columns(count).group_by(cls.service_type).all()
+        return {service_type: total or 0 for service_type, total in rows}
+
+    def update_rating(self, new_rating):
+        from app.services.request_service import RequestService
+        RequestService.record_rating(self.id, new_rating)
 
     def get_active_requests(self):
         return self.service_requests.filter_by(status="assigned").all()
 
     def update_completion_rate(self):
-        total_requests = self.service_requests.count()
-        if total_requests > 0:
-            completed = self.service_requests.filter_by(status="completed").count()
-            self.completion_rate = (completed / total_requests) * 100
+        if self.total_requests:
+            self.completion_rate = (self.completed_requests / self.total_requests) * 100
             db.session.commit()
 
-    def update_earnings(self, amount):
-        self.total_earnings += amount
-        db.session.commit()
-
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -214,52 +270,55 @@ class Customer(User):
     default_location = db.Column(db.String(200))
     preferred_payment_method = db.Column(db.String(50))
     total_spent = db.Column(db.Float, default=0.0)
-    favorite_professionals = db.Column(db.String(500))  # JSON string of professional IDs
     default_pincode = db.Column(db.String(10))
     
     service_requests = db.relationship("ServiceRequest", 
                                      back_populates="customer",
                                      lazy="dynamic",
                                      cascade="all, delete-orphan")
+    favorites = db.relationship("CustomerFavorite", cascade="all, delete-orphan")
+    favorite_professionals = db.relationship("Professional",
+                                             secondary="customer_favorite",
+                                             lazy="dynamic",
+                                             viewonly=True)
 
     __mapper_args__ = {
         "polymorphic_identity": "customer"
     }
 
     def get_active_requests(self):
+        from app.models.request import ServiceRequest
         return self.service_requests.filter(
             ServiceRequest.status.in_(["requested", "assigned"])
         ).all()
 
     def get_completed_requests(self):
-        return self.service_requests.filter_by(status="completed").all()
+        from app.models.request import ServiceRequest, DONE_STATUSES
+        return self.service_requests.filter(ServiceRequest.status.in_(DONE_STATUSES)).all()
 
     def get_pending_payments(self):
-        return self.service_requests.filter(
-            ServiceRequest.status == "completed",
-            ServiceRequest.payment_status == "pending"
-        ).all()
+        # completed requests move on to paid or closed once paid for
+        return self.service_requests.filter_by(status="completed").all()
 
     def add_to_favorites(self, professional_id):
-        import json
-        favorites = json.loads(self.favorite_professionals or "[]")
-        if professional_id not in favorites:
-            favorites.append(professional_id)
-            self.favorite_professionals = json.dumps(favorites)
-            db.session.commit()
+        if db.session.get(CustomerFavorite, (self.id, professional_id)) is None:
+            db.session.add(CustomerFavorite(customer_id=self.id, professional_id=professional_id))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # another request added it first, the favorite exists either way
+                db.session.rollback()
 
     def remove_from_favorites(self, professional_id):
-        import json
-        favorites = json.loads(self.favorite_professionals or "[]")
-        if professional_id in favorites:
-            favorites.remove(professional_id)
-            self.favorite_professionals = json.dumps(favorites)
-            db.session.commit()
-
-    def update_total_spent(self, amount):
-        self.total_spent += amount
+        db.session.execute(db.delete(CustomerFavorite).where(
+            CustomerFavorite.customer_id == self.id,
+            CustomerFavorite.professional_id == professional_id
+        ))
         db.session.commit()
 
+    def is_favorite(self, professional_id):
+        return db.session.get(CustomerFavorite, (self.id, professional_id)) is not None
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -274,4 +333,40 @@ class Customer(User):
 
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(int(id))
+    return user_cache.load(int(id))
+
+@event.listens_for(User, "after_update", propagate=True)
+@event.listens_for(User, "after_delete", propagate=True)
+def _invalidate_cached_user(mapper, connection, target):
+    if has_app_context():
+        user_cache.invalidate(target.id)
+        # a concurrent loader may re-cache the old row before this commits
+        object_session(target).info.setdefault("changed_users", set()).add(target.id)
+
+# professional attributes behind the available professional counts in the catalog
+CATALOG_ATTRIBUTES = ("is_verified", "is_available", "service_type", "pincode", "location", "service_area")
+
+@event.listens_for(Professional, "after_insert")
+@event.listens_for(Professional, "after_update")
+def _mark_catalog_changed(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in CATALOG_ATTRIBUTES):
+        object_session(target).info["catalog_changed"] = True
+
+@event.listens_for(Professional, "after_delete")
+def _mark_catalog_shrunk(mapper, connection, target):
+    object_session(target).info["catalog_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    changed = session.info.pop("changed_users", None)
+    if changed and has_app_context():
+        for user_id in changed:
+            user_cache.invalidate(user_id)
+    if session.info.pop("catalog_changed", None) and has_app_context():
+        catalog_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_users", None)
+    session.info.pop("catalog_changed", None)
@@ -1,11 +1,17 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, Response, stream_with_context
 from flask_login import login_required, current_user
 from app.payment import bp
 from app.models.payment import Payment, Invoice
 from app.forms.payment import PaymentForm, UPIPaymentForm, RefundForm
 from app.models.request import ServiceRequest
 from app import db
+from app.services.pagination import keyset_paginate
+from app.services.request_service import RequestService
+from app.database import read_only
 from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+import csv
+import io
 import json
 
 @bp.route('/process/<int:request_id>', methods=['GET', 'POST'])
@@ -38,23 +44,30 @@ def process_payment(request_id):
             'form_data': {field.name: field.data for field in form if field.name != 'submit'}
         }
         
-        success, message = payment.process_payment(payment_details)
+        # settles the payment and moves the request on in one transaction,
+        # which is already rolled back if the database refuses it
+        try:
+            success, message = RequestService.pay(service_request, current_user.id, payment, payment_details)
+        except SQLAlchemyError as e:
+            success, message = False, str(getattr(e, "orig", None) or e)
         
         if success:
             flash("Payment processed successfully!", "success")
             return redirect(url_for('payment.invoice', payment_id=payment.id))
         else:
             flash(f"Payment failed: {message}", "danger")
-            return redirect(url_for('payment.process', request_id=request_id))
+            return redirect(url_for('payment.process_payment', request_id=request_id))
     
     return render_template('payment/process.html', 
                          form=form, 
                          service_request=service_request)
 
 @bp.route('/invoice/<int:payment_id>')
+@read_only
 @login_required
 def invoice(payment_id):
-    payment = Payment.query.get_or_404(payment_id)
+    payment = Payment.query.options(*Payment.invoice_load_options()) \
+        .filter_by(id=payment_id).first_or_404()
     
     if current_user.role == "customer" and payment.customer_id != current_user.id:
         flash("Access denied", "danger")
@@ -92,22 +105,73 @@ def refund(payment_id):
                          form=form, 
                          payment=payment)
 
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+EXPORT_COLUMNS = ['id', 'invoice_number', 'created_at', 'completed_at', 'amount',
+                  'status', 'payment_method', 'transaction_id', 'customer_id', 'professional_id']
+
+def _visible_payments(query):
+    if current_user.role == "customer":
+        return query.filter(Payment.customer_id == current_user.id)
+    elif current_user.role == "professional":
+        return query.filter(Payment.professional_id == current_user.id)
+    return query
+
 @bp.route('/payment-history')
+@read_only
 @login_required
 def payment_history():
-    if current_user.role == "customer":
-        payments = Payment.query.filter_by(customer_id=current_user.id).all()
-    elif current_user.role == "professional":
-        payments = Payment.query.filter_by(professional_id=current_user.id).all()
-    else:
-        payments = Payment.query.all()
+    per_page = min(request.args.get('per_page', HISTORY_PAGE_SIZE, type=int), HISTORY_MAX_PAGE_SIZE)
+    page = keyset_paginate(
+        _visible_payments(Payment.query),
+        [Payment.created_at, Payment.id],
+        cursor=request.args.get('cursor'),
+        per_page=max(per_page, 1)
+    )
     
-    return render_template('payment/history.html', payments=payments)
+    return render_template('payment/history.html',
+                         payments=page.items,
+                         next_cursor=page.next_cursor)
+
+@bp.route('/payment-history/export')
+@read_only
+@login_required
+def export_payment_history():
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'jsonl'):
+        return jsonify({"error": "format must be csv or jsonl"}), 400
+
+    columns = [getattr(Payment, name) for name in EXPORT_COLUMNS]
+    statement = _visible_payments(db.select(*columns)) \
+        .order_by(Payment.created_at.desc(), Payment.id.desc())
+
+    # rows are fetched from a server-side cursor in chunks and written out
+    # as they arrive, so memory use does not grow with the history size
+    def generate():
+        rows = db.session.execute(statement.execution_options(yield_per=1000))
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for row in rows:
+                writer.writerow(row)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            for row in rows:
+                yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n"
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=payments.{export_format}'})
 
 @bp.route('/download-invoice/<int:payment_id>')
+@read_only
 @login_required
 def download_invoice(payment_id):
-    payment = Payment.query.get_or_404(payment_id)
+    payment = Payment.query.options(*Payment.invoice_load_options()) \
+        .filter_by(id=payment_id).first_or_404()
     
     if current_user.role == "customer" and payment.customer_id != current_user.id:
         flash("Access denied", "danger")
@@ -118,3 +182,31 @@ def download_invoice(payment_id):
     # Here you would generate a PDF using a library like reportlab or WeasyPrint
     # For now, we'll just return the data
     return jsonify(invoice_data)
+
+@bp.route('/invoices/export')
+@read_only
+@login_required
+def export_invoices():
+    if current_user.role != "admin":
+        flash("Access denied", "danger")
+        return redirect(url_for('auth.index'))
+
+    try:
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d') if request.args.get('start') else None
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d') if request.args.get('end') else None
+    except ValueError:
+        return jsonify({"error": "Dates must be formatted as YYYY-MM-DD"}), 400
+
+    payments = Payment.query
+    if start:
+        payments = payments.filter(Payment.created_at >= start)
+    if end:
+        payments = payments.filter(Payment.created_at < end)
+
+    # one invoice per line, streamed so memory stays flat for large exports
+    def generate():
+        for invoice_data in Payment.generate_invoices(payments):
+            yield json.dumps(invoice_data) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=invoices.jsonl'})
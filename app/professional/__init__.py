@@ -18,6 +18,7 @@ def internal_error(error):
 
 # Register before request handler to check professional access
 from flask_login import current_user
+from app import activity_tracker
 from functools import wraps
 from flask import redirect, url_for, flash
 
@@ -49,7 +50,7 @@ def check_profile_completion():
 @bp.before_request
 def before_request():
     if current_user.is_authenticated and current_user.role == "professional":
-        current_user.update_last_login()
+        activity_tracker.record(current_user.id, login=True)
         if not current_user.is_verified:
             flash("Your account is pending verification. Some features may be limited.", "warning")
 
@@ -1,40 +1,48 @@
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 from app.professional import bp
-from app.models.request import ServiceRequest
+from app.models.request import ServiceRequest, DONE_STATUSES
+from app.services.pagination import keyset_paginate
+from app.services.request_service import RequestService
 from app import db
-from datetime import datetime
+from app.database import read_only
+
+DASHBOARD_LIST_SIZE = 10
+REQUESTS_PAGE_SIZE = 20
+REQUESTS_MAX_PAGE_SIZE = 100
 
 @bp.route('/dashboard')
+@read_only
 @login_required
 def dashboard():
     if not current_user.role == "professional":
         flash("Access denied", "danger")
         return redirect(url_for("auth.login"))
     
-    # Get requests statistics
-    pending_requests = ServiceRequest.query.filter_by(
-        professional_id=current_user.id,
-        status="requested"
-    ).count()
-    
-    active_requests = ServiceRequest.query.filter_by(
-        professional_id=current_user.id,
-        status="assigned"
-    ).all()
-    
-    completed_requests = ServiceRequest.query.filter_by(
-        professional_id=current_user.id,
-        status="completed"
-    ).order_by(ServiceRequest.date_of_completion.desc()).limit(5).all()
+    # one grouped query for every status count, then bounded lists with
+    # their customer and service loaded in the same query
+    status_counts = ServiceRequest.status_counts(
+        ServiceRequest.professional_id == current_user.id
+    )
+    details = ServiceRequest.detail_options()
+
+    active_requests = ServiceRequest.active_for_professional(current_user.id) \
+        .options(*details).limit(DASHBOARD_LIST_SIZE).all()
+    
+    # the first page of the completed history on the requests page
+    completed_requests = keyset_paginate(
+        ServiceRequest.done_for_professional(current_user.id).options(*details),
+        ServiceRequest.done_sort_key(),
+        per_page=5
+    ).items
 
     # Get recent service requests
-    recent_requests = ServiceRequest.query.filter_by(
-        service_id=current_user.service_type
-    ).filter_by(status="requested").all()
+    recent_requests = ServiceRequest.open_for_service_type(current_user.service_type) \
+        .options(*details).limit(DASHBOARD_LIST_SIZE).all()
 
     return render_template('professional/dashboard.html',
-                         pending_requests=pending_requests,
+                         status_counts=status_counts,
+                         pending_requests=status_counts["requested"],
                          active_requests=active_requests,
                          completed_requests=completed_requests,
                          recent_requests=recent_requests)
@@ -48,15 +56,8 @@ def accept_request(request_id):
     
     service_request = ServiceRequest.query.get_or_404(request_id)
     
-    if service_request.status != "requested":
-        flash("This request cannot be accepted", "danger")
-        return redirect(url_for("professional.dashboard"))
-    
-    service_request.professional_id = current_user.id
-    service_request.status = "assigned"
-    db.session.commit()
-    
-    flash("Service request accepted successfully", "success")
+    success, message = RequestService.accept(service_request, current_user.id)
+    flash(message, "success" if success else "danger")
     return redirect(url_for("professional.dashboard"))
 
 @bp.route('/request/<int:request_id>/complete', methods=['POST'])
@@ -72,15 +73,8 @@ def complete_request(request_id):
         flash("Access denied", "danger")
         return redirect(url_for("professional.dashboard"))
     
-    if service_request.status != "assigned":
-        flash("This request cannot be completed", "danger")
-        return redirect(url_for("professional.dashboard"))
-    
-    service_request.status = "completed"
-    service_request.date_of_completion = datetime.utcnow()
-    db.session.commit()
-    
-    flash("Service request marked as completed", "success")
+    success, message = RequestService.complete(service_request, current_user.id)
+    flash(message, "success" if success else "danger")
     return redirect(url_for("professional.dashboard"))
 
 @bp.route('/profile', methods=['GET', 'POST'])
@@ -104,28 +98,38 @@ def profile():
     return render_template('professional/profile.html')
 
 @bp.route('/requests')
+@read_only
 @login_required
 def requests():
     if not current_user.role == "professional":
         flash("Access denied", "danger")
         return redirect(url_for("auth.login"))
     
-    active_requests = ServiceRequest.query.filter_by(
-        professional_id=current_user.id,
-        status="assigned"
-    ).all()
+    per_page = min(request.args.get('per_page', REQUESTS_PAGE_SIZE, type=int), REQUESTS_MAX_PAGE_SIZE)
+    per_page = max(per_page, 1)
+    status_counts = ServiceRequest.status_counts(
+        ServiceRequest.professional_id == current_user.id
+    )
+    details = ServiceRequest.detail_options()
+
+    active_requests = ServiceRequest.active_for_professional(current_user.id) \
+        .options(*details).limit(per_page).all()
     
-    pending_requests = ServiceRequest.query.filter_by(
-        service_id=current_user.service_type,
-        status="requested"
-    ).all()
+    pending_requests = ServiceRequest.open_for_service_type(current_user.service_type) \
+        .options(*details).limit(per_page).all()
     
-    completed_requests = ServiceRequest.query.filter_by(
-        professional_id=current_user.id,
-        status="completed"
-    ).order_by(ServiceRequest.date_of_completion.desc()).all()
+    # completed history grows without bound, so it is paged by cursor
+    completed_page = keyset_paginate(
+        ServiceRequest.done_for_professional(current_user.id).options(*details),
+        ServiceRequest.done_sort_key(),
+        cursor=request.args.get('cursor'),
+        per_page=per_page
+    )
     
     return render_template('professional/requests.html',
+                         status_counts=status_counts,
+                         done_count=sum(status_counts[status] for status in DONE_STATUSES),
                          active_requests=active_requests,
                          pending_requests=pending_requests,
-                         completed_requests=completed_requests)
+                         completed_requests=completed_page.items,
+                         next_cursor=completed_page.next_cursor)
@@ -0,0 +1,149 @@
+from flask import current_app, g, request, request_started, request_finished, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    # expanded IN lists and multi-row VALUES differ only in their length
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+def normalize_statement(statement):
+    """
+    Shape of a SQL statement: literals and bound parameters become ?, so
+    the same query run for different rows normalises to the same text
+    """
+    for pattern, replacement in _LITERALS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "query_profile" in g:
+        context._profiler_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_profiler_start", None)
+    if start is not None and has_request_context() and "query_profile" in g:
+        g.query_profile.append((statement, (time.perf_counter() - start) * 1000))
+
+class QueryProfiler:
+    """
+    Opt-in per-request SQL instrumentation (QUERY_PROFILER).
+
+    Every statement a request runs, on any engine, is timed. When the
+    request finishes its statements are folded into per-endpoint totals:
+    requests, queries, SQL time, the slowest statements and N+1 suspects,
+    i.e. one statement shape repeated more than QUERY_PROFILER_REPEATS
+    times in a single request. In debug mode the request's own numbers are
+    also sent back as X-Query-* response headers.
+    """
+    _listening = False
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("QUERY_PROFILER", False)
+        app.config.setdefault("QUERY_PROFILER_SLOW_MS", 100)
+        app.config.setdefault("QUERY_PROFILER_REPEATS", 5)
+        app.config.setdefault("QUERY_PROFILER_SLOWEST", 5)
+        app.extensions["query_profiler"] = {"lock": threading.Lock(), "endpoints": {}}
+        if not app.config["QUERY_PROFILER"]:
+            return
+        request_started.connect(self._start, app)
+        request_finished.connect(self._finish, app)
+        if not QueryProfiler._listening:
+            # on the Engine class so read and write engines are both covered
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            QueryProfiler._listening = True
+
+    def _state(self):
+        return current_app.extensions["query_profiler"]
+
+    def enabled(self):
+        return current_app.config["QUERY_PROFILER"]
+
+    def _start(self, app, **extra):
+        g.query_profile = []
+
+    def _finish(self, app, response, **extra):
+        statements = g.pop("query_profile", None)
+        if statements is None:
+            return
+        config = app.config
+        endpoint = f"{request.method} {request.endpoint or request.path}"
+        sql_ms = sum(ms for _, ms in statements)
+
+        # shape -> (runs, slowest single run)
+        shapes = {}
+        for statement, ms in statements:
+            shape = normalize_statement(statement)
+            count, slowest = shapes.get(shape, (0, 0.0))
+            shapes[shape] = (count + 1, max(slowest, ms))
+        repeated = {shape: count for shape, (count, _) in shapes.items()
+                    if count > config["QUERY_PROFILER_REPEATS"]}
+        for statement, ms in statements:
+            if ms >= config["QUERY_PROFILER_SLOW_MS"]:
+                logger.warning("Slow query (%.1f ms) in %s: %s", ms, endpoint, normalize_statement(statement))
+        for shape, count in repeated.items():
+            logger.warning("Possible N+1 in %s: %d runs of %s", endpoint, count, shape)
+
+        state = app.extensions["query_profiler"]
+        with state["lock"]:
+            totals = state["endpoints"].setdefault(endpoint, {
+                "requests": 0, "queries": 0, "max_queries": 0, "sql_ms": 0.0,
+                "slowest": [], "n_plus_one": {}
+            })
+            totals["requests"] += 1
+            totals["queries"] += len(statements)
+            totals["max_queries"] = max(totals["max_queries"], len(statements))
+            totals["sql_ms"] += sql_ms
+            slowest = {shape: ms for ms, shape in totals["slowest"]}
+            for shape, (_, ms) in shapes.items():
+                slowest[shape] = max(ms, slowest.get(shape, 0.0))
+            totals["slowest"] = sorted(((ms, shape) for shape, ms in slowest.items()),
+                                       reverse=True)[:config["QUERY_PROFILER_SLOWEST"]]
+            for shape, count in repeated.items():
+                suspect = totals["n_plus_one"].setdefault(shape, {"requests": 0, "max_repeats": 0})
+                suspect["requests"] += 1
+                suspect["max_repeats"] = max(suspect["max_repeats"], count)
+
+        if app.debug:
+            response.headers["X-Query-Count"] = str(len(statements))
+            response.headers["X-Query-Time-Ms"] = f"{sql_ms:.2f}"
+            response.headers["X-Query-Repeated"] = str(len(repeated))
+
+    def stats(self):
+        """Per-endpoint totals, the endpoints spending most time in SQL first"""
+        state = self._state()
+        with state["lock"]:
+            endpoints = {
+                endpoint: {
+                    "requests": totals["requests"],
+                    "queries": totals["queries"],
+                    "queries_per_request": round(totals["queries"] / totals["requests"], 2),
+                    "max_queries": totals["max_queries"],
+                    "sql_ms": round(totals["sql_ms"], 3),
+                    "sql_ms_per_request": round(totals["sql_ms"] / totals["requests"], 3),
+                    "slowest": [{"ms": round(ms, 3), "statement": shape} for ms, shape in totals["slowest"]],
+                    "n_plus_one": [{"statement": shape, **suspect}
+                                   for shape, suspect in totals["n_plus_one"].items()],
+                }
+                for endpoint, totals in state["endpoints"].items()
+            }
+        return dict(sorted(endpoints.items(), key=lambda item: item[1]["sql_ms"], reverse=True))
+
+    def reset(self):
+        state = self._state()
+        with state["lock"]:
+            state["endpoints"].clear()
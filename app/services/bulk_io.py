@@ -0,0 +1,84 @@
+import csv
+import json
+
+FORMATS = ("csv", "jsonl")
+
+def read_rows(stream, fmt):
+    """
+    (line number, dict) for every record of a CSV or JSON lines stream.
+    A line that is not a JSON object yields a ValueError instead of a
+    dict, so one bad line does not stop the import.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = ValueError("is not valid JSON")
+        else:
+            if not isinstance(row, dict):
+                row = ValueError("is not a JSON object")
+        yield line_no, row
+
+def text_field(limit=None, required=False):
+    def convert(value):
+        value = None if value is None else str(value).strip()
+        if not value:
+            if required:
+                raise ValueError("is required")
+            return None
+        if limit and len(value) > limit:
+            raise ValueError(f"is longer than {limit} characters")
+        return value
+    return convert
+
+def number_field(kind, minimum=None, required=False):
+    def convert(value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if required:
+                raise ValueError("is required")
+            return None
+        if isinstance(value, bool):
+            raise ValueError("must be a number")
+        try:
+            number = kind(value)
+        except (TypeError, ValueError):
+            raise ValueError("must be a number")
+        if minimum is not None and number < minimum:
+            raise ValueError(f"must be at least {minimum}")
+        return number
+    return convert
+
+def boolean_field(value):
+    if value is None or str(value).strip() == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return True
+    if text in ("0", "false", "no", "n"):
+        return False
+    raise ValueError("must be true or false")
+
+def convert_row(raw, columns, required=()):
+    """
+    (values, errors) for one raw row. Absent optional columns are left
+    out so they keep their current or default value; unknown columns are
+    ignored.
+    """
+    values, errors = {}, []
+    for name, convert in columns.items():
+        if name not in raw and name not in required:
+            continue
+        try:
+            values[name] = convert(raw.get(name))
+        except ValueError as error:
+            errors.append(f"{name} {error}")
+    return values, errors
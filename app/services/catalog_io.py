@@ -0,0 +1,177 @@
+from app.models.service import Service
+from app.models.dashboard import bump_counters, counters_enabled
+from app.services.suggestion_index import reload_suggestions
+from app.services.bulk_io import text_field, number_field, boolean_field, convert_row
+from app import db, catalog_cache
+from sqlalchemy import select
+from itertools import groupby
+import csv
+import json
+import time
+
+# Importable columns and how their raw values are checked, with the same
+# rules as ServiceForm for the ones it edits. Ratings are never imported.
+IMPORT_COLUMNS = {
+    "id": number_field(int, minimum=1),
+    "name": text_field(100, required=True),
+    "description": text_field(required=True),
+    "base_price": number_field(float, minimum=0, required=True),
+    "time_required": number_field(int, minimum=1, required=True),
+    "service_type": text_field(50),
+    "tags": text_field(200),
+    "availability": text_field(200),
+    "min_price": number_field(float, minimum=0),
+    "max_price": number_field(float, minimum=0),
+    "location_coverage": text_field(500),
+    "is_active": boolean_field,
+}
+
+REQUIRED_COLUMNS = ("name", "description", "base_price", "time_required")
+
+EXPORT_COLUMNS = list(IMPORT_COLUMNS) + ["rating", "total_ratings", "created_at"]
+
+def validate_service(raw, upsert=False):
+    """
+    Column values for one imported row; raises ValueError naming every
+    invalid column. `id` is only kept when upserting.
+    """
+    values, errors = convert_row(raw, IMPORT_COLUMNS, REQUIRED_COLUMNS)
+    if not errors and None not in (values.get("min_price"), values.get("max_price")) \
+            and values["min_price"] > values["max_price"]:
+        errors.append("min_price must not exceed max_price")
+    if errors:
+        raise ValueError("; ".join(errors))
+    if not upsert or values.get("id") is None:
+        values.pop("id", None)
+    return values
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+def _upsert_statement(dialect_name, columns):
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise ValueError(f"upserts are not supported on {dialect_name}")
+    statement = insert(Service.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=[Service.__table__.c.id],
+        set_={name: statement.excluded[name] for name in columns if name != "id"}
+    )
+
+class CatalogIO:
+    """
+    Streaming bulk import and export of the service catalog. Rows are read
+    and written one at a time and sent to the database in batches, so
+    memory use does not grow with the size of the file.
+    """
+
+    @staticmethod
+    def _write_batch(batch, upsert):
+        """Insert or upsert one batch of validated rows; returns (inserted, updated)"""
+        table = Service.__table__
+        connection = db.session.connection()
+        existing = set()
+        ids = [values["id"] for values in batch if "id" in values]
+        if ids:
+            existing = set(connection.execute(select(table.c.id).where(table.c.id.in_(ids))).scalars())
+
+        # executemany needs the same columns in every row of a statement;
+        # runs of rows keep the file order for ids that appear twice
+        for columns, rows in groupby(batch, key=lambda values: tuple(sorted(values))):
+            if "id" in columns:
+                statement = _upsert_statement(connection.dialect.name, columns)
+            else:
+                statement = table.insert()
+            connection.execute(statement, list(rows))
+
+        # a file repeating an id updates the row it inserted earlier
+        inserted = len(batch) - len(existing) - (len(ids) - len(set(ids)))
+        if counters_enabled():
+            bump_counters(connection, {"total_services": inserted})
+        db.session.commit()
+        return inserted, len(batch) - inserted
+
+    @staticmethod
+    def import_services(rows, upsert=False, batch_size=1000, dry_run=False, progress=None, on_error=None):
+        """
+        Validate and load (line number, dict) rows. Invalid rows are
+        skipped and passed to `on_error` with their line number, valid
+        ones are committed batch by batch. With upsert, rows carrying an
+        existing id update that service. `progress` is called with the
+        running totals after every batch.
+        """
+        totals = {"read": 0, "inserted": 0, "updated": 0, "rejected": 0, "seconds": 0.0}
+        start = time.perf_counter()
+
+        def flush(batch):
+            if batch and not dry_run:
+                inserted, updated = CatalogIO._write_batch(batch, upsert)
+                totals["inserted"] += inserted
+                totals["updated"] += updated
+            totals["seconds"] = time.perf_counter() - start
+            if progress:
+                progress(totals)
+
+        batch = []
+        try:
+            for line_no, raw in rows:
+                totals["read"] += 1
+                try:
+                    if isinstance(raw, Exception):
+                        raise raw
+                    batch.append(validate_service(raw, upsert=upsert))
+                except ValueError as error:
+                    totals["rejected"] += 1
+                    if on_error:
+                        on_error(line_no, str(error))
+                    continue
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            flush(batch)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            if totals["inserted"] or totals["updated"]:
+                # the rows were written behind the ORM's back
+                catalog_cache.invalidate()
+                reload_suggestions()
+        return totals
+
+    @staticmethod
+    def export_services(stream, fmt, include_inactive=False, batch_size=1000, progress=None):
+        """Write services in id order as CSV or JSON lines; returns the row count"""
+        columns = [getattr(Service, name) for name in EXPORT_COLUMNS]
+        query = select(*columns).order_by(Service.id)
+        if not include_inactive:
+            query = query.where(Service.is_active == True)
+
+        writer = None
+        if fmt == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(EXPORT_COLUMNS)
+
+        count = 0
+        start = time.perf_counter()
+        for row in db.session.execute(query.execution_options(yield_per=batch_size)):
+            values = list(row)
+            if values[-1] is not None:
+                values[-1] = values[-1].isoformat(" ", "seconds")
+            if writer:
+                writer.writerow([_csv_value(value) for value in values])
+            else:
+                stream.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))) + "\n")
+            count += 1
+            if progress and count % batch_size == 0:
+                progress(count, time.perf_counter() - start)
+        if progress:
+            progress(count, time.perf_counter() - start)
+        return count
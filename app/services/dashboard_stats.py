@@ -0,0 +1,102 @@
+from flask import current_app
+from sqlalchemy import case, select
+from app.models.user import User, Professional
+from app.models.service import Service
+from app.models.request import ServiceRequest, DONE_STATUSES
+from app.models.dashboard import DashboardCounter
+from app import db
+from datetime import datetime
+
+COUNTER_NAMES = [
+    "total_users", "total_professionals", "total_customers", "total_services",
+    "pending_verifications", "active_requests", "online_professionals",
+    "total_earnings", "pending_reviews"
+]
+
+def _count_if(condition):
+    return db.func.coalesce(db.func.sum(case((condition, 1), else_=0)), 0)
+
+class DashboardStats:
+    @staticmethod
+    def compute(now=None):
+        """
+        Compute the admin dashboard statistics with two aggregate queries:
+        one over users (outer joined to professional) and one over services
+        and service requests.
+        """
+        now = now or datetime.utcnow()
+        today = datetime.combine(now.date(), datetime.min.time())
+        professional = Professional.__table__
+        is_professional = User.role == "professional"
+
+        users = db.session.execute(
+            select(
+                db.func.count(User.id),
+                _count_if(is_professional),
+                _count_if(User.role == "customer"),
+                _count_if(is_professional & (professional.c.is_verified == False)),
+                _count_if(is_professional & (User.status == "online")),
+                db.func.coalesce(db.func.sum(professional.c.total_earnings), 0),
+                _count_if(User.created_at >= today)
+            ).select_from(User.__table__.outerjoin(professional, professional.c.id == User.id))
+        ).one()
+
+        requests = db.session.execute(
+            select(
+                select(db.func.count(Service.id)).scalar_subquery(),
+                _count_if(ServiceRequest.status == "assigned"),
+                _count_if(ServiceRequest.status.in_(DONE_STATUSES) & ServiceRequest.rating.is_(None))
+            ).select_from(ServiceRequest)
+        ).one()
+
+        return {
+            "total_users": users[0],
+            "total_professionals": users[1],
+            "total_customers": users[2],
+            "total_services": requests[0],
+            "pending_verifications": users[3],
+            "active_requests": requests[1],
+            "online_professionals": users[4],
+            "total_earnings": users[5],
+            "recent_signups": users[6],
+            "pending_reviews": requests[2]
+        }
+
+    @staticmethod
+    def rebuild_counters():
+        """Recompute the materialized counters from scratch"""
+        now = datetime.utcnow()
+        stats = DashboardStats.compute(now)
+        DashboardCounter.query.delete()
+        for name in COUNTER_NAMES:
+            db.session.add(DashboardCounter(name=name, value=stats[name]))
+        db.session.add(DashboardCounter(
+            name=DashboardCounter.signups_key(now.date()),
+            value=stats["recent_signups"]
+        ))
+        db.session.commit()
+        return stats
+
+    @staticmethod
+    def read_counters():
+        """
+        Read the statistics from the materialized counters in one query.
+        Until `flask data rebuild-counters` has seeded them, aggregate
+        instead; a GET never writes the counters itself.
+        """
+        today_key = DashboardCounter.signups_key(datetime.utcnow().date())
+        rows = dict(db.session.query(DashboardCounter.name, DashboardCounter.value)
+                    .filter(DashboardCounter.name.in_(COUNTER_NAMES + [today_key])).all())
+        if "total_users" not in rows:
+            return DashboardStats.compute()
+
+        stats = {name: int(rows.get(name, 0)) for name in COUNTER_NAMES}
+        stats["total_earnings"] = rows.get("total_earnings", 0.0)
+        stats["recent_signups"] = int(rows.get(today_key, 0))
+        return stats
+
+    @staticmethod
+    def get():
+        if current_app.config.get("DASHBOARD_COUNTERS", False):
+            return DashboardStats.read_counters()
+        return DashboardStats.compute()
@@ -0,0 +1,65 @@
+from sqlalchemy import tuple_
+from datetime import datetime
+import base64
+import json
+
+class KeysetPage:
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+def encode_cursor(values):
+    """Opaque, URL-safe token for the sort key of the last row on a page"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(token, columns):
+    """Sort key values from a cursor token, or None if it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            return None
+        return [
+            datetime.fromisoformat(value)
+            if value is not None and column.type.python_type is datetime else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+
+def keyset_query(query, columns, cursor=None, per_page=20, descending=True):
+    """
+    The query keyset_paginate runs for one page: one row more than
+    per_page, so it can tell whether another page follows
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if values is not None:
+            key = tuple_(*columns)
+            query = query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+
+    ordering = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(*ordering).limit(per_page + 1)
+
+def keyset_paginate(query, columns, cursor=None, per_page=20, descending=True):
+    """
+    Seek pagination: instead of OFFSET, the next page starts strictly after
+    the sort key of the previous page's last row, so every page costs the
+    same index range scan however deep the client has scrolled.
+
+    `columns` must form a unique sort key, e.g. (created_at, id).
+    Rows whose sort key contains NULL are not reachable past the first page.
+    """
+    rows = keyset_query(query, columns, cursor, per_page, descending).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return KeysetPage(rows, next_cursor)
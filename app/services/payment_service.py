@@ -0,0 +1,148 @@
+from app.models.payment import Payment
+from app.models.user import Professional, Customer
+from app.models.dashboard import bump_counters, counters_enabled
+from app import db, user_cache
+from app.ids import new_id
+from sqlalchemy import bindparam, select, update
+from datetime import datetime
+import json
+
+class PaymentService:
+    """
+    Settles payments in a single transaction. The payment row is claimed
+    with a conditional UPDATE (status must still be pending), and the
+    professional's earnings and customer's total spent are applied as SQL
+    increments, so concurrent payments never overwrite each other.
+    """
+
+    @staticmethod
+    def _apply_totals(connection, earnings, spent):
+        """Add per-user amounts to professional earnings and customer spend"""
+        for table, column, amounts in (
+            (Professional.__table__, "total_earnings", earnings),
+            (Customer.__table__, "total_spent", spent)
+        ):
+            if not amounts:
+                continue
+            total = table.c[column]
+            connection.execute(
+                table.update()
+                .where(table.c.id == bindparam("user_id"))
+                .values({column: db.func.coalesce(total, 0.0) + bindparam("amount")}),
+                [{"user_id": user_id, "amount": amount} for user_id, amount in amounts.items()]
+            )
+        if earnings and counters_enabled():
+            bump_counters(connection, {"total_earnings": sum(earnings.values())})
+
+    @staticmethod
+    def forget_cached_users(earnings, spent):
+        """Drop the users credited by a settlement from the user cache once it has committed"""
+        for user_id in set(earnings) | set(spent):
+            user_cache.invalidate(user_id)
+
+    @staticmethod
+    def settle(payment, payment_details):
+        """
+        Complete one payment in the caller's transaction without
+        committing. Returns the (earnings, spent) amounts it credited, or
+        None if the payment was no longer pending.
+        """
+        if payment.id is None:
+            db.session.add(payment)
+            db.session.flush()
+
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(Payment)
+            .where(Payment.id == payment.id, Payment.status == "pending")
+            .values(
+                status="completed",
+                completed_at=now,
+                transaction_id=new_id("TXN"),
+                payment_details=json.dumps(payment_details)
+            )
+        ).rowcount
+        if not claimed:
+            return None
+
+        earnings = {payment.professional_id: payment.amount}
+        spent = {payment.customer_id: payment.amount}
+        PaymentService._apply_totals(db.session.connection(), earnings, spent)
+        return earnings, spent
+
+    @staticmethod
+    def process(payment, payment_details):
+        """Complete one payment with a single commit"""
+        try:
+            totals = PaymentService.settle(payment, payment_details)
+            if totals is None:
+                db.session.rollback()
+                return False, "Payment has already been processed"
+            db.session.commit()
+            PaymentService.forget_cached_users(*totals)
+            return True, "Payment processed successfully"
+        except Exception as e:
+            db.session.rollback()
+            return False, str(e)
+
+    @staticmethod
+    def settle_pending(payment_ids=None, limit=1000):
+        """
+        Complete up to `limit` pending payments in one transaction and
+        return how many were settled. Payments completed concurrently by
+        another worker are skipped rather than counted twice.
+        """
+        if payment_ids is None:
+            payment_ids = db.session.scalars(
+                select(Payment.id).where(Payment.status == "pending")
+                .order_by(Payment.id).limit(limit)
+            ).all()
+        if not payment_ids:
+            return 0
+
+        now = datetime.utcnow()
+        table = Payment.__table__
+        connection = db.session.connection()
+        try:
+            if connection.dialect.update_returning:
+                claimed = connection.execute(
+                    table.update()
+                    .where(table.c.id.in_(payment_ids), table.c.status == "pending")
+                    .values(status="completed", completed_at=now)
+                    .returning(table.c.id, table.c.customer_id,
+                               table.c.professional_id, table.c.amount)
+                ).all()
+            else:
+                rows = connection.execute(
+                    select(table.c.id, table.c.customer_id, table.c.professional_id, table.c.amount)
+                    .where(table.c.id.in_(payment_ids), table.c.status == "pending")
+                ).all()
+                claimed = [row for row in rows if connection.execute(
+                    table.update()
+                    .where(table.c.id == row.id, table.c.status == "pending")
+                    .values(status="completed", completed_at=now)
+                ).rowcount]
+            if not claimed:
+                db.session.rollback()
+                return 0
+
+            connection.execute(
+                table.update()
+                .where(table.c.id == bindparam("payment_id"))
+                .values(transaction_id=bindparam("transaction_id")),
+                [{"payment_id": row.id,
+                  "transaction_id": new_id("TXN")} for row in claimed]
+            )
+
+            earnings, spent = {}, {}
+            for row in claimed:
+                earnings[row.professional_id] = earnings.get(row.professional_id, 0.0) + row.amount
+                spent[row.customer_id] = spent.get(row.customer_id, 0.0) + row.amount
+            PaymentService._apply_totals(connection, earnings, spent)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        PaymentService.forget_cached_users(earnings, spent)
+        return len(claimed)
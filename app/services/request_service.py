@@ -0,0 +1,417 @@
+from app.models.request import ServiceRequest, DONE_STATUSES
+from app.models.user import Professional
+from app.models.service import Service
+from app.services.suggestion_index import refresh_suggestions_for
+from app.services.payment_service import PaymentService
+from app.models.dashboard import bump_counters, counters_enabled, transition_deltas
+from app import db, user_cache, catalog_cache
+from sqlalchemy import bindparam, case, select, update
+from datetime import datetime
+
+class RequestService:
+    """
+    Status transitions for service requests:
+
+        requested -accept-> assigned -complete-> completed -pay-> paid -review-> closed
+
+    A completed request may also be reviewed before it is paid for, and
+    is then closed by the payment. Each transition claims the request
+    with one conditional UPDATE on its status and on the version the
+    caller loaded, and bumps the version, so of two concurrent attempts
+    exactly one wins and the other is told what changed. The
+    professional's and service's running totals are applied as SQL
+    increments in the same transaction, so concurrent reviews never lose
+    an update and averages never need a scan over past requests.
+    """
+
+    @staticmethod
+    def _rating_values(table):
+        """
+        SET clause that adds :rated ratings summing to :rated_sum to a row
+        and derives the average from the new totals
+        """
+        rating_sum = db.func.coalesce(table.c.rating_sum, 0.0) + bindparam("rated_sum", type_=db.Float)
+        ratings = db.func.coalesce(table.c.total_ratings, 0) + bindparam("rated", type_=db.Integer)
+        # SET expressions all see the old row, so the average is computed
+        # from the incremented totals rather than the stored ones
+        return {
+            "rating_sum": rating_sum,
+            "total_ratings": ratings,
+            "rating": case((ratings > 0, rating_sum / ratings), else_=db.func.coalesce(table.c.rating, 0.0))
+        }
+
+    @staticmethod
+    def _apply_professional_totals(connection, totals):
+        """
+        Add per-professional deltas to the running totals and derive
+        completion_rate and rating from the new values. `totals` maps a
+        professional id to any of accepted, completed, rated_sum and rated.
+        """
+        if not totals:
+            return
+        table = Professional.__table__
+        total = db.func.coalesce(table.c.total_requests, 0) + bindparam("accepted", type_=db.Integer)
+        completed = db.func.coalesce(table.c.completed_requests, 0) + bindparam("completed", type_=db.Integer)
+        connection.execute(
+            table.update()
+            .where(table.c.id == bindparam("professional_id"))
+            .values(
+                total_requests=total,
+                completed_requests=completed,
+                completion_rate=case((total > 0, completed * 100.0 / total), else_=0.0),
+                **RequestService._rating_values(table)
+            ),
+            [{
+                "professional_id": professional_id,
+                "accepted": deltas.get("accepted", 0),
+                "completed": deltas.get("completed", 0),
+                "rated_sum": deltas.get("rated_sum", 0.0),
+                "rated": deltas.get("rated", 0)
+            } for professional_id, deltas in totals.items()]
+        )
+
+    @staticmethod
+    def _apply_service_ratings(connection, totals):
+        """Add per-service rated_sum/rated deltas to the service ratings"""
+        if not totals:
+            return
+        table = Service.__table__
+        connection.execute(
+            table.update()
+            .where(table.c.id == bindparam("service_id"))
+            .values(**RequestService._rating_values(table)),
+            [{
+                "service_id": service_id,
+                "rated_sum": deltas["rated_sum"],
+                "rated": deltas["rated"]
+            } for service_id, deltas in totals.items()]
+        )
+
+    @staticmethod
+    def _transition(criteria, values, before, after, totals, service_ratings=None, also=None):
+        """
+        Move one request from `before` to `after` if it still matches
+        `criteria`, bumping its version, with a single commit. `also` runs
+        in the same transaction once the request is claimed, and its
+        result is returned instead of True; if it returns a falsy value
+        the transition is rolled back. Returns False if another request
+        got there first or `also` failed.
+        """
+        try:
+            claimed = db.session.execute(
+                update(ServiceRequest).where(*criteria)
+                .values(version=ServiceRequest.version + 1, **values)
+            ).rowcount
+            if not claimed:
+                db.session.rollback()
+                return False
+
+            result = also() if also else True
+            if not result:
+                db.session.rollback()
+                return False
+            connection = db.session.connection()
+            RequestService._apply_professional_totals(connection, totals)
+            RequestService._apply_service_ratings(connection, service_ratings)
+            if counters_enabled():
+                bump_counters(connection, transition_deltas(ServiceRequest, before, after))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        for professional_id in totals:
+            user_cache.invalidate(professional_id)
+        if service_ratings:
+            refresh_suggestions_for(service_ratings)
+            catalog_cache.invalidate()
+        return result
+
+    @staticmethod
+    def _conflict(request_id, version, message):
+        """
+        Message for a transition that was not claimed: say so when the
+        request changed since the caller loaded it at `version`
+        """
+        current = db.session.execute(
+            select(ServiceRequest.status, ServiceRequest.version).where(ServiceRequest.id == request_id)
+        ).one_or_none()
+        if current is None:
+            return "This request no longer exists"
+        if current.version != version:
+            return f"This request was just updated by someone else and is now {current.status}"
+        return message
+
+    @staticmethod
+    def create(service_id, customer_id, remarks=None):
+        """Open a request for a service; a professional picks it up with accept"""
+        service_request = ServiceRequest(
+            service_id=service_id,
+            customer_id=customer_id,
+            status="requested",
+            remarks=remarks
+        )
+        db.session.add(service_request)
+        db.session.commit()
+        return service_request
+
+    @staticmethod
+    def accept(service_request, professional_id):
+        request_id, version = service_request.id, service_request.version
+        accepted = RequestService._transition(
+            [ServiceRequest.id == request_id,
+             ServiceRequest.version == version,
+             ServiceRequest.status == "requested"],
+            {"professional_id": professional_id, "status": "assigned"},
+            {"status": "requested", "rating": None},
+            {"status": "assigned", "rating": None},
+            {professional_id: {"accepted": 1}}
+        )
+        if not accepted:
+            return False, RequestService._conflict(request_id, version, "This request cannot be accepted")
+        return True, "Service request accepted successfully"
+
+    @staticmethod
+    def complete(service_request, professional_id):
+        request_id, version = service_request.id, service_request.version
+        completed = RequestService._transition(
+            [ServiceRequest.id == request_id,
+             ServiceRequest.version == version,
+             ServiceRequest.professional_id == professional_id,
+             ServiceRequest.status == "assigned"],
+            {"status": "completed", "date_of_completion": datetime.utcnow()},
+            {"status": "assigned", "rating": None},
+            {"status": "completed", "rating": None},
+            {professional_id: {"completed": 1}}
+        )
+        if not completed:
+            return False, RequestService._conflict(request_id, version, "This request cannot be completed")
+        return True, "Service request marked as completed"
+
+    @staticmethod
+    def pay(service_request, customer_id, payment, payment_details):
+        """
+        Settle a new, pending payment for a completed request and move the
+        request to paid, or to closed if it was already reviewed, in one
+        transaction
+        """
+        request_id, version, rating = service_request.id, service_request.version, service_request.rating
+        paid = RequestService._transition(
+            [ServiceRequest.id == request_id,
+             ServiceRequest.version == version,
+             ServiceRequest.customer_id == customer_id,
+             ServiceRequest.status == "completed"],
+            {"status": case((ServiceRequest.rating.is_(None), "paid"), else_="closed")},
+            {"status": "completed", "rating": rating},
+            {"status": "paid" if rating is None else "closed", "rating": rating},
+            {},
+            also=lambda: PaymentService.settle(payment, payment_details)
+        )
+        if not paid:
+            return False, RequestService._conflict(request_id, version, "This request cannot be paid for")
+        PaymentService.forget_cached_users(*paid)
+        return True, "Payment processed successfully"
+
+    @staticmethod
+    def review(service_request, customer_id, rating, review):
+        """
+        Rate a completed request once, crediting its service and
+        professional; reviewing a paid request closes it
+        """
+        request_id, version = service_request.id, service_request.version
+        status, professional_id = service_request.status, service_request.professional_id
+        credit = {"rated_sum": rating, "rated": 1}
+        reviewed = RequestService._transition(
+            [ServiceRequest.id == request_id,
+             ServiceRequest.version == version,
+             ServiceRequest.customer_id == customer_id,
+             ServiceRequest.status.in_(("completed", "paid")),
+             ServiceRequest.rating.is_(None)],
+            {"rating": rating, "review": review, "status": RequestService._closed_when_paid(ServiceRequest.status)},
+            {"status": status, "rating": None},
+            {"status": "closed" if status == "paid" else status, "rating": rating},
+            {professional_id: credit} if professional_id else {},
+            {service_request.service_id: credit}
+        )
+        if not reviewed:
+            return False, RequestService._conflict(request_id, version, "This request cannot be reviewed")
+        return True, "Thank you for your review"
+
+    @staticmethod
+    def _closed_when_paid(status):
+        """SET expression that closes a paid request and keeps any other status"""
+        return case((status == "paid", "closed"), else_=status)
+
+    @staticmethod
+    def record_rating(professional_id, rating):
+        """Credit a professional with a rating that is not tied to a request"""
+        try:
+            RequestService._apply_professional_totals(
+                db.session.connection(), {professional_id: {"rated_sum": rating, "rated": 1}}
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        user_cache.invalidate(professional_id)
+
+    @staticmethod
+    def record_service_rating(service_id, rating):
+        """Credit a service with a rating that is not tied to a request"""
+        try:
+            RequestService._apply_service_ratings(
+                db.session.connection(), {service_id: {"rated_sum": rating, "rated": 1}}
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        refresh_suggestions_for([service_id])
+        catalog_cache.invalidate()
+
+    @staticmethod
+    def ingest_reviews(reviews, chunk_size=500):
+        """
+        Record many reviews in one transaction and return how many were
+        applied. `reviews` is an iterable of dicts with request_id, rating
+        and optionally review. Requests that are not completed or paid, or
+        already rated, are skipped, as are repeats of a request id in the batch.
+        Each affected service and professional gets a single increment.
+        """
+        pending = {}
+        for item in reviews:
+            rating = item["rating"]
+            if not isinstance(rating, int) or not 1 <= rating <= 5:
+                raise ValueError(f"rating must be an integer from 1 to 5, got {rating!r}")
+            pending.setdefault(item["request_id"], (rating, item.get("review")))
+        if not pending:
+            return 0
+
+        # ratings take only five values, so requests are claimed with one
+        # conditional UPDATE per rating value and chunk rather than per row
+        by_rating = {}
+        for request_id, (rating, _) in pending.items():
+            by_rating.setdefault(rating, []).append(request_id)
+
+        table = ServiceRequest.__table__
+        claimed = []
+        try:
+            connection = db.session.connection()
+            for rating, request_ids in by_rating.items():
+                for start in range(0, len(request_ids), chunk_size):
+                    criteria = (
+                        table.c.id.in_(request_ids[start:start + chunk_size]),
+                        table.c.status.in_(("completed", "paid")),
+                        table.c.rating.is_(None)
+                    )
+                    values = {"rating": rating, "version": table.c.version + 1,
+                              "status": RequestService._closed_when_paid(table.c.status)}
+                    if connection.dialect.update_returning:
+                        rows = connection.execute(
+                            table.update().where(*criteria).values(**values)
+                            .returning(table.c.id, table.c.service_id, table.c.professional_id)
+                        ).all()
+                    else:
+                        rows = [row for row in connection.execute(
+                            select(table.c.id, table.c.service_id, table.c.professional_id).where(*criteria)
+                        ).all() if connection.execute(
+                            table.update()
+                            .where(table.c.id == row.id, table.c.rating.is_(None))
+                            .values(**values)
+                        ).rowcount]
+                    claimed.extend((row, rating) for row in rows)
+            if not claimed:
+                db.session.rollback()
+                return 0
+
+            texts = [{"request_id": row.id, "review_text": pending[row.id][1]}
+                     for row, _ in claimed if pending[row.id][1] is not None]
+            if texts:
+                connection.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("request_id"))
+                    .values(review=bindparam("review_text")),
+                    texts
+                )
+
+            services, professionals = {}, {}
+            for row, rating in claimed:
+                for totals, key in ((services, row.service_id), (professionals, row.professional_id)):
+                    if key is None:
+                        continue
+                    credit = totals.setdefault(key, {"rated_sum": 0.0, "rated": 0})
+                    credit["rated_sum"] += rating
+                    credit["rated"] += 1
+            RequestService._apply_service_ratings(connection, services)
+            RequestService._apply_professional_totals(connection, professionals)
+            if counters_enabled():
+                deltas = transition_deltas(ServiceRequest,
+                                           {"status": "completed", "rating": None},
+                                           {"status": "completed", "rating": 1})
+                bump_counters(connection, {name: delta * len(claimed) for name, delta in deltas.items()})
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        for professional_id in professionals:
+            user_cache.invalidate(professional_id)
+        refresh_suggestions_for(services)
+        if services:
+            catalog_cache.invalidate()
+        return len(claimed)
+
+    @staticmethod
+    def rebuild_professional_totals():
+        """
+        Recompute every professional's request totals and completion rate
+        from their service requests with one grouped query, and return how
+        many professionals have requests. Ratings are kept, since ratings
+        credited without a request cannot be recovered from the requests;
+        only a missing rating_sum is seeded from rating * total_ratings.
+        """
+        rows = db.session.execute(
+            select(
+                ServiceRequest.professional_id,
+                db.func.count(ServiceRequest.id),
+                db.func.sum(case((ServiceRequest.status.in_(DONE_STATUSES), 1), else_=0))
+            )
+            .where(ServiceRequest.professional_id.isnot(None))
+            .group_by(ServiceRequest.professional_id)
+        ).all()
+
+        table = Professional.__table__
+        try:
+            connection = db.session.connection()
+            connection.execute(table.update().values(
+                total_requests=0,
+                completed_requests=0,
+                completion_rate=0.0,
+                rating_sum=db.func.coalesce(
+                    table.c.rating_sum,
+                    db.func.coalesce(table.c.rating, 0.0) * db.func.coalesce(table.c.total_ratings, 0)
+                )
+            ))
+            if rows:
+                connection.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("professional_id"))
+                    .values(
+                        total_requests=bindparam("total"),
+                        completed_requests=bindparam("completed"),
+                        completion_rate=bindparam("rate")
+                    ),
+                    [{
+                        "professional_id": professional_id,
+                        "total": total,
+                        "completed": completed,
+                        "rate": completed * 100.0 / total
+                    } for professional_id, total, completed in rows]
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        user_cache.invalidate()
+        return len(rows)
@@ -0,0 +1,72 @@
+from app.models.service import Service
+from app.models.user import Professional
+from app.models.search_index import apply_text_search
+from app.models.service_area import normalize_locality
+from app.services.suggestion_index import get_suggestion_index
+from app import catalog_cache
+
+PRICE_RANGES = {
+    '0-50': (0, 50),
+    '50-100': (50, 100),
+    '100-200': (100, 200),
+    '200+': (200, None)
+}
+
+class SearchService:
+    @staticmethod
+    def suggest_services(query, limit=5):
+        """
+        Best rated active services whose name or tags start with the query,
+        answered from the in-memory suggestion index; `limit` may be at
+        most SuggestionIndex.max_results
+        """
+        return get_suggestion_index().suggest(query, limit=limit)
+
+    @staticmethod
+    def search_services(query="", location="", pincode="", service_type="", price_range=""):
+        """
+        Search active services and attach the number of available
+        professionals for each one. Results are cached per catalog version
+        under the normalized parameters, so "Plumbing " and "plumbing"
+        share an entry; services are returned as Service.to_dict() dicts.
+        """
+        params = {
+            "query": " ".join((query or "").split()).lower(),
+            "location": normalize_locality(location) or "",
+            "pincode": (pincode or "").strip(),
+            "service_type": (service_type or "").strip(),
+            "price_range": price_range if price_range in PRICE_RANGES else ""
+        }
+        return catalog_cache.get_or_set(
+            "search", params, lambda: SearchService._search_services(**params)
+        )
+
+    @staticmethod
+    def _search_services(query, location, pincode, service_type, price_range):
+        """Runs a fixed number of queries regardless of how many services match"""
+        services = Service.query.filter_by(is_active=True)
+
+        if query:
+            services = apply_text_search(services, Service, query)
+
+        if service_type:
+            services = services.filter(Service.service_type == service_type)
+
+        if price_range:
+            min_price, max_price = PRICE_RANGES[price_range]
+            services = services.filter(Service.base_price >= min_price)
+            if max_price is not None:
+                services = services.filter(Service.base_price <= max_price)
+
+        professional_counts = Professional.count_available_by_service_type(
+            location=location or None,
+            pincode=pincode or None
+        )
+
+        if location or pincode:
+            services = services.filter(Service.service_type.in_(list(professional_counts)))
+
+        return [{
+            'service': service.to_dict(),
+            'professional_count': professional_counts.get(service.service_type, 0)
+        } for service in services.all()]
@@ -1,5 +1,6 @@
 from app.models.service import Service
-from app import db
+from app.services.suggestion_index import refresh_suggestions
+from app import db, catalog_cache
 
 class ServiceManagement:
     @staticmethod
@@ -12,6 +13,8 @@ class ServiceManagement:
         )
         db.session.add(service)
         db.session.commit()
+        refresh_suggestions(service)
+        catalog_cache.invalidate()
         return service
 
     @staticmethod
@@ -23,6 +26,8 @@ class ServiceManagement:
             service.base_price = data.get("base_price", service.base_price)
             service.time_required = data.get("time_required", service.time_required)
             db.session.commit()
+            refresh_suggestions(service)
+            catalog_cache.invalidate()
             return service
         return None
 
@@ -32,5 +37,7 @@ class ServiceManagement:
         if service:
             service.is_active = False
             db.session.commit()
+            refresh_suggestions(service)
+            catalog_cache.invalidate()
             return True
         return False
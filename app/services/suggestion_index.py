@@ -0,0 +1,182 @@
+from flask import current_app
+from app.models.service import Service
+from app import db
+from bisect import bisect_left, insort
+import heapq
+import re
+import threading
+
+class _Node:
+    __slots__ = ("children", "ids", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.ids = []  # sort keys of services with a term ending here, best first
+        self.top = None  # cached best keys in this subtree, None when stale
+
+class SuggestionIndex:
+    """
+    Process-local prefix trie over active service names and tags.
+
+    Every node caches the best ranked services of its subtree, so a lookup
+    is a walk down the prefix plus a copy of a short list. Changing a
+    service only marks the nodes on its own terms as stale; they are
+    rebuilt lazily from their children's cached lists on the next lookup.
+    """
+    # size of the cached lists, and so the largest limit suggest() accepts
+    max_results = 10
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._root = _Node()
+        self._entries = {}
+        self.loaded = False
+
+    @staticmethod
+    def terms_for(name, tags):
+        """Lower-cased strings a prefix may match: the name, its words and every tag"""
+        terms = set()
+        for phrase in [name or ""] + (tags or "").split(","):
+            phrase = phrase.strip().lower()
+            if phrase:
+                terms.add(phrase)
+                terms.update(re.findall(r"\w+", phrase))
+        return terms
+
+    def _insert(self, key, term, keep_sorted=True):
+        node = self._root
+        node.top = None
+        for char in term:
+            node = node.children.setdefault(char, _Node())
+            node.top = None
+        if keep_sorted:
+            insort(node.ids, key)
+        else:
+            node.ids.append(key)
+
+    def _delete(self, key, term):
+        path = [self._root]
+        for char in term:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        ids = path[-1].ids
+        position = bisect_left(ids, key)
+        if position < len(ids) and ids[position] == key:
+            del ids[position]
+        for node in path:
+            node.top = None
+        # prune branches that no longer lead to any service
+        for depth in range(len(term), 0, -1):
+            node = path[depth]
+            if node.ids or node.children:
+                break
+            del path[depth - 1].children[term[depth - 1]]
+
+    def _top(self, node):
+        if node.top is None:
+            candidates = set(node.ids[:self.max_results])
+            for child in node.children.values():
+                candidates.update(self._top(child))
+            node.top = heapq.nsmallest(self.max_results, candidates)
+        return node.top
+
+    def _sort_all(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.ids.sort()
+            stack.extend(node.children.values())
+
+    def load(self, rows):
+        """Replace the whole index with (id, name, description, tags, rating, total_ratings) rows"""
+        with self._lock:
+            self._root = _Node()
+            self._entries = {}
+            for row in rows:
+                self._add(*row, keep_sorted=False)
+            self._sort_all()
+            self.loaded = True
+
+    def _add(self, service_id, name, description, tags, rating, total_ratings, keep_sorted=True):
+        terms = self.terms_for(name, tags)
+        # best rated first, more ratings breaking ties, then oldest service
+        key = (-(rating or 0.0), -(total_ratings or 0), service_id)
+        self._entries[service_id] = {
+            "id": service_id,
+            "name": name,
+            "description": description,
+            "rating": rating,
+            "total_ratings": total_ratings,
+            "terms": terms,
+            "key": key
+        }
+        for term in terms:
+            self._insert(key, term, keep_sorted)
+
+    def remove(self, service_id):
+        with self._lock:
+            entry = self._entries.pop(service_id, None)
+            if entry:
+                for term in entry["terms"]:
+                    self._delete(entry["key"], term)
+
+    def refresh(self, service):
+        """Re-index one service after it was created, edited or deactivated"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self.remove(service.id)
+            if service.is_active:
+                self._add(service.id, service.name, service.description, service.tags,
+                          service.rating, service.total_ratings)
+
+    def suggest(self, prefix, limit=5):
+        """
+        Up to `limit` best ranked services matching the prefix. Nodes only
+        cache max_results services, so a larger limit raises ValueError.
+        """
+        if limit > self.max_results:
+            raise ValueError(f"limit must be at most {self.max_results}")
+        prefix = prefix.strip().lower()
+        with self._lock:
+            node = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [self._entries[key[2]] for key in self._top(node)[:limit]]
+
+def get_suggestion_index():
+    """The app's suggestion index, loaded from the database on first use"""
+    index = current_app.extensions.get("suggestion_index")
+    if index is None:
+        index = current_app.extensions.setdefault("suggestion_index", SuggestionIndex())
+    if not index.loaded:
+        rows = db.session.query(
+            Service.id, Service.name, Service.description, Service.tags,
+            Service.rating, Service.total_ratings
+        ).filter(Service.is_active == True).all()
+        index.load(rows)
+    return index
+
+def refresh_suggestions(service):
+    """Keep the suggestion index in step with a service change"""
+    index = current_app.extensions.get("suggestion_index")
+    if index is not None:
+        index.refresh(service)
+
+def refresh_suggestions_for(service_ids):
+    """Re-read services whose ranking changed, e.g. after new ratings"""
+    index = current_app.extensions.get("suggestion_index")
+    if index is None or not index.loaded or not service_ids:
+        return
+    for service in Service.query.filter(Service.id.in_(list(service_ids))).all():
+        index.refresh(service)
+
+def reload_suggestions():
+    """Rebuild the whole index on next use, e.g. after a bulk import"""
+    index = current_app.extensions.get("suggestion_index")
+    if index is not None:
+        index.loaded = False
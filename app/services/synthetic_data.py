@@ -0,0 +1,319 @@
+from app.models.user import User, Professional, Customer
+from app.models.service import Service
+from app.models.request import ServiceRequest, REQUEST_STATUSES
+from app.models.payment import Payment
+from app.models.dashboard import counters_enabled
+from app.services.user_provisioning import UserProvisioning
+from app.services.suggestion_index import reload_suggestions
+from app import db, user_cache, catalog_cache
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+from sqlalchemy import insert, func, select
+from werkzeug.security import generate_password_hash
+import json
+import random
+
+# (city, first pincode, main language), most populous first
+CITIES = [
+    ("Mumbai", 400001, "Marathi"), ("Delhi", 110001, "Hindi"), ("Bangalore", 560001, "Kannada"),
+    ("Chennai", 600001, "Tamil"), ("Hyderabad", 500001, "Telugu"), ("Kolkata", 700001, "Bengali"),
+    ("Pune", 411001, "Marathi"), ("Ahmedabad", 380001, "Gujarati"),
+]
+PINCODES_PER_CITY = 40
+
+# service type -> (share of demand, median price, tags, specializations)
+SERVICE_TYPES = {
+    "cleaning": (0.24, 40, "home,deep clean,sofa", ["Deep Cleaning", "Sofa Cleaning", "Kitchen Cleaning"]),
+    "plumbing": (0.18, 60, "pipes,leak,tap", ["Leak Repair", "Installation", "Emergency Plumbing"]),
+    "electrical": (0.16, 55, "wiring,fan,switch", ["Wiring", "Appliance Fitting", "Inverter"]),
+    "appliance": (0.12, 80, "ac,fridge,washing machine", ["AC Service", "Refrigerator", "Washing Machine"]),
+    "carpentry": (0.10, 70, "furniture,door,wood", ["Furniture Repair", "Modular Fitting", "Doors"]),
+    "painting": (0.08, 150, "walls,interior,exterior", ["Interior", "Exterior", "Waterproofing"]),
+    "pest_control": (0.07, 90, "termite,cockroach,mosquito", ["Termite", "General Pest", "Bed Bugs"]),
+    "gardening": (0.05, 35, "lawn,plants,landscaping", ["Lawn Care", "Landscaping", "Plant Care"]),
+}
+SERVICE_WORDS = ["Basic", "Standard", "Premium", "Express", "Complete", "Weekend", "Annual", "Quick"]
+DURATIONS = [30, 45, 60, 90, 120, 180, 240]
+
+REQUEST_STATUS_WEIGHTS = {"requested": 0.12, "assigned": 0.10, "completed": 0.78}
+RATING_WEIGHTS = [0.04, 0.06, 0.15, 0.35, 0.40]  # 1 to 5 stars
+RATED_SHARE = 0.75
+PAYMENT_STATUS_WEIGHTS = {"completed": 0.92, "pending": 0.05, "failed": 0.03}
+PAYMENT_METHODS = ["upi", "credit_card", "debit_card", "net_banking"]
+REVIEWS = ["Great work", "On time and tidy", "Did the job", "Could be faster", "Would book again"]
+
+HISTORY_DAYS = 365
+INSERT_BATCH = 10000
+
+class _Weighted:
+    """random.choices with the cumulative weights computed once"""
+
+    def __init__(self, rng, items, weights):
+        self.rng = rng
+        self.items = list(items)
+        self.cumulative = list(accumulate(weights))
+
+    def pick(self):
+        return self.items[bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+def _zipf_weights(count, exponent=1.1):
+    return [1.0 / (rank + 1) ** exponent for rank in range(count)]
+
+class SyntheticData:
+    """
+    Deterministic bulk loader for realistic test data: the same seed,
+    anchor date and sizes always produce the same rows, apart from the
+    salt of the shared password hash. Demand follows long-tailed
+    distributions (a few cities, service types, services and customers
+    account for most requests), ratings lean positive, and every running
+    total (ratings, request counts, earnings, spend) agrees with the
+    generated requests and payments.
+
+    Rows are written with Core executemany inserts into an empty database;
+    all synthetic users share one password so they can log in.
+    """
+
+    def __init__(self, seed=0, anchor=None, password="password"):
+        self.rng = random.Random(seed)
+        # dates are offsets back from the anchor, so fix it for byte-identical data
+        self.anchor = anchor or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.password = password
+
+    def _past(self, days=HISTORY_DAYS):
+        # recent activity is more common than old activity
+        offset = min(self.rng.expovariate(3.0 / days), days)
+        return self.anchor - timedelta(days=offset, seconds=self.rng.randrange(86400))
+
+    def _city(self):
+        return self.cities.pick()
+
+    def _pincode(self, city):
+        return str(city[1] + min(int(self.rng.expovariate(0.1)), PINCODES_PER_CITY - 1))
+
+    @staticmethod
+    def _insert(model, rows):
+        for start in range(0, len(rows), INSERT_BATCH):
+            db.session.execute(insert(model.__table__), rows[start:start + INSERT_BATCH])
+
+    def _services(self, count):
+        services = []
+        for service_id in range(1, count + 1):
+            service_type = self.service_types.pick()
+            _, median, tags, _ = SERVICE_TYPES[service_type]
+            price = round(median * self.rng.lognormvariate(0, 0.4), 2)
+            services.append({
+                "id": service_id,
+                "name": f"{self.rng.choice(SERVICE_WORDS)} {service_type.replace('_', ' ').title()} {service_id}",
+                "description": f"{service_type.replace('_', ' ')} service: {tags.replace(',', ', ')}",
+                "service_type": service_type,
+                "tags": tags,
+                "base_price": price,
+                "min_price": price,
+                "max_price": round(price * 1.5, 2),
+                "time_required": self.rng.choice(DURATIONS),
+                "is_active": self.rng.random() < 0.95,
+                "created_at": self._past(2 * HISTORY_DAYS),
+                "rating": 0.0, "rating_sum": 0.0, "total_ratings": 0,
+            })
+        return services
+
+    def _user(self, user_id, role, password_hash):
+        return {
+            "id": user_id,
+            "username": f"{role}{user_id}",
+            "email": f"{role}{user_id}@example.com",
+            "password_hash": password_hash,
+            "created_at": self._past(2 * HISTORY_DAYS),
+            "status": self.rng.choice(["online", "offline", "offline", "busy"]),
+        }
+
+    def _professionals(self, first_id, count, password_hash):
+        professionals = []
+        for professional_id in range(first_id, first_id + count):
+            city = self._city()
+            service_type = self.service_types.pick()
+            specializations = SERVICE_TYPES[service_type][3]
+            languages = ["English"] + ([city[2]] if self.rng.random() < 0.8 else []) \
+                + (["Hindi"] if city[2] != "Hindi" and self.rng.random() < 0.4 else [])
+            professional = self._user(professional_id, "professional", password_hash)
+            professional.update({
+                "service_type": service_type,
+                "experience": int(self.rng.gammavariate(2.0, 3.0)),
+                "description": f"{service_type.replace('_', ' ').title()} professional in {city[0]}",
+                "is_verified": self.rng.random() < 0.85,
+                "is_available": self.rng.random() < 0.75,
+                "hourly_rate": round(SERVICE_TYPES[service_type][1] * self.rng.uniform(0.3, 0.8), 2),
+                "location": city[0],
+                "pincode": self._pincode(city),
+                "service_area": json.dumps(sorted({self._pincode(city) for _ in range(self.rng.randrange(4))})),
+                "languages": ",".join(languages),
+                "specializations": json.dumps(self.rng.sample(specializations, self.rng.randrange(1, 3))),
+                "total_earnings": 0.0, "rating": 0.0, "rating_sum": 0.0, "total_ratings": 0,
+                "total_requests": 0, "completed_requests": 0, "completion_rate": 0.0,
+            })
+            professionals.append(professional)
+        return professionals
+
+    def _customers(self, first_id, count, password_hash):
+        customers = []
+        for customer_id in range(first_id, first_id + count):
+            city = self._city()
+            customer = self._user(customer_id, "customer", password_hash)
+            customer.update({
+                "address": f"{self.rng.randrange(1, 400)} Main Road, {city[0]}",
+                "phone": f"9{self.rng.randrange(10 ** 9):09d}",
+                "default_location": city[0],
+                "default_pincode": self._pincode(city),
+                "preferred_payment_method": self.rng.choice(PAYMENT_METHODS),
+                "total_spent": 0.0,
+            })
+            customers.append(customer)
+        return customers
+
+    def _requests_and_payments(self, count, services, professionals, customers):
+        by_type, by_type_and_city = {}, {}
+        for professional in professionals:
+            by_type.setdefault(professional["service_type"], []).append(professional)
+            by_type_and_city.setdefault((professional["service_type"], professional["location"]), []) \
+                .append(professional)
+        active = [service for service in services if service["is_active"] and service["service_type"] in by_type]
+        if not active or not customers:
+            return [], []
+        popular_services = _Weighted(self.rng, active, _zipf_weights(len(active), 0.8))
+        busy_customers = _Weighted(self.rng, customers, _zipf_weights(len(customers), 0.6))
+        statuses = _Weighted(self.rng, REQUEST_STATUS_WEIGHTS, REQUEST_STATUS_WEIGHTS.values())
+        payment_statuses = _Weighted(self.rng, PAYMENT_STATUS_WEIGHTS, PAYMENT_STATUS_WEIGHTS.values())
+
+        requests, payments = [], []
+        for request_id in range(1, count + 1):
+            service = popular_services.pick()
+            customer = busy_customers.pick()
+            status = statuses.pick()
+            requested_at = self._past()
+            request = {
+                "id": request_id,
+                "service_id": service["id"],
+                "customer_id": customer["id"],
+                "professional_id": None,
+                "date_of_request": requested_at,
+                "date_of_completion": None,
+                "status": status,
+                "remarks": None,
+                "rating": None,
+                "review": None,
+                # one more for every transition the request went through
+                "version": 1 + REQUEST_STATUSES.index(status),
+            }
+            requests.append(request)
+            if status == "requested":
+                continue
+
+            # prefer a professional of the right type in the customer's city
+            candidates = by_type_and_city.get((service["service_type"], customer["default_location"])) \
+                or by_type[service["service_type"]]
+            professional = self.rng.choice(candidates)
+            request["professional_id"] = professional["id"]
+            professional["total_requests"] += 1
+            if status != "completed":
+                continue
+
+            request["date_of_completion"] = min(requested_at + timedelta(hours=self.rng.uniform(2, 96)), self.anchor)
+            professional["completed_requests"] += 1
+            if self.rng.random() < RATED_SHARE:
+                rating = self.rng.choices(range(1, 6), RATING_WEIGHTS)[0]
+                request["rating"] = rating
+                request["review"] = self.rng.choice(REVIEWS)
+                request["version"] += 1
+                for rated in (professional, service):
+                    rated["rating_sum"] += rating
+                    rated["total_ratings"] += 1
+
+            payment_status = payment_statuses.pick()
+            amount = round(service["base_price"] * self.rng.uniform(1.0, 1.5), 2)
+            payment_id = len(payments) + 1
+            payments.append({
+                "id": payment_id,
+                "request_id": request_id,
+                "customer_id": customer["id"],
+                "professional_id": professional["id"],
+                "amount": amount,
+                "status": payment_status,
+                "payment_method": self.rng.choice(PAYMENT_METHODS),
+                "transaction_id": f"TXN-SYN-{payment_id:09d}" if payment_status == "completed" else None,
+                "created_at": request["date_of_completion"],
+                "completed_at": request["date_of_completion"] if payment_status == "completed" else None,
+                "invoice_number": f"INV-SYN-{payment_id:09d}",
+                "payment_details": None,
+            })
+            if payment_status == "completed":
+                professional["total_earnings"] += amount
+                customer["total_spent"] += amount
+                request["status"] = "paid" if request["rating"] is None else "closed"
+                request["version"] += 1
+
+        for rated in professionals + services:
+            if rated["total_ratings"]:
+                rated["rating"] = round(rated["rating_sum"] / rated["total_ratings"], 2)
+        for professional in professionals:
+            if professional["total_requests"]:
+                professional["completion_rate"] = \
+                    professional["completed_requests"] * 100.0 / professional["total_requests"]
+        return requests, payments
+
+    def generate(self, customers=1000, professionals=200, services=100, requests=5000):
+        """
+        Load the given numbers of rows (plus one admin, "admin") and
+        return the row counts per table. Raises ValueError unless the
+        database has no users, services or requests yet.
+        """
+        for model in (User, Service, ServiceRequest):
+            if db.session.scalar(select(func.count()).select_from(model)):
+                raise ValueError("synthetic data can only be loaded into an empty database")
+
+        self.cities = _Weighted(self.rng, CITIES, _zipf_weights(len(CITIES)))
+        self.service_types = _Weighted(self.rng, SERVICE_TYPES, [v[0] for v in SERVICE_TYPES.values()])
+        # hashing is slow on purpose, so every synthetic user shares one hash
+        password_hash = generate_password_hash(self.password)
+
+        service_rows = self._services(services)
+        professional_rows = self._professionals(2, professionals, password_hash)
+        customer_rows = self._customers(2 + professionals, customers, password_hash)
+        request_rows, payment_rows = self._requests_and_payments(
+            requests, service_rows, professional_rows, customer_rows
+        )
+
+        try:
+            admin = self._user(1, "admin", password_hash)
+            admin.update(username="admin", email="admin@example.com", role="admin")
+            db.session.execute(insert(User.__table__), [admin])
+            self._insert(Service, service_rows)
+            for model, rows in ((Professional, professional_rows), (Customer, customer_rows)):
+                role = model.__mapper_args__["polymorphic_identity"]
+                user_columns = set(User.__table__.columns.keys())
+                self._insert(User, [{**{k: v for k, v in row.items() if k in user_columns}, "role": role}
+                                    for row in rows])
+                self._insert(model, [{k: v for k, v in row.items() if k == "id" or k not in user_columns}
+                                     for row in rows])
+            UserProvisioning.insert_professional_rows([row["id"] for row in professional_rows], professional_rows)
+            self._insert(ServiceRequest, request_rows)
+            self._insert(Payment, payment_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if counters_enabled():
+            from app.services.dashboard_stats import DashboardStats
+            DashboardStats.rebuild_counters()
+        user_cache.invalidate()
+        catalog_cache.invalidate()
+        reload_suggestions()
+        return {
+            "users": 1 + professionals + customers,
+            "professionals": professionals,
+            "customers": customers,
+            "services": services,
+            "requests": len(request_rows),
+            "payments": len(payment_rows),
+        }
@@ -0,0 +1,246 @@
+from app.models.user import User, Professional, Customer
+from app.models.service_area import ProfessionalServiceArea
+from app.models.associations import PROFESSIONAL_TAGS, parse_tags
+from app.models.dashboard import TRACKED_ATTRIBUTES, bump_counters, counters_enabled, insert_deltas
+from app.services.bulk_io import text_field, number_field, boolean_field, convert_row
+from app import db, catalog_cache
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email_validator import validate_email, EmailNotValidError
+from sqlalchemy import insert, select
+from types import SimpleNamespace
+from werkzeug.security import generate_password_hash
+import multiprocessing
+import os
+import time
+
+# Columns every provisioned user may carry, then the extra columns of each
+# role. Admins are never provisioned in bulk.
+USER_COLUMNS = {
+    "username": text_field(64, required=True),
+    "email": text_field(120, required=True),
+    "password": text_field(required=True),
+    "is_active": boolean_field,
+}
+
+ROLE_COLUMNS = {
+    "professional": (Professional, {
+        "service_type": text_field(50),
+        "experience": number_field(int, minimum=0),
+        "description": text_field(),
+        "qualification": text_field(200),
+        "hourly_rate": number_field(float, minimum=0),
+        "location": text_field(200),
+        "pincode": text_field(10),
+        "service_area": text_field(500),
+        "languages": text_field(200),
+        "specializations": text_field(500),
+        "certifications": text_field(500),
+    }),
+    "customer": (Customer, {
+        "address": text_field(200),
+        "phone": text_field(20),
+        "default_location": text_field(200),
+        "default_pincode": text_field(10),
+        "preferred_payment_method": text_field(50),
+    }),
+}
+
+def validate_user(raw):
+    """(role, column values) for one row; raises ValueError naming every invalid column"""
+    role = (raw.get("role") or "customer").strip().lower()
+    if role not in ROLE_COLUMNS:
+        raise ValueError(f"role must be one of {', '.join(ROLE_COLUMNS)}")
+    values, errors = convert_row(raw, {**USER_COLUMNS, **ROLE_COLUMNS[role][1]}, ("username", "email", "password"))
+    if values.get("username") and len(values["username"]) < 2:
+        errors.append("username is shorter than 2 characters")
+    if values.get("email"):
+        try:
+            validate_email(values["email"], check_deliverability=False)
+        except EmailNotValidError:
+            errors.append("email is not a valid address")
+    if errors:
+        raise ValueError("; ".join(errors))
+    return role, values
+
+def _counter_snapshot(model, row):
+    """The attributes the dashboard counters track, as the inserted row will hold them"""
+    mapper = model.__mapper__
+    snapshot = {}
+    for name in TRACKED_ATTRIBUTES[User]:
+        if name in row:
+            snapshot[name] = row[name]
+        elif name == "role":
+            snapshot[name] = mapper.polymorphic_identity
+        elif name in mapper.column_attrs:
+            default = mapper.column_attrs[name].columns[0].default
+            snapshot[name] = default.arg if default is not None and default.is_scalar else None
+    return snapshot
+
+class UserProvisioning:
+    """
+    Bulk creation of customer and professional accounts, e.g. when
+    migrating users from another system.
+
+    Password hashing is deliberately slow and dominates the cost of an
+    account, so it runs in a pool of worker processes. While one batch is
+    being hashed the previous one is inserted: user rows and their
+    professional/customer rows go in with one ORM bulk insert per role.
+    """
+
+    @staticmethod
+    def _taken(batch):
+        """Usernames and emails of the batch that already exist"""
+        usernames = [values["username"] for _, _, values in batch]
+        emails = [values["email"] for _, _, values in batch]
+        rows = db.session.execute(
+            select(User.username, User.email)
+            .where(User.username.in_(usernames) | User.email.in_(emails))
+        ).all()
+        return {row.username for row in rows}, {row.email for row in rows}
+
+    @staticmethod
+    def _unique(batch, seen, on_error=None):
+        """
+        Positions of the batch rows whose username and email are neither
+        in the database nor used by an earlier row of the run. `seen` holds
+        the (usernames, emails) of the run so far and is updated.
+        """
+        taken_usernames, taken_emails = UserProvisioning._taken(batch)
+        usernames, emails = seen
+        kept = set()
+        for index, (line_no, _, values) in enumerate(batch):
+            username, email = values["username"], values["email"]
+            if username in taken_usernames or username in usernames \
+                    or email in taken_emails or email in emails:
+                if on_error:
+                    on_error(line_no, "username or email is already taken")
+                continue
+            usernames.add(username)
+            emails.add(email)
+            kept.add(index)
+        return kept
+
+    @staticmethod
+    def _insert_batch(batch, hashes, seen, on_error=None):
+        """Insert one validated, hashed batch; returns how many users were created"""
+        kept = UserProvisioning._unique(batch, seen, on_error)
+        now = datetime.utcnow()
+        by_role = {}
+        for index, ((line_no, role, values), password_hash) in enumerate(zip(batch, hashes)):
+            if index not in kept:
+                continue
+            row = {key: value for key, value in values.items() if key != "password"}
+            row.update(password_hash=password_hash, created_at=now)
+            by_role.setdefault(role, []).append(row)
+
+        created = 0
+        try:
+            for role, rows in by_role.items():
+                model = ROLE_COLUMNS[role][0]
+                # joined inheritance: the user rows are inserted first and
+                # their ids returned in order for the role rows
+                ids = db.session.scalars(
+                    insert(model).returning(model.id, sort_by_parameter_order=True), rows
+                ).all()
+                if model is Professional:
+                    UserProvisioning.insert_professional_rows(ids, rows)
+                if counters_enabled():
+                    bump_counters(db.session.connection(), insert_deltas(User, [
+                        _counter_snapshot(model, row) for row in rows
+                    ]))
+                created += len(rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if "professional" in by_role:
+            catalog_cache.invalidate()
+        return created
+
+    @staticmethod
+    def insert_professional_rows(ids, rows):
+        """Service area and tag rows the before_flush hooks would have written"""
+        areas, tags = [], {model: [] for _, model, _ in PROFESSIONAL_TAGS.values()}
+        for professional_id, row in zip(ids, rows):
+            professional = SimpleNamespace(pincode=row.get("pincode"), location=row.get("location"),
+                                           service_area=row.get("service_area"))
+            areas.extend({"professional_id": professional_id, "pincode": pincode, "locality": locality}
+                         for pincode, locality in ProfessionalServiceArea.areas_for(professional))
+            for column, (_, model, field) in PROFESSIONAL_TAGS.items():
+                tags[model].extend({"professional_id": professional_id, field: tag}
+                                   for tag in parse_tags(row.get(column)))
+        for model, values in [(ProfessionalServiceArea, areas)] + list(tags.items()):
+            if values:
+                db.session.execute(insert(model.__table__), values)
+
+    @staticmethod
+    def provision(rows, batch_size=1000, workers=None, dry_run=False, progress=None, on_error=None):
+        """
+        Validate, hash and insert (line number, dict) rows. Invalid rows
+        and rows whose username or email is taken, in the database or by
+        an earlier row, are skipped and passed to `on_error`; `progress`
+        gets the running totals after every batch. workers=0 hashes in
+        this process. A dry run makes the same checks without hashing or
+        writing.
+        """
+        totals = {"read": 0, "created": 0, "rejected": 0, "seconds": 0.0}
+        start = time.perf_counter()
+        executor = None
+        if workers != 0 and not dry_run:
+            # spawn, so workers do not inherit database connections or threads
+            workers = workers or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+
+        def submit(batch):
+            # the same hash User.set_password stores; workers only import werkzeug
+            passwords = [values["password"] for _, _, values in batch]
+            if executor is None:
+                return map(generate_password_hash, passwords)
+            return executor.map(generate_password_hash, passwords,
+                                chunksize=max(1, len(passwords) // (workers * 4)))
+
+        seen = (set(), set())
+
+        def flush(pending):
+            if pending and dry_run:
+                batch = pending[0]
+                totals["rejected"] += len(batch) - len(UserProvisioning._unique(batch, seen, on_error))
+            elif pending:
+                batch, hashes = pending
+                created = UserProvisioning._insert_batch(batch, list(hashes), seen, on_error)
+                totals["created"] += created
+                totals["rejected"] += len(batch) - created
+            totals["seconds"] = time.perf_counter() - start
+            if progress:
+                progress(totals)
+
+        batch, pending = [], None
+        try:
+            for line_no, raw in rows:
+                totals["read"] += 1
+                try:
+                    if isinstance(raw, Exception):
+                        raise raw
+                    role, values = validate_user(raw)
+                except ValueError as error:
+                    totals["rejected"] += 1
+                    if on_error:
+                        on_error(line_no, str(error))
+                    continue
+                batch.append((line_no, role, values))
+                if len(batch) >= batch_size:
+                    # hash this batch in the workers while the previous one is inserted
+                    submitted = (batch, submit(batch))
+                    flush(pending)
+                    pending, batch = submitted, []
+            if batch:
+                submitted = (batch, submit(batch))
+                flush(pending)
+                pending = submitted
+            flush(pending)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return totals
@@ -0,0 +1,121 @@
+from flask import current_app
+from collections import OrderedDict
+import threading
+import time
+
+class _UserCacheStore:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None or entry[2] < time.monotonic():
+                if entry is not None:
+                    del self.entries[user_id]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+    def put(self, user_id, mapper, values, version):
+        with self.lock:
+            # something changed while the row was being loaded, don't cache it
+            if version != self.version:
+                return
+            self.entries[user_id] = (mapper, values, time.monotonic() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id=None):
+        with self.lock:
+            self.version += 1
+            self.invalidations += 1
+            if user_id is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(user_id, None)
+
+class UserCache:
+    """
+    Bounded, TTL-based cache of user rows for the Flask-Login user loader.
+
+    Column values are cached rather than ORM instances, and a cached user
+    is attached to the request's session without a query, so lazy
+    relationships keep working. Any ORM write to a user invalidates its
+    entry; other worker processes see the change after USER_CACHE_TTL.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("USER_CACHE_SIZE", 1024)
+        app.config.setdefault("USER_CACHE_TTL", 30)
+        app.extensions["user_cache"] = _UserCacheStore(
+            app.config["USER_CACHE_SIZE"], app.config["USER_CACHE_TTL"]
+        )
+
+    def _store(self):
+        return current_app.extensions["user_cache"]
+
+    def load(self, user_id):
+        from app import db
+        from app.models.user import User
+        from sqlalchemy import inspect
+        from sqlalchemy.orm import make_transient_to_detached
+        from sqlalchemy.orm.attributes import set_committed_value
+
+        store = self._store()
+        if store.max_size <= 0:
+            return db.session.get(User, user_id)
+
+        entry = store.get(user_id)
+        if entry is not None:
+            mapper, values = entry[0], entry[1]
+            identity = db.session.identity_key(mapper.class_, user_id)
+            if identity in db.session.identity_map:
+                return db.session.identity_map[identity]
+            user = mapper.class_manager.new_instance()
+            for key, value in values.items():
+                set_committed_value(user, key, value)
+            make_transient_to_detached(user)
+            db.session.add(user)
+            return user
+
+        version = store.version
+        user = db.session.get(User, user_id)
+        if user is not None:
+            mapper = inspect(user).mapper
+            values = {attr.key: getattr(user, attr.key) for attr in mapper.column_attrs}
+            store.put(user_id, mapper, values, version)
+        return user
+
+    def invalidate(self, user_id=None):
+        """Drop one user, or every user when no id is given"""
+        self._store().invalidate(user_id)
+
+    def stats(self):
+        store = self._store()
+        with store.lock:
+            lookups = store.hits + store.misses
+            return {
+                "size": len(store.entries),
+                "hits": store.hits,
+                "misses": store.misses,
+                "hit_rate": store.hits / lookups if lookups else 0.0,
+                "invalidations": store.invalidations,
+                "evictions": store.evictions
+            }
@@ -0,0 +1,61 @@
+"""
+Benchmark the JSON API list endpoints through the test client: a full
+page, a page with a few selected fields, a revalidation that ends in 304,
+and for comparison a page built from ORM objects with to_dict.
+
+    python -m benchmarks.api
+"""
+import random
+from flask import jsonify
+from sqlalchemy import insert
+from app import db
+from app.models.service import Service
+from benchmarks.common import make_app, count_queries, time_calls, percentile
+
+SERVICES = 5000
+PER_PAGE = 200
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry"]
+
+def seed(rng):
+    db.session.execute(insert(Service), [{
+        "name": f"Service {i}",
+        "description": f"{rng.choice(SERVICE_TYPES)} work number {i}",
+        "base_price": round(rng.uniform(10, 400), 2),
+        "time_required": 60,
+        "service_type": rng.choice(SERVICE_TYPES),
+        "is_active": True
+    } for i in range(SERVICES)])
+    db.session.commit()
+
+def main():
+    rng = random.Random(17)
+    app = make_app()
+    with app.app_context():
+        seed(rng)
+
+    # the comparison endpoint is what a naive implementation would do
+    @app.route("/bench/services-to-dict")
+    def services_to_dict():
+        services = Service.query.filter_by(is_active=True).order_by(Service.id).limit(PER_PAGE).all()
+        return jsonify([service.to_dict() for service in services])
+
+    client = app.test_client()
+    etag = client.get(f"/api/services?per_page={PER_PAGE}").headers["ETag"]
+    cases = [
+        ("to_dict over ORM objects", "/bench/services-to-dict", {}),
+        ("/api/services all fields", f"/api/services?per_page={PER_PAGE}", {}),
+        ("/api/services id,name,base_price", f"/api/services?per_page={PER_PAGE}&fields=id,name,base_price", {}),
+        ("/api/services If-None-Match (304)", f"/api/services?per_page={PER_PAGE}", {"If-None-Match": etag}),
+    ]
+
+    print(f"{PER_PAGE} rows per page")
+    print(f"{'request':<36} {'status':>6} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, url, headers in cases:
+        with app.app_context(), count_queries() as queries:
+            status = client.get(url, headers=headers).status_code
+        samples = time_calls(lambda: client.get(url, headers=headers), repeat=50)
+        print(f"{name:<36} {status:>6} {queries.count:>8} "
+              f"{percentile(samples, 50):>8.2f} {percentile(samples, 99):>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the catalog cache: customer search, the admin service rows
+fragment and /api/services (200 and 304), each served after an
+invalidation (miss) and from the cache (hit), plus the cost of the
+invalidation itself.
+
+    python -m benchmarks.catalog_cache
+"""
+import random
+from flask import render_template
+from markupsafe import Markup
+from sqlalchemy import insert
+from app import db, catalog_cache
+from app.models.service import Service
+from app.models.user import Professional
+from app.services.search_service import SearchService
+from benchmarks.common import BenchmarkConfig, make_app, count_queries, time_calls, percentile
+
+SERVICES = 2000
+PROFESSIONALS = 500
+PER_PAGE = 200
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry"]
+
+class CachedConfig(BenchmarkConfig):
+    CATALOG_CACHE_SIZE = 512
+
+def seed(rng):
+    db.session.execute(insert(Service), [{
+        "name": f"Service {i}",
+        "description": f"{rng.choice(SERVICE_TYPES)} work number {i}",
+        "base_price": round(rng.uniform(10, 400), 2),
+        "time_required": 60,
+        "service_type": rng.choice(SERVICE_TYPES),
+        "is_active": True
+    } for i in range(SERVICES)])
+    db.session.add_all(Professional(
+        username=f"pro{i}",
+        email=f"pro{i}@example.com",
+        service_type=rng.choice(SERVICE_TYPES),
+        location=rng.choice(["Chennai", "Mumbai", "Delhi"]),
+        is_verified=True,
+        is_available=True
+    ) for i in range(PROFESSIONALS))
+    db.session.commit()
+    # rows inserted behind the ORM's back, as in a bulk import
+    catalog_cache.invalidate()
+
+def report(name, app, fn):
+    def miss():
+        catalog_cache.invalidate()
+        return fn()
+
+    for label, call in (("miss", miss), ("hit", fn)):
+        with app.app_context():
+            call()
+            with count_queries() as queries:
+                call()
+            samples = time_calls(call, repeat=50)
+        print(f"{name:<36} {label:>5} {queries.count:>8} "
+              f"{percentile(samples, 50):>8.2f} {percentile(samples, 99):>8.2f}")
+
+def main():
+    rng = random.Random(23)
+    app = make_app(CachedConfig)
+    with app.app_context():
+        seed(rng)
+
+    client = app.test_client()
+    url = f"/api/services?per_page={PER_PAGE}"
+    etag = client.get(url).headers["ETag"]
+
+    def service_rows():
+        with app.test_request_context():
+            return catalog_cache.get_or_set("admin_service_rows", {}, lambda: Markup(
+                render_template("admin/service_rows.html", services=Service.query.all())
+            ))
+
+    print(f"{SERVICES} services, {PROFESSIONALS} professionals")
+    print(f"{'request':<36} {'cache':>5} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    report("search 'plumbing' in Chennai", app,
+           lambda: SearchService.search_services(query="plumbing", location="Chennai"))
+    report("admin service rows fragment", app, service_rows)
+    report("/api/services", app, lambda: client.get(url))
+    report("/api/services If-None-Match (304)", app,
+           lambda: client.get(url, headers={"If-None-Match": etag}))
+
+    with app.app_context():
+        samples = time_calls(catalog_cache.invalidate, repeat=200)
+        print(f"invalidate: p50 {percentile(samples, 50) * 1000:.1f} us")
+        print(catalog_cache.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark loading a partner catalog: one ServiceManagement.create_service
+call (and commit) per service against CatalogIO.import_services, which
+validates rows and inserts them in batches, plus the streaming export.
+
+    python -m benchmarks.catalog_import
+"""
+import io
+import random
+import time
+from app.models.service import Service
+from app.services.bulk_io import read_rows
+from app.services.catalog_io import CatalogIO
+from app.services.service_mgmt import ServiceManagement
+from benchmarks.common import make_app
+
+SINGLE = 2000
+BULK = 50000
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry"]
+
+def partner_rows(rng, count):
+    for i in range(count):
+        yield i + 1, {
+            "name": f"Partner service {i}",
+            "description": f"{rng.choice(SERVICE_TYPES)} work number {i}",
+            "base_price": str(round(rng.uniform(10, 400), 2)),
+            "time_required": "60",
+            "service_type": rng.choice(SERVICE_TYPES),
+            "tags": "partner,imported"
+        }
+
+def main():
+    rng = random.Random(31)
+    app = make_app()
+    with app.app_context():
+        start = time.perf_counter()
+        for _, row in partner_rows(rng, SINGLE):
+            ServiceManagement.create_service(row)
+        elapsed = time.perf_counter() - start
+        print(f"create_service per row: {SINGLE / elapsed:,.0f} rows/s")
+
+        for batch_size in (100, 1000, 5000):
+            totals = CatalogIO.import_services(partner_rows(rng, BULK), batch_size=batch_size)
+            assert totals["inserted"] == BULK and not totals["rejected"], totals
+            print(f"import_services({batch_size} per batch): "
+                  f"{totals['read'] / totals['seconds']:,.0f} rows/s")
+
+        total = Service.query.count()
+        for fmt in ("csv", "jsonl"):
+            stream = io.StringIO()
+            start = time.perf_counter()
+            count = CatalogIO.export_services(stream, fmt)
+            elapsed = time.perf_counter() - start
+            assert count == total
+            print(f"export_services({fmt}): {count / elapsed:,.0f} rows/s")
+
+            # the export loads back as an upsert of the same services
+            stream.seek(0)
+            totals = CatalogIO.import_services(read_rows(stream, fmt), upsert=True, batch_size=5000)
+            assert totals["updated"] == total and not totals["inserted"], totals
+
+if __name__ == "__main__":
+    main()
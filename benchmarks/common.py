@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app, db
+from app.config import Config
+from app.models import payment  # noqa: F401 - registers payment tables
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.gettempdir(), "household_bench.db")
+    WTF_CSRF_ENABLED = False
+    TESTING = True
+    # benchmarks time the queries; catalog caching is measured on its own
+    CATALOG_CACHE_SIZE = 0
+
+def make_app(config_class=BenchmarkConfig):
+    """Create an app bound to a fresh benchmark database"""
+    app = create_app(config_class)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+@contextmanager
+def count_queries(engine=None):
+    """Count the statements run on engine, the default engine unless given"""
+    counter = QueryCounter()
+    engine = engine if engine is not None else db.engine
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def time_calls(fn, repeat=20):
+    """Call fn repeatedly and return the samples in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
@@ -0,0 +1,115 @@
+"""
+Benchmark concurrent request lifecycles against the default SQLite setup
+and the production profile (DATABASE_PROFILE=production). Every thread
+logs in as its own customer and professional and repeatedly creates,
+accepts, completes, pays for and reviews a request through the test
+client. The cost of a single commit is measured on its own first.
+
+Request handling is CPU bound, so with the GIL the lifecycle numbers
+only separate the profiles on machines with spare cores and disks where
+fsync is expensive; the commit timing shows what WAL and
+synchronous=NORMAL save on every write.
+
+    python -m benchmarks.concurrency
+"""
+import os
+import threading
+import time
+from sqlalchemy import func, select
+from app import db
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.services.request_service import RequestService
+from app.services.synthetic_data import SyntheticData
+from benchmarks.common import BenchmarkConfig, make_app
+
+THREADS = [1, 4, 8]
+LIFECYCLES = 15  # per thread
+COMMITS = 500
+PASSWORD = "password"
+
+class ProductionBenchmarkConfig(BenchmarkConfig):
+    DATABASE_PROFILE = "production"
+
+def fresh_app(config):
+    """An app on a new database file, so one profile's WAL mode does not leak into the next"""
+    path = config.SQLALCHEMY_DATABASE_URI[len("sqlite:///"):]
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    app = make_app(config)
+    with app.app_context():
+        SyntheticData(seed=5, password=PASSWORD).generate(customers=200, professionals=50,
+                                                          services=30, requests=2000)
+    return app
+
+def log_in(app, username):
+    client = app.test_client()
+    response = client.post("/login?next=/", data={"username": username, "password": PASSWORD})
+    assert response.status_code == 302 and "/login" not in response.location, username
+    return client
+
+def lifecycle(app, customer_client, professional_client, customer_id, service_id):
+    """One request from creation to review; raises on a failed step"""
+    response = customer_client.post(f"/customer/service/{service_id}/request", data={"remarks": "Concurrent visit"})
+    assert response.status_code == 302, response.status_code
+    with app.app_context():
+        request_id = db.session.scalar(select(func.max(ServiceRequest.id))
+                                       .where(ServiceRequest.customer_id == customer_id))
+    for client, url, data in [
+        (professional_client, f"/professional/request/{request_id}/accept", None),
+        (professional_client, f"/professional/request/{request_id}/complete", None),
+        (customer_client, f"/payment/process/{request_id}?method=upi", {"upi_id": "customer@upi"}),
+        (customer_client, f"/customer/request/{request_id}/rate", {"rating": 5, "review": "Quick"}),
+    ]:
+        response = client.post(url, data=data)
+        assert response.status_code == 302, (url, response.status_code)
+    with app.app_context():
+        rating = db.session.scalar(select(ServiceRequest.rating).where(ServiceRequest.id == request_id))
+    assert rating == 5, f"request {request_id} did not finish"
+
+def run(app, threads):
+    with app.app_context():
+        service_id = db.session.scalar(select(Service.id).where(Service.is_active == True).limit(1))
+    # synthetic ids: admin 1, professionals 2-51, customers from 52
+    sessions = [(log_in(app, f"customer{52 + i}"), log_in(app, f"professional{2 + i}"), 52 + i)
+                for i in range(threads)]
+    done, errors = [0] * threads, {}
+    lock = threading.Lock()
+
+    def worker(index):
+        customer_client, professional_client, customer_id = sessions[index]
+        for _ in range(LIFECYCLES):
+            try:
+                lifecycle(app, customer_client, professional_client, customer_id, service_id)
+                done[index] += 1
+            except Exception as error:
+                reason = "database is locked" if "locked" in str(error) else type(error).__name__
+                with lock:
+                    errors[reason] = errors.get(reason, 0) + 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(done), time.perf_counter() - start, errors
+
+def main():
+    for label, config in (("default", BenchmarkConfig), ("production", ProductionBenchmarkConfig)):
+        app = fresh_app(config)
+        with app.app_context():
+            service_id = db.session.scalar(select(Service.id).limit(1))
+            start = time.perf_counter()
+            for _ in range(COMMITS):
+                RequestService.create(service_id, 52)
+            print(f"{label} profile, one commit: {(time.perf_counter() - start) / COMMITS * 1000:.2f} ms")
+        for threads in THREADS:
+            completed, elapsed, errors = run(app, threads)
+            failed = ", ".join(f"{count}x {reason}" for reason, count in errors.items()) or "none"
+            print(f"{label} profile, {threads} threads: {completed / elapsed:,.1f} lifecycles/s "
+                  f"({completed}/{threads * LIFECYCLES} completed, failures: {failed})")
+
+if __name__ == "__main__":
+    main()
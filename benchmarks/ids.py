@@ -0,0 +1,32 @@
+"""
+Benchmark invoice/transaction id generation and check that ids stay
+unique across worker processes and increasing within each one.
+
+    python -m benchmarks.ids
+"""
+import multiprocessing
+import time
+from app.ids import new_id
+
+WORKERS = 4
+IDS_PER_WORKER = 200000
+
+def generate(count):
+    start = time.perf_counter()
+    generated = [new_id("TXN") for _ in range(count)]
+    return generated, count / (time.perf_counter() - start)
+
+def main():
+    with multiprocessing.Pool(WORKERS) as pool:
+        results = pool.map(generate, [IDS_PER_WORKER] * WORKERS)
+
+    seen = set()
+    for generated, rate in results:
+        assert generated == sorted(generated), "ids must increase within a process"
+        seen.update(generated)
+        print(f"worker: {rate:,.0f} ids/s")
+    assert len(seen) == WORKERS * IDS_PER_WORKER, "duplicate ids across processes"
+    print(f"{len(seen):,} ids from {WORKERS} processes, no duplicates")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark payment settlement: one payment per transaction through
+Payment.process_payment, and batched settlement of pending payments.
+
+    python -m benchmarks.payments
+"""
+import random
+import time
+from sqlalchemy import insert
+from app import db
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.models.user import Professional, Customer
+from app.services.payment_service import PaymentService
+from benchmarks.common import make_app
+
+PROFESSIONALS = 50
+CUSTOMERS = 500
+SINGLE_PAYMENTS = 500
+BATCH_PAYMENTS = 20000
+BATCH_SIZES = [100, 1000]
+
+def seed_users():
+    professionals = [Professional(username=f"pro{i}", email=f"pro{i}@example.com",
+                                  service_type="plumbing") for i in range(PROFESSIONALS)]
+    customers = [Customer(username=f"cust{i}", email=f"cust{i}@example.com")
+                 for i in range(CUSTOMERS)]
+    service = Service(name="Pipe repair", base_price=50.0)
+    db.session.add_all(professionals + customers + [service])
+    db.session.commit()
+    request = ServiceRequest(service_id=service.id, customer_id=customers[0].id,
+                             professional_id=professionals[0].id, status="completed")
+    db.session.add(request)
+    db.session.commit()
+    return [p.id for p in professionals], [c.id for c in customers], request.id
+
+def seed_pending(rng, count, offset, professional_ids, customer_ids, request_id):
+    db.session.execute(insert(Payment.__table__), [{
+        "request_id": request_id,
+        "customer_id": rng.choice(customer_ids),
+        "professional_id": rng.choice(professional_ids),
+        "amount": round(rng.uniform(20, 300), 2),
+        "status": "pending",
+        "invoice_number": f"BENCH-{offset + i}"
+    } for i in range(count)])
+    db.session.commit()
+
+def check_totals():
+    paid = db.session.query(db.func.sum(Payment.amount)).filter_by(status="completed").scalar() or 0
+    earned = db.session.query(db.func.sum(Professional.total_earnings)).scalar() or 0
+    spent = db.session.query(db.func.sum(Customer.total_spent)).scalar() or 0
+    assert abs(paid - earned) < 1e-6 and abs(paid - spent) < 1e-6, (paid, earned, spent)
+
+def main():
+    rng = random.Random(3)
+    app = make_app()
+    with app.app_context():
+        professional_ids, customer_ids, request_id = seed_users()
+
+        start = time.perf_counter()
+        for i in range(SINGLE_PAYMENTS):
+            payment = Payment(request_id=request_id,
+                              customer_id=rng.choice(customer_ids),
+                              professional_id=rng.choice(professional_ids),
+                              amount=round(rng.uniform(20, 300), 2),
+                              payment_method="upi")
+            payment.invoice_number = f"SINGLE-{i}"
+            success, message = payment.process_payment({"method": "upi"})
+            assert success, message
+        elapsed = time.perf_counter() - start
+        print(f"process_payment: {SINGLE_PAYMENTS / elapsed:,.0f} payments/s")
+        check_totals()
+
+        offset = 0
+        for batch_size in BATCH_SIZES:
+            seed_pending(rng, BATCH_PAYMENTS, offset, professional_ids, customer_ids, request_id)
+            offset += BATCH_PAYMENTS
+            settled = 0
+            start = time.perf_counter()
+            while True:
+                count = PaymentService.settle_pending(limit=batch_size)
+                if not count:
+                    break
+                settled += count
+            elapsed = time.perf_counter() - start
+            print(f"settle_pending(limit={batch_size}): {settled / elapsed:,.0f} payments/s")
+            check_totals()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Query plan regression check for the hot query paths. Runs EXPLAIN QUERY
+PLAN for each query and exits non-zero if any of them scans a whole
+table or sorts rows that an index should already return in order.
+
+    python -m benchmarks.query_plans
+"""
+import sys
+from datetime import datetime
+from app import db
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.models.user import Professional
+from app.models.associations import CustomerFavorite
+from app.services.pagination import encode_cursor, keyset_query
+from benchmarks.common import make_app
+
+def hot_queries():
+    """
+    (name, query) pairs for the statements that run on every page load,
+    built with the same model helpers the views call
+    """
+    professional_id = 1
+    done = ServiceRequest.done_for_professional(professional_id)
+    done_key = ServiceRequest.done_sort_key()
+    cursor = encode_cursor([datetime(2024, 1, 1), 100])
+    return [
+        ("professional dashboard: completed requests",
+         keyset_query(done, done_key, per_page=5)),
+        ("professional requests: completed requests, later page",
+         keyset_query(done, done_key, cursor=cursor)),
+        ("professional dashboard: active requests",
+         ServiceRequest.active_for_professional(professional_id).limit(10)),
+        ("professional dashboard: open requests for the professional's service type",
+         ServiceRequest.open_for_service_type("plumbing").limit(10)),
+        ("professional status counts",
+         db.select(ServiceRequest.status, db.func.count(ServiceRequest.id))
+         .where(ServiceRequest.professional_id == professional_id).group_by(ServiceRequest.status)),
+        ("customer active requests",
+         ServiceRequest.query.filter(ServiceRequest.customer_id == 1,
+                                     ServiceRequest.status.in_(["requested", "assigned"]))),
+        ("Professional.search by service type",
+         Professional.search(service_type="plumbing")),
+        ("Professional.search by service type and rating",
+         Professional.search(service_type="plumbing", min_rating=4.0)),
+        ("professionals of a type serving a pincode",
+         Professional.available_in("plumbing", pincode="600001")),
+        ("professionals of a type serving a locality",
+         Professional.available_in("plumbing", locality="Chennai")),
+        ("Professional.search by language",
+         Professional.search(service_type="plumbing", languages="Tamil")),
+        ("Professional.search by specialization",
+         Professional.search(service_type="plumbing", specialization="Emergency Plumbing")),
+        ("customer favorite professionals",
+         Professional.query.join(CustomerFavorite, CustomerFavorite.professional_id == Professional.id)
+         .filter(CustomerFavorite.customer_id == 1)),
+        ("customer payment history",
+         Payment.query.filter_by(customer_id=1)
+         .order_by(Payment.created_at.desc(), Payment.id.desc()).limit(21)),
+        ("professional payment history",
+         Payment.query.filter_by(professional_id=1)
+         .order_by(Payment.created_at.desc(), Payment.id.desc()).limit(21)),
+        ("admin payment history",
+         Payment.query.order_by(Payment.created_at.desc(), Payment.id.desc()).limit(21)),
+        ("pending payments to settle",
+         db.session.query(Payment.id).filter(Payment.status == "pending")
+         .order_by(Payment.id).limit(1000)),
+    ]
+
+def explain(query):
+    """EXPLAIN QUERY PLAN rows for an ORM query or a select()"""
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(db.engine, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    return db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+
+def plan_problems(plan):
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            problems.append(f"full table scan: {detail}")
+        elif "USE TEMP B-TREE" in detail:
+            problems.append(f"sort without index: {detail}")
+    return problems
+
+def main():
+    app = make_app()
+    failures = 0
+    with app.app_context():
+        for name, query in hot_queries():
+            plan = explain(query)
+            problems = plan_problems(plan)
+            print(f"{'FAIL' if problems else 'ok  '} {name}")
+            for row in plan:
+                print(f"       {row[-1]}")
+            failures += bool(problems)
+    if failures:
+        print(f"{failures} hot queries fall back to a full scan or sort")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Check read routing against a two-file replica: the benchmark database is
+copied with SQLite's backup API and the copy serves as DATABASE_READ_URL.
+Nothing is replicated after the copy, so the replica lags forever and any
+stale read shows up as a missing row.
+
+A customer pays for a request and a professional accepts one; the pages
+their writes redirect to (the invoice and the professional dashboard)
+must be answered by the primary. Once DATABASE_READ_STICKY_SECONDS has
+passed, the same users' @read_only views go back to the replica.
+
+    python -m benchmarks.read_replica
+"""
+import os
+import sqlite3
+import time
+from contextlib import ExitStack
+from sqlalchemy import func, select
+from app import create_app, db
+from app.database import READ_BIND
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.services.synthetic_data import SyntheticData
+from benchmarks.common import BenchmarkConfig, make_app, count_queries
+
+PASSWORD = "password"
+PRIMARY = BenchmarkConfig.SQLALCHEMY_DATABASE_URI[len("sqlite:///"):]
+REPLICA = PRIMARY.replace(".db", "_replica.db")
+
+class ReplicaConfig(BenchmarkConfig):
+    DATABASE_READ_URL = "sqlite:///" + REPLICA
+    DATABASE_READ_STICKY_SECONDS = 1
+
+def build():
+    """A loaded primary and its replica, copied before the checks write anything"""
+    app = make_app()
+    with app.app_context():
+        SyntheticData(seed=3, password=PASSWORD).generate(customers=50, professionals=10,
+                                                          services=10, requests=300)
+        if os.path.exists(REPLICA):
+            os.remove(REPLICA)
+        source = db.engine.raw_connection()
+        target = sqlite3.connect(REPLICA)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+            source.close()
+        db.engine.dispose()
+    return create_app(ReplicaConfig)
+
+def log_in(app, username):
+    client = app.test_client()
+    response = client.post("/login?next=/", data={"username": username, "password": PASSWORD})
+    assert response.status_code == 302 and "/login" not in response.location, username
+    return client
+
+def get(app, client, url):
+    """GET url and return the response with the queries each engine ran"""
+    with app.app_context(), ExitStack() as stack:
+        primary = stack.enter_context(count_queries())
+        replica = stack.enter_context(count_queries(db.engines[READ_BIND]))
+        response = client.get(url)
+    return response, primary.count, replica.count
+
+def check(label, response, primary, replica, status, engine):
+    served = "primary" if primary and not replica else "replica" if replica and not primary else "both"
+    print(f"{label}: {response.status_code} from {served} ({primary} primary, {replica} replica queries)")
+    assert response.status_code == status, f"{label}: expected {status}"
+    assert served == engine, f"{label}: expected the {engine}"
+
+def main():
+    app = build()
+    with app.app_context():
+        service_id = db.session.scalar(select(Service.id).where(Service.is_active == True).limit(1))
+    customer = log_in(app, "customer20")
+    professional = log_in(app, "professional2")
+    # let the logins' own writes, if any, age out of the sticky window
+    time.sleep(ReplicaConfig.DATABASE_READ_STICKY_SECONDS)
+
+    customer.post(f"/customer/service/{service_id}/request", data={"remarks": "Replica check"})
+    with app.app_context():
+        request_id = db.session.scalar(select(func.max(ServiceRequest.id)))
+    response = professional.post(f"/professional/request/{request_id}/accept")
+    dashboard = response.location
+    check("dashboard after accept", *get(app, professional, dashboard), 200, "primary")
+    professional.post(f"/professional/request/{request_id}/complete")
+
+    response = customer.post(f"/payment/process/{request_id}?method=upi", data={"upi_id": "customer@upi"})
+    invoice = response.location
+    assert "/payment/invoice/" in invoice, f"payment failed: {invoice}"
+    check("invoice after payment", *get(app, customer, invoice), 200, "primary")
+
+    time.sleep(ReplicaConfig.DATABASE_READ_STICKY_SECONDS)
+    # the replica never saw the payment, so reading it there is a 404
+    check("invoice once the write has aged", *get(app, customer, invoice), 404, "replica")
+    check("dashboard once the write has aged", *get(app, professional, dashboard), 200, "replica")
+    with app.app_context():
+        assert db.session.scalar(select(func.count()).select_from(Payment)
+                                 .where(Payment.request_id == request_id)) == 1
+    print("read routing ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark contention on request transitions: every thread loads the same
+open request and tries to accept it as a different professional, round
+after round, against the default SQLite setup and the production profile.
+
+Exactly one accept per request may win; the losers must get the conflict
+message rather than an error, and the professionals' total_requests must
+grow by exactly the number of requests accepted.
+
+    python -m benchmarks.request_contention
+"""
+import threading
+import time
+from sqlalchemy import func, select
+from app import db
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.models.user import Professional
+from app.services.request_service import RequestService
+from benchmarks.concurrency import ProductionBenchmarkConfig, fresh_app
+from benchmarks.common import BenchmarkConfig
+
+THREADS = [1, 2, 4, 8]
+ROUNDS = 100
+CONFLICT = "just updated by someone else"
+
+def open_requests(app, count):
+    with app.app_context():
+        service_id = db.session.scalar(select(Service.id).where(Service.is_active == True).limit(1))
+        # synthetic ids: admin 1, professionals 2-51, customers from 52
+        return [RequestService.create(service_id, 52).id for _ in range(count)]
+
+def total_requests(app):
+    with app.app_context():
+        return db.session.scalar(select(func.sum(Professional.total_requests))) or 0
+
+def run(app, threads):
+    request_ids = open_requests(app, ROUNDS)
+    before = total_requests(app)
+    barrier = threading.Barrier(threads)
+    won, conflicts, errors = [0] * threads, [0] * threads, {}
+    lock = threading.Lock()
+
+    def worker(index):
+        with app.app_context():
+            for request_id in request_ids:
+                service_request = db.session.get(ServiceRequest, request_id)
+                barrier.wait()
+                try:
+                    accepted, message = RequestService.accept(service_request, 2 + index)
+                except Exception as error:
+                    reason = "database is locked" if "locked" in str(error) else type(error).__name__
+                    with lock:
+                        errors[reason] = errors.get(reason, 0) + 1
+                    continue
+                finally:
+                    db.session.remove()
+                if accepted:
+                    won[index] += 1
+                elif CONFLICT in message:
+                    conflicts[index] += 1
+                else:
+                    with lock:
+                        errors[message] = errors.get(message, 0) + 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        assigned = db.session.scalar(
+            select(func.count()).select_from(ServiceRequest)
+            .where(ServiceRequest.id.in_(request_ids), ServiceRequest.status == "assigned",
+                   ServiceRequest.version == 2, ServiceRequest.professional_id.is_not(None))
+        )
+    if not errors:
+        assert sum(won) == assigned == ROUNDS, f"{sum(won)} winners for {assigned}/{ROUNDS} accepted requests"
+        assert total_requests(app) - before == ROUNDS, "professional totals lost or doubled an accept"
+    return sum(won), sum(conflicts), elapsed, errors
+
+def main():
+    for label, config in (("default", BenchmarkConfig), ("production", ProductionBenchmarkConfig)):
+        app = fresh_app(config)
+        for threads in THREADS:
+            won, conflicts, elapsed, errors = run(app, threads)
+            failed = ", ".join(f"{count}x {reason}" for reason, count in errors.items()) or "none"
+            print(f"{label} profile, {threads} threads: {won / elapsed:,.1f} accepts/s "
+                  f"({won}/{ROUNDS} won, {conflicts} conflicts, failures: {failed})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark review ingestion: one review per transaction through
+RequestService.review, batched RequestService.ingest_reviews, and a
+check that concurrent ratings of one service are all counted.
+
+    python -m benchmarks.reviews
+"""
+import random
+import threading
+import time
+from sqlalchemy import insert
+from app import db
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.models.user import Professional, Customer
+from app.services.request_service import RequestService
+from benchmarks.common import make_app
+
+SERVICES = 20
+PROFESSIONALS = 50
+SINGLE_REVIEWS = 500
+BATCH_REVIEWS = 20000
+BATCH_SIZE = 5000
+THREADS = 8
+RATINGS_PER_THREAD = 50
+
+def seed(rng, count):
+    services = [Service(name=f"Service {i}", base_price=50.0) for i in range(SERVICES)]
+    professionals = [Professional(username=f"pro{i}", email=f"pro{i}@example.com",
+                                  service_type="plumbing") for i in range(PROFESSIONALS)]
+    customer = Customer(username="cust", email="cust@example.com")
+    db.session.add_all(services + professionals + [customer])
+    db.session.commit()
+    service_ids = [s.id for s in services]
+    professional_ids = [p.id for p in professionals]
+    db.session.execute(insert(ServiceRequest.__table__), [{
+        "service_id": rng.choice(service_ids),
+        "customer_id": customer.id,
+        "professional_id": rng.choice(professional_ids),
+        "status": "completed"
+    } for _ in range(count)])
+    db.session.commit()
+    return customer.id, db.session.scalars(db.select(ServiceRequest.id).order_by(ServiceRequest.id)).all()
+
+def check_ratings():
+    """Service and professional aggregates must match the rated requests"""
+    rated = db.session.query(db.func.count(ServiceRequest.rating),
+                             db.func.sum(ServiceRequest.rating)).one()
+    for model in (Service, Professional):
+        totals = db.session.query(db.func.sum(model.total_ratings), db.func.sum(model.rating_sum)).one()
+        assert totals[0] == rated[0] and abs(totals[1] - rated[1]) < 1e-6, (model.__name__, totals, rated)
+
+def concurrent_ratings(app, service_id):
+    before = db.session.get(Service, service_id).total_ratings
+
+    def worker():
+        with app.app_context():
+            for _ in range(RATINGS_PER_THREAD):
+                RequestService.record_service_rating(service_id, 4)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    db.session.expire_all()
+    counted = db.session.get(Service, service_id).total_ratings - before
+    expected = THREADS * RATINGS_PER_THREAD
+    print(f"concurrent ratings: {counted}/{expected} counted, "
+          f"{expected / elapsed:,.0f} ratings/s over {THREADS} threads")
+    assert counted == expected
+
+def main():
+    rng = random.Random(5)
+    app = make_app()
+    with app.app_context():
+        customer_id, request_ids = seed(rng, SINGLE_REVIEWS + BATCH_REVIEWS)
+
+        start = time.perf_counter()
+        for request_id in request_ids[:SINGLE_REVIEWS]:
+            service_request = db.session.get(ServiceRequest, request_id)
+            success, message = RequestService.review(service_request, customer_id, rng.randint(1, 5), "ok")
+            assert success, message
+        elapsed = time.perf_counter() - start
+        print(f"review: {SINGLE_REVIEWS / elapsed:,.0f} reviews/s")
+        check_ratings()
+
+        batch = [{"request_id": request_id, "rating": rng.randint(1, 5), "review": "ok"}
+                 for request_id in request_ids[SINGLE_REVIEWS:]]
+        start = time.perf_counter()
+        applied = 0
+        for offset in range(0, len(batch), BATCH_SIZE):
+            applied += RequestService.ingest_reviews(batch[offset:offset + BATCH_SIZE])
+        elapsed = time.perf_counter() - start
+        assert applied == BATCH_REVIEWS, applied
+        print(f"ingest_reviews({BATCH_SIZE} per batch): {applied / elapsed:,.0f} reviews/s")
+        check_ratings()
+
+        # replaying a batch must not count anything twice
+        assert RequestService.ingest_reviews(batch[:BATCH_SIZE]) == 0
+        check_ratings()
+
+        concurrent_ratings(app, db.session.scalars(db.select(Service.id)).first())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark customer service search as the catalog grows. The number of
+queries per search stays constant; the remaining growth in latency comes
+from scanning the catalog for the search term.
+
+    python -m benchmarks.search_services
+"""
+import random
+from sqlalchemy import insert
+from app import db
+from app.models.service import Service
+from app.models.user import Professional
+from app.services.search_service import SearchService
+from benchmarks.common import make_app, count_queries, time_calls, percentile
+
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry",
+                 "painting", "appliance", "pest_control", "gardening"]
+CATALOG_SIZES = [1000, 5000, 20000, 50000]
+PROFESSIONALS = 500
+FEATURED = 50
+
+def seed_professionals(rng):
+    for i in range(PROFESSIONALS):
+        professional = Professional(
+            username=f"pro{i}",
+            email=f"pro{i}@example.com",
+            service_type=rng.choice(SERVICE_TYPES),
+            location=rng.choice(["Chennai", "Mumbai", "Delhi"]),
+            pincode=str(600000 + rng.randrange(50)),
+            is_verified=True,
+            is_available=rng.random() < 0.8
+        )
+        db.session.add(professional)
+    db.session.commit()
+
+def grow_catalog(rng, start, stop):
+    # A fixed number of featured services keeps the result set constant so
+    # the timings reflect per-search overhead rather than result size.
+    db.session.execute(insert(Service), [{
+        "name": f"Featured Service {i}" if i < FEATURED else f"Service {i}",
+        "description": f"{rng.choice(SERVICE_TYPES)} work number {i}",
+        "base_price": rng.uniform(10, 400),
+        "time_required": 60,
+        "service_type": rng.choice(SERVICE_TYPES),
+        "is_active": True
+    } for i in range(start, stop)])
+    db.session.commit()
+
+def main():
+    rng = random.Random(42)
+    app = make_app()
+    with app.app_context():
+        seed_professionals(rng)
+        size = 0
+        print(f"{'services':>10} {'results':>8} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for target in CATALOG_SIZES:
+            grow_catalog(rng, size, target)
+            size = target
+
+            def search():
+                return SearchService.search_services(query="Featured", location="Chennai")
+
+            with count_queries() as counter:
+                results = search()
+            samples = time_calls(search)
+            print(f"{size:>10} {len(results):>8} {counter.count:>8} "
+                  f"{percentile(samples, 50):>8.2f} {percentile(samples, 99):>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark professional matching by area at 100k professionals: the old
+substring scan over location/service_area against the
+professional_service_area index lookup, with the number of results each
+returns (the substring scan also finds "New York" for "York").
+
+    python -m benchmarks.service_areas
+"""
+import json
+import random
+from types import SimpleNamespace
+from sqlalchemy import insert, or_
+from app import db
+from app.models.service_area import ProfessionalServiceArea
+from app.models.user import User, Professional
+from benchmarks.common import make_app, time_calls, percentile
+
+PROFESSIONALS = 100000
+SERVICE_TYPES = ["plumbing", "electrical", "cleaning", "carpentry",
+                 "painting", "appliance", "pest_control", "gardening"]
+PINCODES = [str(100000 + i) for i in range(5000)]
+LOCALITIES = [f"Locality {i}" for i in range(500)] + ["York", "New York", "East York"]
+EXTRA_AREAS = 3
+BATCH = 10000
+
+def seed(rng):
+    for start in range(0, PROFESSIONALS, BATCH):
+        users, professionals, areas = [], [], []
+        for i in range(start, min(start + BATCH, PROFESSIONALS)):
+            user_id = i + 1
+            service_area = [rng.choice(PINCODES) if rng.random() < 0.5 else rng.choice(LOCALITIES)
+                            for _ in range(EXTRA_AREAS)]
+            professional = {
+                "id": user_id,
+                "service_type": rng.choice(SERVICE_TYPES),
+                "is_verified": rng.random() < 0.9,
+                "is_available": rng.random() < 0.8,
+                "rating": round(rng.uniform(1, 5), 2),
+                "location": rng.choice(LOCALITIES),
+                "pincode": rng.choice(PINCODES),
+                "service_area": json.dumps(service_area)
+            }
+            users.append({"id": user_id, "username": f"pro{i}",
+                          "email": f"pro{i}@example.com", "role": "professional"})
+            professionals.append(professional)
+            areas.extend({"professional_id": user_id, "pincode": pincode, "locality": locality}
+                         for pincode, locality in ProfessionalServiceArea.areas_for(
+                             SimpleNamespace(**professional)))
+        db.session.execute(insert(User.__table__), users)
+        db.session.execute(insert(Professional.__table__), professionals)
+        db.session.execute(insert(ProfessionalServiceArea.__table__), areas)
+        db.session.commit()
+    db.session.execute(db.text("ANALYZE"))
+
+def substring_scan(service_type, location=None, pincode=None):
+    """Professional.search as it matched areas before the area table"""
+    query = Professional.query.filter_by(is_verified=True, is_available=True, service_type=service_type)
+    if location:
+        query = query.filter(or_(Professional.location.ilike(f"%{location}%"),
+                                 Professional.service_area.ilike(f"%{location}%")))
+    if pincode:
+        query = query.filter_by(pincode=pincode)
+    return query.order_by(Professional.rating.desc())
+
+def report(name, query):
+    results = query.count()
+    samples = time_calls(lambda: query.all(), repeat=30)
+    print(f"{name:<44} {results:>8} {percentile(samples, 50):>8.2f} {percentile(samples, 99):>8.2f}")
+
+def main():
+    rng = random.Random(11)
+    app = make_app()
+    with app.app_context():
+        seed(rng)
+        print(f"{PROFESSIONALS:,} professionals, "
+              f"{ProfessionalServiceArea.query.count():,} service area rows")
+        print(f"{'query':<44} {'results':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        pincode = rng.choice(PINCODES)
+        report("pincode, home pincode only (old)", substring_scan("plumbing", pincode=pincode))
+        report("pincode, any served pincode (index)", Professional.available_in("plumbing", pincode=pincode))
+        report("locality 'York', substring (old)", substring_scan("plumbing", location="York"))
+        report("locality 'York', whole name (index)", Professional.available_in("plumbing", locality="York"))
+        report("locality and pincode (index)",
+               Professional.available_in("plumbing", pincode=pincode, locality="Locality 7"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark search-as-you-type suggestions against a large catalog.
+
+    python -m benchmarks.suggestions
+"""
+import random
+import time
+from sqlalchemy import insert
+from app import db
+from app.models.service import Service
+from app.services.search_service import SearchService
+from app.services.suggestion_index import get_suggestion_index
+from benchmarks.common import make_app, count_queries, percentile
+
+CATALOG_SIZE = 50000
+LOOKUPS = 20000
+WORDS = ["pipe", "leak", "repair", "install", "wiring", "switch", "deep",
+         "clean", "sofa", "kitchen", "bathroom", "door", "paint", "wall",
+         "termite", "garden", "lawn", "fan", "geyser", "washing", "machine"]
+
+def seed_catalog(rng):
+    db.session.execute(insert(Service), [{
+        "name": " ".join(rng.sample(WORDS, 3)).title() + f" {i}",
+        "description": "Catalog service",
+        "base_price": rng.uniform(10, 400),
+        "tags": ",".join(rng.sample(WORDS, 2)),
+        "rating": round(rng.uniform(1, 5), 1),
+        "total_ratings": rng.randrange(500),
+        "is_active": True
+    } for i in range(CATALOG_SIZE)])
+    db.session.commit()
+
+def main():
+    rng = random.Random(7)
+    app = make_app()
+    with app.app_context():
+        seed_catalog(rng)
+
+        start = time.perf_counter()
+        get_suggestion_index()
+        print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms for {CATALOG_SIZE} services")
+
+        prefixes = [rng.choice(WORDS)[:rng.randrange(2, 6)] for _ in range(LOOKUPS)]
+        samples = []
+        with count_queries() as counter:
+            for prefix in prefixes:
+                start = time.perf_counter()
+                SearchService.suggest_services(prefix)
+                samples.append((time.perf_counter() - start) * 1e6)
+        print(f"lookups: {LOOKUPS}, queries: {counter.count}, "
+              f"p50 {percentile(samples, 50):.1f} us, p99 {percentile(samples, 99):.1f} us")
+
+        # cost of an edit followed by the first lookup that needs the stale nodes
+        service = db.session.get(Service, 1)
+        index = get_suggestion_index()
+        samples = []
+        for i in range(200):
+            service.rating = rng.uniform(1, 5)
+            start = time.perf_counter()
+            index.refresh(service)
+            index.suggest(service.name[:3])
+            samples.append((time.perf_counter() - start) * 1e6)
+        print(f"refresh + lookup: p50 {percentile(samples, 50):.1f} us, p99 {percentile(samples, 99):.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+End-to-end benchmark suite: loads a synthetic data set, drives the app
+through Flask's test client as a customer, a professional and an admin,
+and reports p50/p99 latency and queries per request for search,
+dashboards, the request lifecycle and payments.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --compare before.json
+
+--compare exits with status 1 when a scenario runs more queries per
+request than the baseline or its p50 is slower by more than --tolerance.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import func, select
+from app import db
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.models.user import Professional, Customer
+from app.services.synthetic_data import SyntheticData
+from benchmarks.common import make_app, count_queries, percentile
+
+# fixed so runs on different days load identical data
+ANCHOR = datetime(2024, 1, 1)
+PASSWORD = "password"
+
+class Scenario:
+    """Samples of one kind of request"""
+
+    def __init__(self, name, expect):
+        self.name = name
+        self.expect = expect
+        self.samples = []
+        self.queries = []
+        self.errors = {}
+
+    def run(self, client, method, url, data=None, follow_redirects=False):
+        with client.application.app_context(), count_queries() as counter:
+            start = time.perf_counter()
+            response = client.open(url, method=method, data=data, follow_redirects=follow_redirects)
+            elapsed = (time.perf_counter() - start) * 1000
+        self.samples.append(elapsed)
+        self.queries.append(counter.count)
+        if response.status_code != self.expect:
+            self.errors[response.status_code] = self.errors.get(response.status_code, 0) + 1
+        return response
+
+    def result(self):
+        return {
+            "requests": len(self.samples),
+            "p50_ms": round(percentile(self.samples, 50), 3),
+            "p99_ms": round(percentile(self.samples, 99), 3),
+            "mean_ms": round(statistics.mean(self.samples), 3),
+            "queries_per_request": round(statistics.mean(self.queries), 2),
+            "errors": {str(status): count for status, count in sorted(self.errors.items())},
+        }
+
+def log_in(app, username):
+    client = app.test_client()
+    response = client.post("/login?next=/", data={"username": username, "password": PASSWORD})
+    assert response.status_code == 302 and "/login" not in response.location, f"cannot log in as {username}"
+    return client
+
+def busiest(column):
+    """Id of the user with the most requests in the given column"""
+    return db.session.scalar(
+        select(column).where(column.is_not(None)).group_by(column)
+        .order_by(func.count().desc(), column).limit(1)
+    )
+
+def sample_users():
+    customer = db.session.get(Customer, busiest(ServiceRequest.customer_id))
+    professional = db.session.get(Professional, busiest(ServiceRequest.professional_id))
+    service = db.session.scalars(
+        select(Service).where(Service.is_active == True).order_by(Service.total_ratings.desc(), Service.id)
+    ).first()
+    return customer, professional, service
+
+def read_scenarios(app, customer, professional, service):
+    """Scenarios that only read, and the clients that run them"""
+    customer_client = log_in(app, customer.username)
+    professional_client = log_in(app, professional.username)
+    admin_client = log_in(app, "admin")
+    search = f"/customer/search?query={service.service_type or service.name}&location={customer.default_location}"
+    return [
+        ("search", customer_client, search),
+        ("search_suggestions", customer_client, "/customer/search/suggestions?query=pl"),
+        ("professional_dashboard", professional_client, "/professional/dashboard"),
+        ("professional_requests", professional_client, "/professional/requests"),
+        ("payment_history", customer_client, "/payment/payment-history"),
+        ("api_services", customer_client, "/api/services?per_page=50"),
+        ("api_requests", customer_client, "/api/requests"),
+        ("api_users", admin_client, "/api/users?per_page=50"),
+    ], customer_client, professional_client
+
+def run(args):
+    app = make_app()
+    with app.app_context():
+        start = time.perf_counter()
+        counts = SyntheticData(seed=args.seed, anchor=ANCHOR, password=PASSWORD).generate(
+            customers=args.customers, professionals=args.professionals,
+            services=args.services, requests=args.requests
+        )
+        print(f"loaded {counts} in {time.perf_counter() - start:.1f}s")
+        customer, professional, service = sample_users()
+
+    scenarios = {}
+    reads, customer_client, professional_client = read_scenarios(app, customer, professional, service)
+    for name, client, url in reads:
+        scenario = scenarios[name] = Scenario(name, 200)
+        client.get(url)  # warm up template and statement caches
+        for _ in range(args.repeat):
+            scenario.run(client, "GET", url)
+
+    # every lifecycle run takes a fresh request from creation to review
+    steps = ["request_create", "request_accept", "request_complete", "payment", "request_rate"]
+    for name in steps:
+        scenarios[name] = Scenario(name, 302)
+    # a payment is only done once its invoice page renders
+    scenarios["payment"] = Scenario("payment", 200)
+    for _ in range(args.repeat):
+        scenarios["request_create"].run(customer_client, "POST", f"/customer/service/{service.id}/request",
+                                        {"remarks": "Benchmark visit"})
+        with app.app_context():
+            request_id = db.session.scalar(select(func.max(ServiceRequest.id))
+                                           .where(ServiceRequest.customer_id == customer.id))
+        scenarios["request_accept"].run(professional_client, "POST", f"/professional/request/{request_id}/accept")
+        scenarios["request_complete"].run(professional_client, "POST", f"/professional/request/{request_id}/complete")
+        scenarios["payment"].run(customer_client, "POST", f"/payment/process/{request_id}?method=upi",
+                                 {"upi_id": "customer@upi"}, follow_redirects=True)
+        scenarios["request_rate"].run(customer_client, "POST", f"/customer/request/{request_id}/rate",
+                                      {"rating": 4, "review": "Benchmark review"})
+
+    return {
+        "meta": {
+            "seed": args.seed,
+            "sizes": counts,
+            "repeat": args.repeat,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        },
+        "scenarios": {name: scenario.result() for name, scenario in scenarios.items()},
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results):
+    print(f"{'scenario':<24}{'requests':>9}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}  errors")
+    for name, result in results["scenarios"].items():
+        errors = ", ".join(f"{count}x {status}" for status, count in result["errors"].items())
+        print(f"{name:<24}{result['requests']:>9}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{result['queries_per_request']:>9.1f}  {errors}")
+
+def compare(results, baseline, tolerance):
+    """Print the change against a baseline run; returns the regressed scenarios"""
+    regressions = []
+    print(f"\n{'scenario':<24}{'p50 ms':<24}{'p99 ms':<18}queries")
+    for name, result in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<24}  (not in baseline)")
+            continue
+        p50_change = result["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        print(f"{name:<24}{before['p50_ms']:.2f} -> {result['p50_ms']:.2f} ({p50_change:+.0%})".ljust(48)
+              + f"{before['p99_ms']:.2f} -> {result['p99_ms']:.2f}".ljust(18)
+              + f"{before['queries_per_request']:.1f} -> {result['queries_per_request']:.1f}")
+        if result["queries_per_request"] > before["queries_per_request"] or p50_change > tolerance:
+            regressions.append(name)
+    if baseline["meta"].get("sizes") != results["meta"]["sizes"]:
+        print("\nwarning: the baseline was measured on a different data set")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--professionals", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=50, help="requests per scenario")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="p50 slowdown tolerated by --compare, as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(results, stream, indent=2)
+            stream.write("\n")
+    if args.compare:
+        with open(args.compare) as stream:
+            regressions = compare(results, json.load(stream), args.tolerance)
+        if regressions:
+            print(f"\nregressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
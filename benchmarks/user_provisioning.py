@@ -0,0 +1,48 @@
+"""
+Benchmark account creation: UserService.create_user (hash and commit one
+user at a time) against UserProvisioning.provision hashing in this
+process and in a pool of one worker per CPU. Hashing dominates, so the
+pool scales with the number of CPUs and gains nothing on a single core.
+
+    python -m benchmarks.user_provisioning
+"""
+import os
+import time
+from app.models.user import User
+from app.services.user_provisioning import UserProvisioning
+from app.services.user_service import UserService
+from benchmarks.common import make_app
+
+SINGLE = 50
+BULK = 400
+BATCH_SIZE = 100
+
+def account_rows(prefix, count):
+    for i in range(count):
+        row = {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "password": f"secret-{i}"}
+        if i % 2:
+            row.update(role="professional", service_type="plumbing", location="Chennai",
+                       pincode="600001", languages="English, Tamil")
+        yield i + 1, row
+
+def main():
+    app = make_app()
+    workers = os.cpu_count() or 1
+    with app.app_context():
+        start = time.perf_counter()
+        for _, row in account_rows("single", SINGLE):
+            UserService.create_user({"address": None, "phone": None, **row}, "customer")
+        elapsed = time.perf_counter() - start
+        print(f"create_user one at a time: {SINGLE / elapsed:,.1f} users/s")
+
+        for label, pool in (("in process", 0), (f"{workers} worker processes", workers)):
+            totals = UserProvisioning.provision(account_rows(f"pool{pool}-", BULK),
+                                                batch_size=BATCH_SIZE, workers=pool)
+            assert totals["created"] == BULK and not totals["rejected"], totals
+            print(f"provision, hashing {label}: {totals['created'] / totals['seconds']:,.1f} users/s")
+
+        user = User.query.filter_by(username=f"pool{workers}-3").one()
+        assert user.role == "professional" and user.check_password("secret-3")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Running request and rating totals on professional
+
+Revision ID: 3e8a61c0b7d4
+Revises: 709f91da9710
+Create Date: 2026-10-18 15:02:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8a61c0b7d4'
+down_revision = '709f91da9710'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('professional', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_requests', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('completed_requests', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('rating_sum', sa.Float(), nullable=True))
+
+    # backfill request totals with one grouped query; existing ratings
+    # were not tied to requests, so the rating sum is seeded from them
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT professional_id, COUNT(id), "
+        "SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) "
+        "FROM service_request WHERE professional_id IS NOT NULL "
+        "GROUP BY professional_id"
+    )).all()
+    connection.execute(sa.text(
+        "UPDATE professional SET total_requests = 0, completed_requests = 0, "
+        "completion_rate = 0.0, "
+        "rating_sum = COALESCE(rating, 0.0) * COALESCE(total_ratings, 0)"
+    ))
+    if rows:
+        connection.execute(sa.text(
+            "UPDATE professional SET total_requests = :total, completed_requests = :completed, "
+            "completion_rate = :rate WHERE id = :professional_id"
+        ), [{
+            "professional_id": professional_id,
+            "total": total,
+            "completed": completed,
+            "rate": completed * 100.0 / total
+        } for professional_id, total, completed in rows])
+
+
+def downgrade():
+    with op.batch_alter_table('professional', schema=None) as batch_op:
+        batch_op.drop_column('rating_sum')
+        batch_op.drop_column('completed_requests')
+        batch_op.drop_column('total_requests')
@@ -0,0 +1,62 @@
+"""Full-text search index for services
+
+Revision ID: 4b7d2e91c3a5
+Revises: ee33c3962a8b
+Create Date: 2026-10-18 10:12:31.482190
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7d2e91c3a5'
+down_revision = 'ee33c3962a8b'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of the DDL in app.models.search_index at this revision;
+# a8f3d5c2e917 later narrows the update trigger.
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS service_fts
+        USING fts5(name, description, tags, tokenize='unicode61')""",
+    """CREATE TRIGGER IF NOT EXISTS service_fts_ai AFTER INSERT ON service
+        WHEN new.is_active BEGIN
+            INSERT INTO service_fts(rowid, name, description, tags)
+            VALUES (new.id, new.name, new.description, new.tags);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS service_fts_ad AFTER DELETE ON service BEGIN
+            DELETE FROM service_fts WHERE rowid = old.id;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS service_fts_au AFTER UPDATE ON service BEGIN
+            DELETE FROM service_fts WHERE rowid = old.id;
+            INSERT INTO service_fts(rowid, name, description, tags)
+            SELECT new.id, new.name, new.description, new.tags WHERE new.is_active;
+        END""",
+    "DELETE FROM service_fts",
+    """INSERT INTO service_fts(rowid, name, description, tags)
+        SELECT id, name, description, tags FROM service WHERE is_active""",
+]
+
+FTS_DROP = [
+    "DROP TRIGGER IF EXISTS service_fts_au",
+    "DROP TRIGGER IF EXISTS service_fts_ad",
+    "DROP TRIGGER IF EXISTS service_fts_ai",
+    "DROP TABLE IF EXISTS service_fts",
+]
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases keep using substring search
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite" or \
+            not bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar():
+        return
+    for statement in FTS_DDL:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in FTS_DROP:
+            op.execute(statement)
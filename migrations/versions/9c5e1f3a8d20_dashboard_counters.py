@@ -0,0 +1,28 @@
+"""Materialized admin dashboard counters
+
+Revision ID: 9c5e1f3a8d20
+Revises: 4b7d2e91c3a5
+Create Date: 2026-10-18 11:40:02.917352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c5e1f3a8d20'
+down_revision = '4b7d2e91c3a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('dashboard_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_counters')
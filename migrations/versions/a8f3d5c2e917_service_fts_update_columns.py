@@ -0,0 +1,43 @@
+"""Only re-index services when indexed columns change
+
+Revision ID: a8f3d5c2e917
+Revises: 16c9b6b1009d
+Create Date: 2026-10-18 17:05:12.604318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8f3d5c2e917'
+down_revision = '16c9b6b1009d'
+branch_labels = None
+depends_on = None
+
+UPDATE_TRIGGER = """CREATE TRIGGER service_fts_au AFTER UPDATE{columns}
+    ON service BEGIN
+        DELETE FROM service_fts WHERE rowid = old.id;
+        INSERT INTO service_fts(rowid, name, description, tags)
+        SELECT new.id, new.name, new.description, new.tags WHERE new.is_active;
+    END"""
+
+
+def _replace_update_trigger(columns):
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    exists = bind.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'service_fts_au'"
+    ).first()
+    if exists is None:
+        return
+    op.execute("DROP TRIGGER service_fts_au")
+    op.execute(UPDATE_TRIGGER.format(columns=columns))
+
+
+def upgrade():
+    _replace_update_trigger(" OF name, description, tags, is_active")
+
+
+def downgrade():
+    _replace_update_trigger("")
@@ -0,0 +1,30 @@
+"""Rating sum on service
+
+Revision ID: b41f0d9e6a27
+Revises: 3e8a61c0b7d4
+Create Date: 2026-10-18 16:10:27.530961
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41f0d9e6a27'
+down_revision = '3e8a61c0b7d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('service', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Float(), nullable=True))
+
+    op.execute(
+        "UPDATE service SET rating_sum = COALESCE(rating, 0.0) * COALESCE(total_ratings, 0)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('service', schema=None) as batch_op:
+        batch_op.drop_column('rating_sum')
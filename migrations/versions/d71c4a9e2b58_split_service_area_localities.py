@@ -0,0 +1,85 @@
+"""Split comma-separated service area localities into their parts
+
+Revision ID: d71c4a9e2b58
+Revises: f3e6f19ad3a9
+Create Date: 2026-10-18 16:31:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'd71c4a9e2b58'
+down_revision = 'f3e6f19ad3a9'
+branch_labels = None
+depends_on = None
+
+
+# The parsing below is a frozen copy of app.models.service_area at this
+# revision, so the migration writes the same rows whatever the checkout.
+
+def _normalize(value):
+    if not value:
+        return None
+    return " ".join(value.split()).lower() or None
+
+
+def _with_localities(pincode, location, split):
+    keys = []
+    for part in [location or ""] + ((location or "").split(",") if split else []):
+        key = _normalize(part)
+        if key and key not in keys:
+            keys.append(key)
+    return [(pincode, keys[0] if keys else None)] + [(None, key) for key in keys[1:]]
+
+
+def _areas_for(professional, split):
+    areas = _with_localities(professional.pincode or None, professional.location, split)
+    value = professional.service_area
+    if value:
+        try:
+            entries = json.loads(value)
+        except ValueError:
+            entries = value.split(",")
+        if not isinstance(entries, list):
+            entries = [entries]
+        for entry in entries:
+            if isinstance(entry, dict):
+                pincode = str(entry.get("pincode") or "").strip() or None
+                areas.extend(_with_localities(pincode, entry.get("locality"), split))
+            elif isinstance(entry, (int, str)):
+                entry = str(entry).strip()
+                if entry.isdigit():
+                    areas.append((entry, None))
+                elif entry:
+                    areas.extend(_with_localities(None, entry, split))
+    seen = set()
+    return [area for area in areas
+            if area != (None, None) and not (area in seen or seen.add(area))]
+
+
+def _rebuild(split):
+    connection = op.get_bind()
+    professionals = connection.execute(sa.text(
+        "SELECT id, pincode, location, service_area FROM professional"
+    )).all()
+    rows = [{"professional_id": professional.id, "pincode": pincode, "locality": locality}
+            for professional in professionals
+            for pincode, locality in _areas_for(professional, split)]
+    connection.execute(sa.text("DELETE FROM professional_service_area"))
+    if rows:
+        connection.execute(sa.text(
+            "INSERT INTO professional_service_area (professional_id, pincode, locality) "
+            "VALUES (:professional_id, :pincode, :locality)"
+        ), rows)
+
+
+def upgrade():
+    # "Anna Nagar, Chennai" is also found by "Anna Nagar" and by "Chennai"
+    _rebuild(split=True)
+
+
+def downgrade():
+    _rebuild(split=False)
@@ -0,0 +1,47 @@
+import pytest
+from app import create_app, db
+from app.config import Config
+from app.models import payment  # noqa: F401 - registers payment tables
+
+@pytest.fixture
+def app(tmp_path):
+    """An app on a fresh SQLite file with every table created"""
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        WTF_CSRF_ENABLED = False
+        TESTING = True
+        CATALOG_CACHE_SIZE = 0
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+PASSWORD = "password"
+
+@pytest.fixture
+def people(app):
+    """Ids of a customer, a verified plumber and an active plumbing service"""
+    from app.models.service import Service
+    from app.models.user import Customer, Professional
+
+    with app.app_context():
+        customer = Customer(username="customer", email="customer@example.com", role="customer")
+        professional = Professional(username="plumber", email="plumber@example.com", role="professional",
+                                    service_type="plumbing", is_verified=True)
+        for user in (customer, professional):
+            user.set_password(PASSWORD)
+        service = Service(name="Pipe repair", base_price=100, service_type="plumbing")
+        db.session.add_all([customer, professional, service])
+        db.session.commit()
+        return {"customer": customer.id, "professional": professional.id, "service": service.id}
+
+@pytest.fixture
+def log_in(app):
+    """A test client logged in as the given username"""
+    def log_in(username):
+        client = app.test_client()
+        response = client.post("/login?next=/", data={"username": username, "password": PASSWORD})
+        assert response.status_code == 302 and "/login" not in response.location, username
+        return client
+    return log_in
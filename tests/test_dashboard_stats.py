@@ -0,0 +1,27 @@
+from app import db
+from app.models.dashboard import DashboardCounter
+from app.models.user import Customer
+from app.services.dashboard_stats import DashboardStats
+
+def test_unseeded_counters_fall_back_to_aggregating_without_writing(app):
+    app.config["DASHBOARD_COUNTERS"] = True
+    with app.app_context():
+        db.session.add(Customer(username="c1", email="c1@example.com", password_hash="x"))
+        db.session.commit()
+
+        assert DashboardStats.get()["total_users"] == 1
+        # per-day signup rows are created on demand; the fixed counters are not
+        assert db.session.get(DashboardCounter, "total_users") is None
+
+def test_rebuild_counters_command_seeds_the_counters(app):
+    app.config["DASHBOARD_COUNTERS"] = True
+    with app.app_context():
+        db.session.add(Customer(username="c1", email="c1@example.com", password_hash="x"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["data", "rebuild-counters"])
+    assert result.exit_code == 0, result.output
+
+    with app.app_context():
+        assert db.session.get(DashboardCounter, "total_users").value == 1
+        assert DashboardStats.read_counters()["total_customers"] == 1
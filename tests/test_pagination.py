@@ -0,0 +1,63 @@
+import re
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.services.pagination import keyset_paginate
+
+def _walk(per_page, cursor=None):
+    """Every page of services newest first, as lists of ids"""
+    pages = []
+    while True:
+        page = keyset_paginate(Service.query, [Service.created_at, Service.id],
+                               cursor=cursor, per_page=per_page)
+        pages.append([service.id for service in page.items])
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+@pytest.fixture
+def services(app):
+    """Six services sharing three timestamps, so ties are broken by id"""
+    start = datetime(2024, 1, 1)
+    with app.app_context():
+        db.session.add_all([Service(name=f"Service {i}", base_price=10, created_at=start + timedelta(days=i // 2))
+                            for i in range(6)])
+        db.session.commit()
+
+@pytest.mark.parametrize("per_page, expected", [
+    (1, [[6], [5], [4], [3], [2], [1]]),
+    (2, [[6, 5], [4, 3], [2, 1]]),
+    (4, [[6, 5, 4, 3], [2, 1]]),
+    (6, [[6, 5, 4, 3, 2, 1]]),
+    (7, [[6, 5, 4, 3, 2, 1]]),
+])
+def test_pages_cover_every_row_once_without_a_trailing_empty_page(app, services, per_page, expected):
+    with app.app_context():
+        assert _walk(per_page) == expected
+
+def test_malformed_cursor_starts_from_the_first_page(app, services):
+    with app.app_context():
+        assert _walk(3, cursor="not-a-cursor") == [[6, 5, 4], [3, 2, 1]]
+
+def test_history_next_link_keeps_per_page(app, people, log_in):
+    with app.app_context():
+        service_request = ServiceRequest(service_id=people["service"], customer_id=people["customer"],
+                                         professional_id=people["professional"], status="paid")
+        db.session.add(service_request)
+        db.session.flush()
+        db.session.add_all([Payment(request_id=service_request.id, customer_id=people["customer"],
+                                    professional_id=people["professional"], amount=100)
+                            for _ in range(3)])
+        db.session.commit()
+
+    client = log_in("customer")
+    html = client.get("/payment/payment-history?per_page=2").get_data(as_text=True)
+    link = re.search(r'href="([^"]*cursor=[^"]*)"', html).group(1).replace("&amp;", "&")
+    assert "per_page=2" in link
+
+    html = client.get(link).get_data(as_text=True)
+    assert html.count("/payment/download-invoice/") == 1
+    assert "cursor=" not in html
@@ -0,0 +1,28 @@
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.services.payment_service import PaymentService
+
+def test_database_error_while_paying_is_flashed_not_raised(app, people, log_in, monkeypatch):
+    with app.app_context():
+        service_request = ServiceRequest(service_id=people["service"], customer_id=people["customer"],
+                                         professional_id=people["professional"], status="completed")
+        db.session.add(service_request)
+        db.session.commit()
+        request_id = service_request.id
+
+    def locked(payment, payment_details):
+        raise OperationalError("UPDATE payment", {}, Exception("database is locked"))
+    monkeypatch.setattr(PaymentService, "settle", staticmethod(locked))
+
+    client = log_in("customer")
+    response = client.post(f"/payment/process/{request_id}?method=upi", data={"upi_id": "customer@upi"})
+    assert response.status_code == 302
+    assert f"/payment/process/{request_id}" in response.location
+    with client.session_transaction() as session:
+        assert ("danger", "Payment failed: database is locked") in session["_flashes"]
+
+    with app.app_context():
+        assert db.session.get(ServiceRequest, request_id).status == "completed"
+        assert Payment.query.count() == 0
@@ -0,0 +1,11 @@
+from benchmarks.query_plans import explain, hot_queries, plan_problems
+
+def test_hot_queries_use_indexes(app):
+    """Every hot query is answered from an index, without a table scan or a sort"""
+    failures = {}
+    with app.app_context():
+        for name, query in hot_queries():
+            plan = explain(query)
+            if plan_problems(plan):
+                failures[name] = [row[-1] for row in plan]
+    assert not failures, failures
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.request import ServiceRequest
+from app.models.user import Customer
+from benchmarks.common import count_queries
+
+def _add_requests(people, count, offset=0):
+    """count requests in each of the statuses the professional pages list"""
+    start = datetime(2024, 1, 1)
+    for i in range(offset, offset + count):
+        customer = Customer(username=f"customer{i}", email=f"customer{i}@example.com", role="customer")
+        db.session.add(customer)
+        db.session.flush()
+        for status in ("requested", "assigned", "completed", "closed"):
+            mine = status != "requested"
+            db.session.add(ServiceRequest(
+                service_id=people["service"], customer_id=customer.id,
+                professional_id=people["professional"] if mine else None, status=status,
+                date_of_request=start + timedelta(hours=i),
+                date_of_completion=start + timedelta(hours=i + 1) if status in ("completed", "closed") else None
+            ))
+    db.session.commit()
+
+@pytest.mark.parametrize("url", ["/professional/dashboard", "/professional/requests"])
+def test_professional_pages_run_a_fixed_number_of_queries(app, people, log_in, url):
+    client = log_in("plumber")
+    # the first request also loads the user into the user cache
+    client.get(url)
+    counts = []
+    for offset, count in ((0, 2), (2, 20)):
+        with app.app_context():
+            _add_requests(people, count, offset)
+            with count_queries() as counter:
+                response = client.get(url)
+        assert response.status_code == 200
+        counts.append(counter.count)
+
+    # the status counts, then each of the three lists with one more
+    # query for its customers; more rows must not mean more queries
+    assert counts == [7, 7]
@@ -0,0 +1,30 @@
+from app import db
+from app.models.request import ServiceRequest
+from app.models.user import Professional
+from app.services.request_service import RequestService
+
+def test_stale_accept_gets_the_conflict_message(app, people):
+    with app.app_context():
+        rival = Professional(username="rival", email="rival@example.com", role="professional",
+                             service_type="plumbing", is_verified=True)
+        db.session.add(rival)
+        db.session.commit()
+        rival_id = rival.id
+        request_id = RequestService.create(people["service"], people["customer"]).id
+
+        # both professionals loaded the request at version 1
+        stale = db.session.get(ServiceRequest, request_id)
+        db.session.expunge(stale)
+        accepted, message = RequestService.accept(db.session.get(ServiceRequest, request_id),
+                                                  people["professional"])
+        assert accepted, message
+
+        accepted, message = RequestService.accept(stale, rival_id)
+        assert not accepted
+        assert message == "This request was just updated by someone else and is now assigned"
+
+        db.session.expire_all()
+        service_request = db.session.get(ServiceRequest, request_id)
+        assert (service_request.professional_id, service_request.version) == (people["professional"], 2)
+        assert [db.session.get(Professional, id).total_requests
+                for id in (people["professional"], rival_id)] == [1, 0]
@@ -0,0 +1,23 @@
+import pytest
+from app import db
+from app.models import search_index
+from app.models.service import Service
+from app.services.search_service import SearchService
+
+@pytest.mark.parametrize("full_text", [True, False])
+def test_text_search_matches_tags_with_and_without_fts(app, monkeypatch, full_text):
+    if not full_text:
+        monkeypatch.setattr(search_index, "fts_enabled", lambda: False)
+    with app.app_context():
+        db.session.add_all([
+            Service(name="Pipe repair", description="Fix pipes", base_price=100,
+                    service_type="plumbing", tags="leak,emergency"),
+            Service(name="Wiring", description="New wiring", base_price=200,
+                    service_type="electrical", tags="rewire"),
+        ])
+        db.session.commit()
+        if full_text:
+            assert search_index.fts_enabled()
+
+        results = SearchService.search_services(query="leak")
+        assert [result["service"]["name"] for result in results] == ["Pipe repair"]
@@ -0,0 +1,17 @@
+import pytest
+from app import db
+from app.models.user import Professional
+
+@pytest.mark.parametrize("locality", ["Chennai", "anna  nagar", "Anna Nagar, Chennai"])
+def test_location_parts_are_localities(app, locality):
+    with app.app_context():
+        professional = Professional(username="pro", email="pro@example.com", service_type="plumbing",
+                                    location="Anna Nagar, Chennai", pincode="600040",
+                                    is_verified=True, is_available=True)
+        professional.set_password("password")
+        db.session.add(professional)
+        db.session.commit()
+
+        found = Professional.available_in("plumbing", locality=locality).all()
+        assert [p.username for p in found] == ["pro"]
+        assert Professional.available_in("plumbing", locality="Nagar").all() == []
@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from app import db
+from app.models.payment import Payment
+from app.models.request import ServiceRequest
+from app.models.service import Service
+from app.models.user import Professional, User
+from app.services.synthetic_data import SyntheticData
+
+SIZES = {"customers": 30, "professionals": 8, "services": 6, "requests": 120}
+
+def _generate():
+    counts = SyntheticData(seed=7, anchor=datetime(2024, 6, 1)).generate(**SIZES)
+    tables = {table: db.session.execute(select(table).order_by(table.c.id)).all()
+              for table in (Service.__table__, Professional.__table__,
+                            ServiceRequest.__table__, Payment.__table__)}
+    return counts, tables
+
+def test_same_seed_and_anchor_generate_the_same_data(app):
+    with app.app_context():
+        counts, tables = _generate()
+        assert db.session.scalar(select(func.count()).select_from(User)) == counts["users"] == 39
+        assert len(tables[ServiceRequest.__table__]) == counts["requests"] == SIZES["requests"]
+        assert len(tables[Payment.__table__]) == counts["payments"] > 0
+
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        assert _generate() == (counts, tables)